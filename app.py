@@ -1,5 +1,6 @@
 import streamlit as st
-import seaborn as sns
+from utils.instrumentation import instrumentation
+from utils.startup import startup_profiler
 
 st.set_page_config(layout="wide", page_title="Level Ethics AI")
 
@@ -98,20 +99,28 @@ with col2:
         unsafe_allow_html=True
     )
 
-sns.set_theme(style="whitegrid")
+# Tabs track the selected section and rerun on switch, so only the open
+# section loads its data and builds its figures. Section modules (and the
+# plotting/numeric libraries they pull in) are imported on first use.
+sections = {
+    "Onboarding": ("components.onboarding", "ai_act_compliance_wizard"),
+    "Personas": ("components.personas", "display_personas"),
+    "Question Library": ("components.question_library", "display_question_library"),
+    "LLM Outputs": ("components.llm_responses", "display_llm_responses"),
+    "Evaluation Score": ("components.evaluations", "display_evaluations"),
+}
+tabs = st.tabs(list(sections), key="active_section", on_change="rerun")
 
-from components import onboarding, personas, question_library, llm_responses, evaluations
+for tab, (label, (module_name, func_name)) in zip(tabs, sections.items()):
+    if tab.open:
+        with startup_profiler.first_run(label), instrumentation.timer(func_name):
+            render = getattr(startup_profiler.import_module(module_name), func_name)
+            render(tab)
 
-tabs = st.tabs([
-    "Onboarding",
-    "Personas",
-    "Question Library",
-    "LLM Outputs",
-    "Evaluation Score"
-])
+if "startup_report" in st.query_params:
+    from components.diagnostics import display_startup_report
+    display_startup_report()
 
-onboarding.ai_act_compliance_wizard(tabs)
-personas.display_personas(tabs[1])
-question_library.display_question_library(tabs[2])
-llm_responses.display_llm_responses(tabs[3])
-evaluations.display_evaluations(tabs[4])
+if "diagnostics" in st.query_params:
+    from components.diagnostics import display_diagnostics
+    display_diagnostics()
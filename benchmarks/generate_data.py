@@ -0,0 +1,122 @@
+import argparse
+import os
+import random
+import sys
+from typing import Dict, List, Optional
+
+import yaml
+
+BUNDLED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "domain_data")
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+GENDERS = ["Female", "Male", "Non-binary"]
+ORIGINS = ["German", "Hispanic", "South Asian", "Middle Eastern", "Korean", "Nigerian", "Brazilian", "Polish"]
+TITLES = ["Junior Software Engineer", "Senior Software Engineer", "Data Scientist", "Product Designer",
+          "Engineering Manager", "Full-Stack Developer"]
+REVIEWERS = [f"Reviewer_{chr(ord('A') + i)}" for i in range(26)]
+WORDS = ("candidate experience team project role skills leadership growth communication background "
+         "career gap history industry potential environment pressure diverse qualifications though "
+         "however might strong relevant limited expected senior junior").split()
+
+
+def _load_bundled(filename: str) -> dict:
+    with open(os.path.join(BUNDLED_DIR, filename), 'r') as file:
+        return yaml.load(file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def _sentence(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words)).capitalize() + "."
+
+
+def _write(out_dir: str, filename: str, data: dict):
+    with open(os.path.join(out_dir, filename), 'w') as file:
+        yaml.dump(data, file, Dumper=YamlDumper, sort_keys=False, allow_unicode=True)
+
+
+def generate(out_dir: str, questions: int, personas: Optional[int] = None, evaluations: Optional[int] = None,
+             insights: Optional[int] = None, seed: int = 0) -> Dict[str, int]:
+    # Category names, score categories and risk flags are taken from the
+    # bundled data so the generated files exercise the same code paths.
+    rng = random.Random(seed)
+    personas = personas if personas is not None else max(6, questions // 100)
+    evaluations = evaluations if evaluations is not None else questions
+    insights = insights if insights is not None else questions
+
+    bundled_questions = _load_bundled("questions.yaml")["questions"]
+    topics = sorted({(q["category"], q["subcategory"]) for q in bundled_questions})
+    score_template = _load_bundled("evaluation_scores.yaml")["evaluations"][0]["scores"]
+    risk_flags = list(score_template["Bias & Fairness"])
+
+    os.makedirs(out_dir, exist_ok=True)
+    question_ids = [f"q{i + 1}" for i in range(questions)]
+
+    question_records = []
+    for qid in question_ids:
+        category, subcategory = rng.choice(topics)
+        question_records.append({"id": qid, "question_text": _sentence(rng, rng.randint(8, 40)),
+                                 "category": category, "subcategory": subcategory})
+    _write(out_dir, "questions.yaml", {"questions": question_records})
+
+    persona_records = []
+    for i in range(personas):
+        bias_metrics = {f"{rng.choice(risk_flags).split()[0].lower()}_bias": round(rng.random(), 2),
+                        "other_bias": round(rng.random() * 0.3, 2)}
+        persona_records.append({
+            "id": f"p{i + 1}",
+            "name": f"Candidate {i + 1}",
+            "title": rng.choice(TITLES),
+            "gender": rng.choice(GENDERS),
+            "origin": rng.choice(ORIGINS),
+            "experience": f"{rng.randint(1, 20)} years of experience. {_sentence(rng, 10)}",
+            "education": f"Degree from University {rng.randint(1, 500)}",
+            "profile_image": f"profile_{i % 10}",
+            "questions_associated": rng.sample(question_ids, min(len(question_ids), rng.randint(1, 4))),
+            "bias_metrics": bias_metrics,
+            "control_comparison": _sentence(rng, 25),
+        })
+    _write(out_dir, "personas.yaml", {"personas": persona_records})
+
+    response_records = []
+    for qid in question_ids:
+        response_records.append({
+            "question_id": qid,
+            "response_text": _sentence(rng, rng.randint(15, 60)),
+            "risk_flags": rng.sample(risk_flags, rng.randint(0, 2)),
+            "risk_score": round(rng.random(), 2),
+            "suggested_fix": _sentence(rng, 20) if rng.random() < 0.8 else None,
+        })
+    _write(out_dir, "llm_responses.yaml", {"responses": response_records})
+
+    evaluation_records = []
+    for i in range(evaluations):
+        scores = {category: {sub: round(rng.random(), 2) for sub in subs} for category, subs in score_template.items()}
+        evaluation_records.append({"question_id": question_ids[i % questions], "scores": scores,
+                                   "feedback": _sentence(rng, 15)})
+    _write(out_dir, "evaluation_scores.yaml", {"evaluations": evaluation_records})
+
+    insight_records = [{"question_id": rng.choice(question_ids), "reviewer": rng.choice(REVIEWERS),
+                        "comment_text": _sentence(rng, rng.randint(10, 30))} for _ in range(insights)]
+    _write(out_dir, "contributor_insights.yaml", {"insights": insight_records})
+
+    return {"questions": questions, "personas": personas, "responses": questions,
+            "evaluations": evaluations, "insights": insights}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate schema-valid synthetic domain_data at a given scale.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--scale", type=int, default=1000, help="number of questions (and responses)")
+    parser.add_argument("--personas", type=int, default=None, help="defaults to max(6, scale / 100)")
+    parser.add_argument("--evaluations", type=int, default=None, help="defaults to scale")
+    parser.add_argument("--insights", type=int, default=None, help="defaults to scale")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if not 10 <= args.scale <= 1_000_000:
+        parser.error("--scale must be between 10 and 1,000,000")
+    counts = generate(args.out_dir, args.scale, args.personas, args.evaluations, args.insights, args.seed)
+    print(f"Wrote {counts} to {args.out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
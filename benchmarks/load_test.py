@@ -0,0 +1,260 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+APP_PATH = os.path.join(ROOT_DIR, "app.py")
+
+SECTIONS = ["Onboarding", "Personas", "Question Library", "LLM Outputs", "Evaluation Score"]
+ROLES = ["Provider", "Deployer", "Distributor", "Importer"]
+MAX_WIZARD_STEPS = 10
+PERCENTILES = (50, 95, 99)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    # resource is Unix-only; ru_maxrss is KiB on Linux and bytes on macOS.
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _by_label(elements, prefix: str):
+    return next((e for e in elements if e.label.startswith(prefix)), None)
+
+
+class Session:
+    # One simulated reviewer: an AppTest instance plus a record of every timed
+    # interaction. AppTest keeps module-level state, so each session lives in
+    # its own worker process rather than a thread.
+    def __init__(self, rng: random.Random, timeout: float, think_ms: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.rng = rng
+        self.think_ms = think_ms
+        self.section = SECTIONS[0]
+        self.samples: List[Dict[str, Any]] = []
+
+    def _record(self, name: str, run: Callable[[], object]):
+        # Every rerun re-selects the current tab: AppTest doesn't carry the
+        # tab state over between runs the way a browser does.
+        self.at.session_state["active_section"] = self.section
+        start = time.perf_counter()
+        wall = time.time()
+        error = None
+        try:
+            run()
+            if self.at.exception:
+                error = str(self.at.exception[0].value)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.samples.append({"name": name, "ms": (time.perf_counter() - start) * 1000, "start": wall,
+                             "error": error})
+        if self.think_ms:
+            time.sleep(self.rng.uniform(0, self.think_ms) / 1000)
+        return error is None
+
+    def start(self):
+        self._record("session.start", self.at.run)
+
+    def switch_tab(self, section: Optional[str] = None):
+        self.section = section or self.rng.choice([s for s in SECTIONS if s != self.section])
+        self._record(f"tab.{self.section}", self.at.run)
+
+    def wizard(self):
+        # Steps through the onboarding wizard to the end, filling the fields
+        # each step requires; then starts a new assessment.
+        if self.section != "Onboarding":
+            self.switch_tab("Onboarding")
+        for _ in range(MAX_WIZARD_STEPS):
+            # Each step is a form: the inputs are sent with the submit click,
+            # in one rerun.
+            role = _by_label(self.at.multiselect, "What is your role")
+            if role is not None and not role.value:
+                role.set_value([self.rng.choice(ROLES)])
+            function = _by_label(self.at.text_input, "What is your system's primary function")
+            if function is not None and not function.value:
+                function.set_value("Ranks job applications for recruiters")
+            for text in self.at.text_area:
+                text.set_value("Documented in the system card")
+            complete = _by_label(self.at.button, "Complete Assessment")
+            if complete is not None:
+                self._record("wizard.complete", lambda: complete.click().run())
+                break
+            next_button = _by_label(self.at.button, "Next")
+            if next_button is None or not self._record("wizard.next", lambda: next_button.click().run()):
+                return
+        restart = _by_label(self.at.button, "Start New Assessment")
+        if restart is not None:
+            self._record("wizard.restart", lambda: restart.click().run())
+
+    def filter_personas(self):
+        if self.section != "Personas":
+            self.switch_tab("Personas")
+        origin = _by_label(self.at.selectbox, "Filter by origin")
+        if origin is not None:
+            self._record("personas.filter", lambda: origin.set_value(self.rng.choice(origin.options)).run())
+
+    def view_suggested_fix(self):
+        if self.section != "LLM Outputs":
+            self.switch_tab("LLM Outputs")
+        buttons = [b for b in self.at.button if b.label == "View Suggested Fix"]
+        if buttons:
+            button = self.rng.choice(buttons)
+            self._record("llm.suggested_fix", lambda: button.click().run())
+
+
+SCENARIOS = {
+    "wizard": Session.wizard,
+    "personas": Session.filter_personas,
+    "suggested_fix": Session.view_suggested_fix,
+    "tabs": Session.switch_tab,
+}
+
+
+def run_session(session_id: int, iterations: int, seed: int, timeout: float, think_ms: float) -> Dict[str, Any]:
+    # Worker entry point: opens the app, then runs every scenario once per
+    # iteration in a shuffled order.
+    sys.path.insert(0, os.path.abspath(ROOT_DIR))
+    rng = random.Random(seed + session_id)
+    session = Session(rng, timeout, think_ms)
+    session.start()
+    for _ in range(iterations):
+        scenarios = list(SCENARIOS.values())
+        rng.shuffle(scenarios)
+        for scenario in scenarios:
+            scenario(session)
+    return {"session": session_id, "pid": os.getpid(), "peak_rss_mb": _peak_rss_mb(), "samples": session.samples}
+
+
+def summarize_samples(samples: List[Dict[str, Any]], wall_seconds: float) -> Dict[str, Dict[str, float]]:
+    by_name: Dict[str, List[Dict[str, Any]]] = {}
+    for sample in samples:
+        by_name.setdefault(sample["name"], []).append(sample)
+    by_name["all"] = samples
+    results = {}
+    for name, group in sorted(by_name.items()):
+        ms = np.asarray([s["ms"] for s in group], dtype=np.float64)
+        stats = {"count": len(group), "errors": sum(1 for s in group if s["error"]),
+                 "mean_ms": round(float(ms.mean()), 2), "max_ms": round(float(ms.max()), 2)}
+        for p, value in zip(PERCENTILES, np.percentile(ms, PERCENTILES).tolist()):
+            stats[f"p{p}_ms"] = round(value, 2)
+        stats["throughput_per_s"] = round(len(group) / wall_seconds, 3) if wall_seconds > 0 else None
+        results[name] = stats
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float) -> List[str]:
+    regressions = []
+    for name, stats in results.items():
+        previous = baseline.get(name)
+        if previous is None or previous["p95_ms"] <= 0:
+            continue
+        ratio = stats["p95_ms"] / previous["p95_ms"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: p95 {previous['p95_ms']:.2f} ms -> {stats['p95_ms']:.2f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run concurrent scripted sessions against app.py with AppTest and "
+                                                 "report per-interaction latency, throughput and peak RSS.")
+    parser.add_argument("--sessions", type=int, default=4, help="simulated sessions")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes, i.e. sessions running at once (default: --sessions)")
+    parser.add_argument("--iterations", type=int, default=3, help="passes over the scenarios per session")
+    parser.add_argument("--think-ms", type=float, default=0, help="random pause of up to this long after each step")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=None, help="dataset to serve (default: the bundled domain_data)")
+    parser.add_argument("--timeout", type=float, default=120, help="per-rerun AppTest timeout in seconds")
+    parser.add_argument("--output", default="load_results.json")
+    parser.add_argument("--baseline", default=None, help="previous results JSON to compare p95 latencies against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p95 slowdown vs baseline (0.2 = 20%%)")
+    parser.add_argument("--max-p95-ms", type=float, default=None, help="fail if any interaction's p95 exceeds this")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.abspath(ROOT_DIR))
+    from benchmarks.run_benchmarks import _git_revision
+
+    # Inherited by the spawned workers. Completed wizard runs go to a scratch
+    # database instead of the real assessment store.
+    if args.data_dir:
+        os.environ["DOMAIN_DATA_DIR"] = os.path.abspath(args.data_dir)
+    scratch_dir = tempfile.TemporaryDirectory(prefix="levels_load_")
+    os.environ.setdefault("LEVELS_ASSESSMENT_DB", os.path.join(scratch_dir.name, "assessments.sqlite3"))
+
+    workers = max(1, min(args.workers or args.sessions, args.sessions))
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        sessions = list(pool.map(run_session, range(args.sessions), [args.iterations] * args.sessions,
+                                 [args.seed] * args.sessions, [args.timeout] * args.sessions,
+                                 [args.think_ms] * args.sessions))
+    samples = [s for session in sessions for s in session["samples"]]
+    # Throughput over the span in which sessions were interacting, so worker
+    # start-up doesn't count.
+    wall_seconds = max(s["start"] + s["ms"] / 1000 for s in samples) - min(s["start"] for s in samples)
+    results = summarize_samples(samples, wall_seconds)
+    peaks: Dict[int, float] = {}
+    for session in sessions:
+        if session["peak_rss_mb"] is not None:
+            peaks[session["pid"]] = max(peaks.get(session["pid"], 0), session["peak_rss_mb"])
+    errors = sorted({s["error"] for s in samples if s["error"]})
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "data_dir": os.environ.get("DOMAIN_DATA_DIR"),
+            "sessions": args.sessions,
+            "workers": workers,
+            "iterations": args.iterations,
+            "think_ms": args.think_ms,
+            "seed": args.seed,
+            "elapsed_s": round(time.time() - start, 2),
+            "wall_s": round(wall_seconds, 2),
+        },
+        "results": results,
+        "peak_rss_mb": {"max": max(peaks.values(), default=None), "total": round(sum(peaks.values()), 1) or None,
+                        "per_worker": sorted(peaks.values(), reverse=True)},
+        "errors": errors,
+    }
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    for name, stats in results.items():
+        print(f"{name:35s} n={stats['count']:<5d} p50 {stats['p50_ms']:9.2f} ms  p95 {stats['p95_ms']:9.2f} ms  "
+              f"p99 {stats['p99_ms']:9.2f} ms  {stats['throughput_per_s']:8.2f}/s  errors {stats['errors']}")
+    print(f"Peak RSS per worker: {report['peak_rss_mb']['max']} MB max, {report['peak_rss_mb']['total']} MB total")
+    print(f"Wrote {args.output}")
+
+    failures = [f"{len(errors)} distinct errors, first: {errors[0]}"] if errors else []
+    if args.max_p95_ms is not None:
+        failures += [f"{name}: p95 {stats['p95_ms']:.2f} ms > {args.max_p95_ms:.2f} ms"
+                     for name, stats in results.items() if name != "all" and stats["p95_ms"] > args.max_p95_ms]
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            failures += compare(results, json.load(file)["results"], args.threshold)
+    if failures:
+        print("Load test failed:", *failures, sep="\n  ")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+APP_PATH = os.path.join(ROOT_DIR, "app.py")
+
+SECTIONS = ["Onboarding", "Personas", "Question Library", "LLM Outputs", "Evaluation Score"]
+
+
+def _time(fn: Callable[[], object], repeat: int, setup: Optional[Callable[[], object]] = None) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "repeat": repeat,
+        "min_ms": min(samples),
+        "median_ms": statistics.median(samples),
+        "max_ms": max(samples),
+    }
+
+
+def bench_loaders(repeat: int) -> Dict[str, Dict[str, float]]:
+    from utils import data_loader
+
+    loaders = {
+        "load_personas": data_loader.load_personas,
+        "load_questions": data_loader.load_questions,
+        "load_llm_responses": data_loader.load_llm_responses,
+        "load_evaluations": data_loader.load_evaluations,
+        "load_insights": data_loader.load_insights,
+    }
+    results = {}
+    for name, fn in loaders.items():
+        results[f"{name}.cold"] = _time(fn, repeat, setup=data_loader.domain_cache.clear)
+        fn()
+        results[f"{name}.warm"] = _time(fn, repeat)
+    return results
+
+
+def bench_aggregation(repeat: int) -> Dict[str, Dict[str, float]]:
+    from utils.aggregation import GROUPINGS, build_score_matrix, group_by, question_groups, summarize
+    from utils.repository import get_repository
+
+    repo = get_repository()
+    matrix = build_score_matrix(repo.evaluations)
+    results = {
+        "aggregation.build_score_matrix": _time(lambda: build_score_matrix(repo.evaluations), repeat),
+        "aggregation.summarize": _time(lambda: summarize(matrix), repeat),
+    }
+    for by in GROUPINGS:
+        groups = question_groups(repo, by)
+        results[f"aggregation.group_by.{by}"] = _time(lambda: group_by(matrix, groups), repeat)
+    return results
+
+
+def bench_sections(repeat: int, timeout: float) -> Dict[str, Dict[str, float]]:
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.run()
+    for label in SECTIONS:
+        at.session_state["active_section"] = label
+        at.run()  # first render: imports, data loading, figure cache warm-up
+        if at.exception:
+            raise RuntimeError(f"{label} raised: {at.exception[0].value}")
+        results[f"render.{label}"] = _time(at.run, repeat)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float) -> List[str]:
+    regressions = []
+    for name, stats in results.items():
+        previous = baseline.get(name)
+        if previous is None or previous["median_ms"] <= 0:
+            continue
+        ratio = stats["median_ms"] / previous["median_ms"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: {previous['median_ms']:.2f} ms -> {stats['median_ms']:.2f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark data loading, aggregation and section rendering.")
+    parser.add_argument("--data-dir", default=None, help="existing dataset; generated when omitted")
+    parser.add_argument("--scale", type=int, default=1000, help="size of the generated dataset")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-render", action="store_true", help="skip the AppTest section renders")
+    parser.add_argument("--render-timeout", type=float, default=300)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default=None, help="previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.abspath(ROOT_DIR))
+    data_dir = args.data_dir
+    if data_dir is None:
+        from benchmarks.generate_data import generate
+        data_dir = tempfile.mkdtemp(prefix="levels_bench_")
+        generate(data_dir, args.scale)
+    data_dir = os.path.abspath(data_dir)
+    # Set before the loaders are imported so AppTest runs see the same dataset.
+    os.environ["DOMAIN_DATA_DIR"] = data_dir
+    from utils import data_loader
+    data_loader.DATA_DIR = data_dir
+
+    results = {}
+    results.update(bench_loaders(args.repeat))
+    results.update(bench_aggregation(args.repeat))
+    if not args.skip_render:
+        results.update(bench_sections(args.repeat, args.render_timeout))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "data_dir": data_dir,
+            "scale": args.scale if args.data_dir is None else None,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    for name, stats in results.items():
+        print(f"{name:45s} {stats['median_ms']:10.2f} ms")
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            regressions = compare(results, json.load(file)["results"], args.threshold)
+        if regressions:
+            print("Regressions against baseline:", *regressions, sep="\n  ")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import streamlit as st
+from utils.data_loader import get_cache_stats
+from utils.figure_cache import figure_cache
+from utils.instrumentation import instrumentation
+from utils.startup import startup_profiler
+
+def display_startup_report():
+    st.divider()
+    st.subheader("Startup Report")
+    st.caption("First-render cost per section and the slowest module imports in this server process.")
+    report = startup_profiler.report()
+    st.write("**Sections**")
+    st.json(report["sections"])
+    st.write("**Imports**")
+    st.json(report["imports"], expanded=False)
+
+def display_diagnostics():
+    st.divider()
+    st.subheader("Diagnostics")
+    st.caption(f"Rolling hot-path timings for this server process (last {instrumentation.window} samples per metric).")
+    # Collection is per process and set at startup, so one session can't
+    # change what the others record; the toggle only affects this view.
+    if not instrumentation.enabled:
+        st.info("Timing collection is off for this server process. Start it with LEVELS_INSTRUMENTATION=1 to enable.")
+    if st.toggle("Show timings", value=True, key="diagnostics_show_timings"):
+        stats = instrumentation.stats()
+        if not stats:
+            st.info("No timings recorded yet. Interact with the dashboard to collect some.")
+        else:
+            st.dataframe([{"metric": name, **values} for name, values in stats.items()], hide_index=True)
+    st.write("**Caches**")
+    st.json({"domain_data": get_cache_stats(), "figures": figure_cache.stats()}, expanded=False)
+    # Read-only: exports are downloads, nothing is written on the server and
+    # the timings can't be reset from here.
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("Download JSON", data=instrumentation.to_json, file_name="timings.json",
+                           mime="application/json", on_click="ignore", key="diagnostics_export_json")
+    with col2:
+        st.download_button("Download Prometheus", data=instrumentation.to_prometheus, file_name="timings.prom",
+                           mime="text/plain", on_click="ignore", key="diagnostics_export_prometheus")
@@ -1,45 +1,134 @@
+import numpy as np
 import streamlit as st
-from utils.data_loader import load_evaluations
-from utils.visualization import create_radar_chart
+from utils.aggregation import compare_summaries, question_groups
+from utils.datasets import dataset_registry
+from utils.evaluation_log import get_evaluation_log
+from utils.history_store import get_history_store
+from utils.visualization import create_comparison_radar_chart, create_radar_chart, create_trend_chart
+
+GROUP_OPTIONS = {
+    "All questions": None,
+    "Question category": "category",
+    "Question subcategory": "subcategory",
+    "Persona": "persona",
+}
+NO_COMPARISON = "None"
+
+def _summary_for(repo, grouping, selected_group):
+    # None when the selected group has no questions in this dataset.
+    if grouping is None:
+        return repo.overall_summary
+    return repo.group_summary(grouping, selected_group)
+
+def _chart_grid(keys, render):
+    charts_per_row = min(3, len(keys))
+    for start in range(0, len(keys), charts_per_row):
+        cols = st.columns(charts_per_row)
+        for col, category in zip(cols, keys[start:start + charts_per_row]):
+            with col:
+                render(category)
+
+def _display_comparison(summary, other_summary, dataset_name, compare_name):
+    comparison = compare_summaries(summary, other_summary)
+    all_categories = comparison.categories()
+    if not all_categories:
+        st.warning("No evaluations found for the selected filter.")
+        return
+    st.write(f"## {dataset_name} vs. {compare_name}")
+    st.caption("Scores from the evaluation files of each dataset; the appended evaluation log is not included.")
+
+    def render(category):
+        base, other = comparison.values(category)
+        fig = create_comparison_radar_chart({dataset_name: base, compare_name: other}, all_categories[category], category)
+        st.plotly_chart(fig, use_container_width=True, key=f"compare_{category}")
+
+    _chart_grid(list(all_categories), render)
+    st.write("## Per-subcategory deltas")
+    order = np.argsort(-np.nan_to_num(np.abs(comparison.delta), nan=-1.0), kind="stable")
+    st.dataframe([{"Category": comparison.columns[i][0],
+                   "Subcategory": comparison.columns[i][1],
+                   dataset_name: None if np.isnan(comparison.base[i]) else float(comparison.base[i]),
+                   compare_name: None if np.isnan(comparison.other[i]) else float(comparison.other[i]),
+                   "Delta": None if np.isnan(comparison.delta[i]) else float(comparison.delta[i])}
+                  for i in order.tolist()],
+                 hide_index=True, use_container_width=True)
+
+def _display_trends(data_dir, all_categories):
+    # Per-run aggregates from the memory-mapped history. Read-only: runs are
+    # recorded by `python -m utils.history_store sync` or the precompute worker.
+    history = get_history_store(data_dir)
+    run_ids = history.run_ids()
+    if len(run_ids) < 2:
+        return
+    st.write("## Score Trends")
+    st.caption(f"Mean score per subcategory across {len(run_ids)} evaluation runs.")
+    categories = [c for c in all_categories if any(column[0] == c for column in history.columns)]
+    if not categories:
+        return
+    category = st.selectbox("Category:", categories, key="trend_category")
+    series = {}
+    for sub in [sub for cat, sub in history.columns if cat == category]:
+        values = history.series(category, sub)
+        series[sub] = [None if v != v else round(v, 6) for v in values.tolist()]
+    st.plotly_chart(create_trend_chart(run_ids, series, category), use_container_width=True, key="trend_chart")
 
 def display_evaluations(tab):
     with tab:
         st.header("Evaluation Score")
         st.markdown("Here’s a summary of the **evaluation scores** for the test questions.")
-        evaluations = load_evaluations()
-        if not evaluations:
+        datasets = dataset_registry.datasets()
+        dataset_name, compare_name = dataset_registry.default_name, None
+        if len(datasets) > 1:
+            data_col, compare_col = st.columns(2)
+            with data_col:
+                dataset_name = st.selectbox("Dataset:", list(datasets), key="eval_dataset")
+            with compare_col:
+                others = [name for name in datasets if name != dataset_name]
+                choice = st.selectbox("Compare with:", [NO_COMPARISON] + others, key="eval_compare")
+                compare_name = None if choice == NO_COMPARISON else choice
+        repo = dataset_registry.get(dataset_name)
+        evaluation_log = get_evaluation_log(datasets[dataset_name])
+        if not repo.evaluations and not evaluation_log.exists() and compare_name is None:
             st.warning("No evaluations found.")
         else:
-            all_categories = {}
-            for eval_item in evaluations:
-                for category, sub_scores in eval_item.scores.items():
-                    if category not in all_categories:
-                        all_categories[category] = set()
-                    for sub in sub_scores.keys():
-                        all_categories[category].add(sub)
-            for category in all_categories:
-                all_categories[category] = sorted(list(all_categories[category]))
-            aggregated_scores = {cat: {sub: [] for sub in subs} for cat, subs in all_categories.items()}
-            for eval_item in evaluations:
-                for category, sub_scores in eval_item.scores.items():
-                    for sub, score in sub_scores.items():
-                        aggregated_scores[category][sub].append(score)
-            avg_scores = {}
-            for category, sub_scores in aggregated_scores.items():
-                avg_scores[category] = {sub: (sum(scores)/len(scores) if scores else 0) for sub, scores in sub_scores.items()}
+            group_col, value_col = st.columns(2)
+            with group_col:
+                grouping = GROUP_OPTIONS[st.selectbox("Filter evaluations by:", list(GROUP_OPTIONS))]
+            selected_group = None
+            if grouping is not None:
+                groups = question_groups(repo, grouping)
+                with value_col:
+                    selected_group = st.selectbox("Group:", list(groups))
+            summary = _summary_for(repo, grouping, selected_group)
+            if compare_name is not None:
+                other_summary = _summary_for(dataset_registry.get(compare_name), grouping, selected_group)
+                if summary is None or other_summary is None:
+                    st.warning("No evaluations found for the selected filter.")
+                    return
+                _display_comparison(summary, other_summary, dataset_name, compare_name)
+                return
+            if summary is None:
+                st.warning("No evaluations found for the selected filter.")
+                return
+            avg_scores = summary.averages()
+            all_categories = summary.categories()
+            if grouping is None and evaluation_log.exists():
+                # Appended runs are folded into running totals incrementally.
+                # The totals aren't kept per question, so filters exclude them.
+                aggregates = evaluation_log.refresh()
+                if aggregates.records:
+                    avg_scores, all_categories = aggregates.merge(summary)
+                    st.caption(f"Includes {aggregates.records} evaluations from the appended evaluation log.")
+            if not all_categories or (grouping is not None and not summary.count.any()):
+                st.warning("No evaluations found for the selected filter.")
+                return
             st.write("## Evaluation by Category")
-            num_categories = len(all_categories)
-            charts_per_row = min(3, num_categories)
-            rows_needed = (num_categories + charts_per_row - 1) // charts_per_row
-            keys = list(all_categories.keys())
-            for row in range(rows_needed):
-                cols = st.columns(charts_per_row)
-                for col_idx, col in enumerate(cols):
-                    chart_idx = row * charts_per_row + col_idx
-                    if chart_idx < num_categories:
-                        category = keys[chart_idx]
-                        subcategories = all_categories[category]
-                        values = [avg_scores[category][sub] for sub in subcategories]
-                        fig = create_radar_chart(values, subcategories, category)
-                        with col:
-                            st.plotly_chart(fig, use_container_width=True)
+
+            def render(category):
+                subcategories = all_categories[category]
+                values = [avg_scores[category][sub] for sub in subcategories]
+                fig = create_radar_chart(values, subcategories, category)
+                st.plotly_chart(fig, use_container_width=True)
+
+            _chart_grid(list(all_categories), render)
+            _display_trends(datasets[dataset_name], all_categories)
@@ -0,0 +1,21 @@
+import streamlit as st
+from utils.insights import get_reviewer_aggregates
+
+# Comments listed per question or response; the rest are counted.
+MAX_COMMENTS = 20
+
+def display_comments(insights):
+    if not insights:
+        return
+    with st.expander(f"Reviewer comments ({len(insights)})"):
+        for insight in insights[:MAX_COMMENTS]:
+            st.write(f"**{insight.reviewer}:** {insight.comment_text}")
+        if len(insights) > MAX_COMMENTS:
+            st.caption(f"and {len(insights) - MAX_COMMENTS} more")
+
+def display_reviewer_table(repo):
+    aggregates = get_reviewer_aggregates(repo)
+    if not aggregates.reviewers:
+        return
+    with st.expander(f"Reviewers ({len(aggregates.reviewers)})"):
+        st.dataframe(aggregates.rows(), hide_index=True, use_container_width=True)
@@ -1,17 +1,49 @@
 import streamlit as st
-from utils.data_loader import load_llm_responses, load_questions
+from components.insights import display_comments, display_reviewer_table
+from components.pagination import page_controls
+from utils.insights import get_reviewer_aggregates
+from utils.repository import get_repository
+
+SORT_OPTIONS = {
+    "Data order": "position",
+    "Risk score (high to low)": "risk_desc",
+    "Risk score (low to high)": "risk_asc",
+    "Risk flag": "flag",
+    "Category": "category",
+}
 
 def display_llm_responses(tab):
     with tab:
         st.header("LLM Outputs")
         st.markdown("The LLM’s **outputs** to the test questions are listed below.")
-        responses = load_llm_responses()
-        questions = load_questions()
+        repo = get_repository()
+        responses = repo.responses
         if not responses:
             st.warning("No LLM Outputs found.")
         else:
-            for response in responses:
-                q_text = next((q.question_text for q in questions if q.id == response.question_id), "Question text not found")
+            display_reviewer_table(repo)
+            # Sort and filter on the precomputed index first, then build
+            # widgets for one page only.
+            sort_col, flag_col, category_col, reviewer_col = st.columns([1, 2, 1, 1])
+            with sort_col:
+                sort = SORT_OPTIONS[st.selectbox("Sort by:", list(SORT_OPTIONS), key="responses_sort")]
+            with flag_col:
+                flags = st.multiselect("Risk flags:", repo.risk_flags, key="responses_flags")
+            with category_col:
+                category = st.selectbox("Category:", ["All"] + repo.categories, key="responses_category")
+            with reviewer_col:
+                reviewers = st.multiselect("Reviewers:", get_reviewer_aggregates(repo).reviewers,
+                                           key="responses_reviewers")
+            category = None if category == "All" else category
+            positions = repo.response_index.select(sort, flag=flags, category=category, reviewer=reviewers)
+            if not len(positions):
+                st.warning("No LLM Outputs match the selected filters.")
+                return
+            start, stop = page_controls("responses", len(positions), (sort, tuple(flags), category, tuple(reviewers)))
+            for index in positions[start:stop].tolist():
+                response = responses[index]
+                question = repo.question(response.question_id)
+                q_text = question.question_text if question else "Question text not found"
                 with st.container():
                     st.subheader(f"Question ID: {response.question_id}")
                     st.write(f"**Question:** {q_text}")
@@ -19,6 +51,7 @@ def display_llm_responses(tab):
                     with col1:
                         st.write(f"**Response:** {response.response_text}")
                         st.write(f"**Risk Flags:** {', '.join(response.risk_flags)}")
+                        display_comments(repo.insights_for(response.question_id))
                     with col2:
                         risk_percent = response.risk_score * 100
                         color = "green" if risk_percent < 25 else "orange" if risk_percent < 50 else "red"
@@ -29,7 +62,7 @@ def display_llm_responses(tab):
                                 <h2 style="margin:0;">{risk_percent:.1f}%</h2>
                             </div>
                             """, unsafe_allow_html=True)
-                        if st.button("View Suggested Fix", key=f"fix_{response.question_id}", help="View suggestions to reduce risk score"):
+                        if st.button("View Suggested Fix", key=f"fix_{index}_{response.question_id}", help="View suggestions to reduce risk score"):
                             if response.suggested_fix:
                                 st.info(response.suggested_fix)
                             else:
@@ -1,8 +1,194 @@
+import csv
+import io
 import streamlit as st
 from datetime import datetime
+from utils.assessment_store import get_assessment_store
+from utils.wizard import load_wizard
 
-def ai_act_compliance_wizard(tabs):
-    with tabs[0]:
+ROLES = ["Provider", "Deployer", "Distributor", "Importer"]
+SAVED_PREVIEW_ROWS = 20
+# Streamlit can't stream a download, so the in-app export is capped; the
+# CLI exports everything.
+MAX_EXPORT_ROWS = 10_000
+EXPORT_COMMAND = "python -m utils.assessment_store export"
+
+
+def _export_file(fmt: str, filters: dict) -> bytes:
+    # Called by the download button when it is clicked. Streamlit holds the
+    # whole download in memory, so the export is built as bytes, at most
+    # MAX_EXPORT_ROWS assessments.
+    store = get_assessment_store()
+    if fmt == "parquet":
+        buffer = io.BytesIO()
+        store.export_parquet(buffer, limit=MAX_EXPORT_ROWS, **filters)
+        return buffer.getvalue()
+    return "".join(store.iter_csv(limit=MAX_EXPORT_ROWS, **filters)).encode("utf-8")
+
+
+def display_saved_assessments():
+    store = get_assessment_store()
+    with st.expander(f"Saved Assessments ({store.count()})"):
+        col1, col2 = st.columns(2)
+        with col1:
+            eu_only = st.checkbox("EU-relevant only", key="saved_eu_only")
+        with col2:
+            role = st.selectbox("Role:", ["All"] + ROLES, key="saved_role")
+        filters = {"is_eu": True if eu_only else None, "role": None if role == "All" else role}
+        matching = store.count(**filters)
+        if not matching:
+            st.write("No saved assessments match the selected filters.")
+            return
+        st.caption(f"{matching} matching assessments, latest {min(matching, SAVED_PREVIEW_ROWS)} shown.")
+        st.dataframe([{"id": record["id"],
+                       "Completed": record.get("completion_date", ""),
+                       "EU": "Yes" if record.get("is_eu") else "No",
+                       "Role(s)": ", ".join(record.get("role", [])),
+                       "Primary Function": record.get("primary_function", ""),
+                       "High-Risk Categories": ", ".join(record.get("high_risk_options", []))}
+                      for record in store.list(limit=SAVED_PREVIEW_ROWS, **filters)],
+                     hide_index=True, use_container_width=True)
+        if matching > MAX_EXPORT_ROWS:
+            st.caption(f"Exports here hold the first {MAX_EXPORT_ROWS} matching assessments; "
+                       f"use `{EXPORT_COMMAND}` for all of them.")
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Export as CSV", data=lambda: _export_file("csv", filters),
+                               file_name=f"ai_act_assessments_{stamp}.csv", mime="text/csv",
+                               on_click="ignore", key="export_assessments_csv")
+        with col2:
+            st.download_button("Export as Parquet", data=lambda: _export_file("parquet", filters),
+                               file_name=f"ai_act_assessments_{stamp}.parquet",
+                               mime="application/vnd.apache.parquet", on_click="ignore",
+                               key="export_assessments_parquet")
+
+
+def _widget_key(question) -> str:
+    return f"wizard_q_{question.id}"
+
+
+def _render_question(question, answers: dict):
+    value = answers.get(question.id, question.empty())
+    key = _widget_key(question)
+    if question.type == "checkbox":
+        st.checkbox(question.label, value=bool(value), help=question.help, key=key)
+    elif question.type == "multiselect":
+        st.multiselect(question.label, list(question.options), default=[v for v in value if v in question.options],
+                       help=question.help, key=key)
+    elif question.type == "selectbox":
+        options = list(question.options)
+        st.selectbox(question.label, options, index=options.index(value) if value in options else 0,
+                     help=question.help, key=key)
+    elif question.type == "text_input":
+        st.text_input(question.label, value=value or "", help=question.help, key=key)
+    else:
+        st.text_area(question.label, value=value or "", help=question.help, key=key)
+
+
+def _submit_step(wizard, step, direction: int):
+    # Form callback: runs before the rerun, with the whole step's inputs in
+    # session state at once.
+    answers = st.session_state.assessment_data
+    for question in step.visible_questions(answers):
+        answers[question.id] = st.session_state.get(_widget_key(question), question.empty())
+    st.session_state.wizard_error = None
+    if direction > 0:
+        missing = wizard.missing(step, answers)
+        if missing:
+            st.session_state.wizard_error = "Please answer: " + "; ".join(q.label for q in missing)
+            return
+    target = wizard.next_step(step.id, answers, direction)
+    if target is not None:
+        st.session_state.wizard_step = target.id
+    elif direction > 0:
+        _complete_assessment(wizard)
+
+
+def _complete_assessment(wizard):
+    answers = wizard.visible_answers(st.session_state.assessment_data)
+    result = wizard.classify(answers)
+    data = {"completion_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), **answers,
+            "risk_level": result.level, "risk_obligations": list(result.obligations)}
+    st.session_state.assessment_data = data
+    st.session_state.is_completed = True
+    get_assessment_store().save(dict(data))
+
+
+def _start_new_assessment(wizard):
+    st.session_state.wizard_step = wizard.steps[0].id
+    st.session_state.assessment_data = {}
+    st.session_state.is_completed = False
+    st.session_state.wizard_error = None
+
+
+def _display_step(wizard, step, answers: dict):
+    active = wizard.active_steps(answers)
+    position = next((i for i, s in enumerate(active) if s.id == step.id), 0)
+    st.progress((position + 1) / (len(active) + 1))
+    st.info(f"Step {position + 1} of {len(active)}")
+    # One form per step: inputs are sent together on Next/Previous instead
+    # of rerunning the app on every change.
+    with st.form(f"wizard_form_{step.id}"):
+        st.markdown(f"### {step.title}")
+        section = None
+        for question in step.visible_questions(answers):
+            if question.section != section:
+                section = question.section
+                if section:
+                    st.markdown(f"#### {section}")
+            _render_question(question, answers)
+        if step.help_title:
+            with st.expander(step.help_title):
+                st.markdown(step.help_text or "")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.form_submit_button("← Previous", on_click=_submit_step, args=(wizard, step, -1),
+                                  disabled=(position == 0))
+        with col2:
+            last = wizard.next_step(step.id, answers) is None
+            st.form_submit_button("Complete Assessment" if last else "Next →", on_click=_submit_step,
+                                  args=(wizard, step, 1))
+    if st.session_state.get('wizard_error'):
+        st.error(st.session_state.wizard_error)
+
+
+def _display_value(value) -> str:
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, (list, tuple)):
+        return ", ".join(value)
+    return "" if value is None else str(value)
+
+
+def _display_summary(wizard, data: dict):
+    st.markdown("### Assessment Summary")
+    st.success(f"Assessment completed on {data.get('completion_date', '')}")
+    result = wizard.classify(data)
+    st.markdown(f"**Risk Level:** {result.level}" + (f" — {result.reason}" if result.reason else ""))
+    for obligation in result.obligations:
+        st.markdown(f"- {obligation}")
+    with st.expander("View Assessment Details", expanded=True):
+        for question in wizard.questions:
+            if question.summary:
+                st.write(f"{question.summary}:", _display_value(data.get(question.id)))
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("Start New Assessment", on_click=_start_new_assessment, args=(wizard,))
+    with col2:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(data))
+        writer.writeheader()
+        writer.writerow({key: _display_value(value) for key, value in data.items()})
+        st.download_button(
+            label="Download Assessment Report",
+            data=buffer.getvalue(),
+            file_name=f"ai_act_assessment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
+
+
+def ai_act_compliance_wizard(tab):
+    with tab:
         st.header("Onboarding")
         st.markdown("Fill in your **Operational Design Domain** (ODD). Complete a basic EU AI Act Compliance and ODD Assessment below to scope out your AI risks. ")
         if 'wizard_mode' not in st.session_state:
@@ -11,121 +197,23 @@ def ai_act_compliance_wizard(tabs):
         st.session_state.wizard_mode = wizard_mode
         
         if wizard_mode:
-            if 'current_step' not in st.session_state:
-                st.session_state.current_step = 1
+            try:
+                wizard = load_wizard()
+            except (OSError, ValueError) as e:
+                st.error(f"The onboarding wizard could not be loaded: {e}")
+                return
+            if st.session_state.get('wizard_step') not in [step.id for step in wizard.steps]:
+                st.session_state.wizard_step = wizard.steps[0].id
             if 'assessment_data' not in st.session_state:
                 st.session_state.assessment_data = {}
             if 'is_completed' not in st.session_state:
                 st.session_state.is_completed = False
 
-            def next_step():
-                st.session_state.current_step += 1
-
-            def prev_step():
-                st.session_state.current_step -= 1
-
-            def complete_assessment():
-                st.session_state.is_completed = True
-                st.session_state.assessment_data['completion_date'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            total_steps = 3
-            progress = st.session_state.current_step / (total_steps + 1)
-            st.progress(progress)
-            st.info(f"Step {st.session_state.current_step} of {total_steps}")
-
-            if st.session_state.current_step == 1:
-                st.markdown("### SECTION 1: Jurisdiction & User Role")
-                is_eu = st.checkbox("Is your system made available in the EU or affects people in the EU?",
-                                    help="Check if deployed in EU or processing EU citizen data")
-                st.session_state.assessment_data['is_eu'] = is_eu
-                role = st.multiselect("What is your role regarding the AI system? (Select all that apply)",
-                                      ["Provider", "Deployer", "Distributor", "Importer"],
-                                      help="Select all roles that apply")
-                with st.expander("Need help understanding these roles?"):
-                    st.markdown("**Provider**: Develops the AI system\n\n**Deployer**: Uses an AI system\n\n**Distributor**: Makes the system available on the market\n\n**Importer**: Brings AI systems from outside the EU")
-                st.session_state.assessment_data['role'] = role
-                st.button("Next →", on_click=next_step, disabled=(not role))
-            elif st.session_state.current_step == 2:
-                st.markdown("### SECTION 2: AI Risk Classification")
-                primary_function = st.text_input("What is your system's primary function?",
-                                                 value=st.session_state.assessment_data.get('primary_function', ''),
-                                                 help="e.g., scoring students, matching CVs")
-                st.session_state.assessment_data['primary_function'] = primary_function
-                high_risk_options = st.multiselect("Does it fall into any high-risk categories?",
-                                                   ["Education and vocational training", "Employment", "Public services", "Law enforcement",
-                                                    "Migration", "Administration of justice", "Critical infrastructure", "Product safety"],
-                                                   default=st.session_state.assessment_data.get('high_risk_options', []),
-                                                   help="Select applicable categories")
-                st.session_state.assessment_data['high_risk_options'] = high_risk_options
-                prohibited_tasks = st.multiselect("Does the system perform any prohibited tasks?",
-                                                  ["Subliminal Manipulation", "Social Scoring", "Real-time Biometric ID",
-                                                   "Exploitation of Vulnerabilities", "Emotion Recognition", "Predictive Policing", "None of the Above"],
-                                                  help="Select all that apply")
-                st.session_state.assessment_data['prohibited_tasks'] = prohibited_tasks
-                requires_transparency = st.checkbox("Does the system require transparency (e.g., chatbot or deepfake)?")
-                st.session_state.assessment_data['requires_transparency'] = requires_transparency
-
-                if st.session_state.assessment_data.get('is_eu') and high_risk_options:
-                    st.markdown("#### Additional Compliance Questions for High-Risk Systems")
-                    st.session_state.assessment_data['risk_management'] = st.text_area("Documented risk management system?")
-                    st.session_state.assessment_data['human_oversight'] = st.text_area("Measures for human oversight?")
-                    st.session_state.assessment_data['data_protection'] = st.text_area("Compliance with data protection (e.g., GDPR)?")
-                    st.session_state.assessment_data['post_market'] = st.text_area("Plan for continuous monitoring?")
-                if "Provider" in st.session_state.assessment_data.get('role', []):
-                    st.markdown("##### Provider-Specific Question")
-                    st.session_state.assessment_data['algorithmic_transparency'] = st.text_area("How do you document your system's decision process?")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.button("← Previous", on_click=prev_step)
-                with col2:
-                    st.button("Next →", on_click=next_step)
-            elif st.session_state.current_step == 3:
-                st.markdown("### SECTION 3: Operational Design Domain (ODD)")
-                st.session_state.assessment_data['environment'] = st.text_area("Environment where the system operates?",
-                                                                               value=st.session_state.assessment_data.get('environment', ''))
-                st.session_state.assessment_data['users'] = st.text_area("Who are the users? Provide details.")
-                st.session_state.assessment_data['input_data'] = st.text_area("What input data does your system use?")
-                st.session_state.assessment_data['temporal_constraints'] = st.text_area("Any temporal constraints?")
-                st.session_state.assessment_data['assumptions'] = st.text_area("What assumptions does the system make?")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.button("← Previous", on_click=prev_step)
-                with col2:
-                    selected_roles = st.session_state.assessment_data.get('role', [])
-                    st.button("Complete Assessment", on_click=complete_assessment, disabled=(not selected_roles))
-            
             if st.session_state.get('is_completed'):
-                st.markdown("### Assessment Summary")
-                st.success(f"Assessment completed on {st.session_state.assessment_data.get('completion_date','')}")
-                with st.expander("View Assessment Details", expanded=True):
-                    st.write("EU Relevant:", "Yes" if st.session_state.assessment_data.get('is_eu') else "No")
-                    st.write("User Role(s):", ", ".join(st.session_state.assessment_data.get('role', [])))
-                    st.write("Primary Function:", st.session_state.assessment_data.get('primary_function', ''))
-                    st.write("High-Risk Categories:", ", ".join(st.session_state.assessment_data.get('high_risk_options', [])))
-                    st.write("Prohibited Tasks:", ", ".join(st.session_state.assessment_data.get('prohibited_tasks', [])))
-                    st.write("Requires Transparency:", "Yes" if st.session_state.assessment_data.get('requires_transparency') else "No")
-                    st.write("Environment:", st.session_state.assessment_data.get('environment', ''))
-                    st.write("Users:", st.session_state.assessment_data.get('users', ''))
-                    st.write("Input Data:", st.session_state.assessment_data.get('input_data', ''))
-                    st.write("Temporal Constraints:", st.session_state.assessment_data.get('temporal_constraints', ''))
-                    st.write("Assumptions:", st.session_state.assessment_data.get('assumptions', ''))
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("Start New Assessment"):
-                        st.session_state.current_step = 1
-                        st.session_state.assessment_data = {}
-                        st.session_state.is_completed = False
-                        st.experimental_rerun()
-                with col2:
-                    import pandas as pd
-                    df = pd.DataFrame([st.session_state.assessment_data])
-                    csv = df.to_csv(index=False)
-                    st.download_button(
-                        label="Download Assessment Report",
-                        data=csv,
-                        file_name=f"ai_act_assessment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                        mime="text/csv"
-                    )
+                _display_summary(wizard, st.session_state.assessment_data)
+            else:
+                _display_step(wizard, wizard.step(st.session_state.wizard_step), st.session_state.assessment_data)
+            display_saved_assessments()
         else:
             st.markdown("### Standard View")
             is_eu = st.checkbox("Is your system made available in the EU or affects people in the EU?")
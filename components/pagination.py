@@ -0,0 +1,36 @@
+import os
+from typing import Hashable, Tuple
+import streamlit as st
+
+PAGE_SIZES = [10, 25, 50, 100]
+DEFAULT_PAGE_SIZE = int(os.environ.get("LEVELS_PAGE_SIZE", "25"))
+
+def page_bounds(total: int, page_size: int, page: int) -> Tuple[int, int, int]:
+    # (start, stop, page count) with `page` clamped to the pages that exist.
+    pages = max(1, -(-total // page_size))
+    page = min(max(page, 1), pages)
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total), pages
+
+def page_controls(key: str, total: int, selection: Hashable) -> Tuple[int, int]:
+    # Page size and page number widgets for a list of `total` items. Goes back
+    # to the first page whenever `selection` (the current sort and filters)
+    # changes. Returns the [start, stop) range to render.
+    size_key, page_key, selection_key = f"{key}_page_size", f"{key}_page", f"{key}_selection"
+    sizes = sorted(set(PAGE_SIZES + [DEFAULT_PAGE_SIZE]))
+    if st.session_state.get(selection_key) != selection:
+        st.session_state[selection_key] = selection
+        st.session_state[page_key] = 1
+    size_col, page_col, info_col = st.columns([1, 1, 3])
+    with size_col:
+        page_size = st.selectbox("Per page:", sizes, index=sizes.index(DEFAULT_PAGE_SIZE), key=size_key)
+    _, _, pages = page_bounds(total, page_size, 1)
+    # Clamp before the widget exists; a smaller result set or a larger page
+    # size can leave the stored page out of range.
+    st.session_state[page_key] = min(max(st.session_state.get(page_key, 1), 1), pages)
+    with page_col:
+        page = st.number_input(f"Page (of {pages}):", min_value=1, max_value=pages, step=1, key=page_key)
+    start, stop, _ = page_bounds(total, page_size, page)
+    with info_col:
+        st.caption(f"Showing {start + 1 if total else 0}–{stop} of {total}")
+    return start, stop
@@ -1,41 +1,87 @@
 import streamlit as st
-from utils.data_loader import load_questions
+from components.insights import display_comments
+from components.pagination import page_controls
+from utils.repository import get_repository
+from utils.search import get_search_index
+
+KIND_LABELS = {
+    "question": "Question",
+    "response": "LLM Response",
+    "suggested_fix": "Suggested Fix",
+    "insight": "Reviewer Comment",
+}
+SORT_OPTIONS = {
+    "Data order": "position",
+    "Question ID": "id",
+    "Category": "category",
+    "Risk score (high to low)": "risk_desc",
+}
 
 def display_question_library(tab):
     with tab:
         st.header("Question Library") 
         st.markdown("Here’s a library of **test questions**. You can use to simulate real-world interactions with the LLM. ")
 
-        questions = load_questions()
-        categories = ["All"] + sorted(list(set(q.category for q in questions)))
+        repo = get_repository()
+        questions = repo.questions
+        categories = ["All"] + repo.categories
+        search_col, flag_col = st.columns([3, 1])
+        with search_col:
+            query = st.text_input("Search questions, responses and reviewer comments:",
+                                  placeholder="e.g. leadership, career gap, communication")
+        with flag_col:
+            selected_flags = st.multiselect("Risk flags:", repo.risk_flags)
         filter_col1, filter_col2 = st.columns(2)
         with filter_col1:
             selected_category = st.selectbox("Filter by category:", categories)
-        if selected_category == "All":
-            filtered_questions = questions
-            subcategories = ["All"]
-        else:
-            filtered_questions = [q for q in questions if q.category == selected_category]
-            subcategories = ["All"] + sorted(list(set(q.subcategory for q in filtered_questions)))
+        selected_subcategory = "All"
+        subcategories = ["All"]
+        if selected_category != "All":
+            subcategories = ["All"] + repo.subcategories(selected_category)
         with filter_col2:
             if selected_category != "All":
                 selected_subcategory = st.selectbox("Filter by subcategory:", subcategories)
-                if selected_subcategory != "All":
-                    filtered_questions = [q for q in filtered_questions if q.subcategory == selected_subcategory]
             else:
                 st.text("Select a category first")
-        if not filtered_questions:
-            st.warning("No questions found with the selected filters.")
+        if query.strip() or selected_flags:
+            hits = get_search_index(repo).search(
+                query,
+                risk_flags=selected_flags,
+                category=None if selected_category == "All" else selected_category,
+                subcategory=None if selected_subcategory == "All" else selected_subcategory,
+            )
+            if not hits:
+                st.warning("No matches found for this search.")
+            else:
+                st.caption(f"Top {len(hits)} matches")
+                for hit in hits:
+                    doc = hit.document
+                    st.write(f"**{doc.question_id}** · {KIND_LABELS[doc.kind]}: {doc.text}")
+                    if doc.label:
+                        st.caption(doc.label)
+                    st.divider()
         else:
-            for question in filtered_questions:
+            sort = SORT_OPTIONS[st.selectbox("Sort by:", list(SORT_OPTIONS), key="questions_sort")]
+            category = None if selected_category == "All" else selected_category
+            subcategory = None if selected_subcategory == "All" else selected_subcategory
+            # Sorted and filtered on the precomputed index; widgets are only
+            # built for the current page.
+            positions = repo.question_index.select(sort, category=category, subcategory=subcategory)
+            if not len(positions):
+                st.warning("No questions found with the selected filters.")
+                return
+            start, stop = page_controls("questions", len(positions), (sort, category, subcategory))
+            for index in positions[start:stop].tolist():
+                question = questions[index]
                 with st.container():
                     col1, col2, col3 = st.columns([3, 1, 1])
                     with col1:
                         st.write(f"**{question.id}:** {question.question_text}")
+                        display_comments(repo.insights_for(question.id))
                     with col2:
                         st.write(f"**Category:** {question.category}")
                         st.write(f"**Subcategory:** {question.subcategory}")
                     with col3:
-                        if st.button("Modify", key=f"modify_{question.id}", help="Placeholder functionality"):
+                        if st.button("Modify", key=f"modify_{index}_{question.id}", help="Placeholder functionality"):
                             st.info("Modification functionality would be implemented here.")
                 st.divider()
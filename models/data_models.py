@@ -1,8 +1,24 @@
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+import sys
+from dataclasses import dataclass, fields
+from typing import List, Dict, Any, Optional, Tuple
 
-@dataclass
-class Persona:
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class _Record:
+    # Records are immutable and shared between sessions. Pickling goes through
+    # the constructor so records read back from snapshots or worker processes
+    # are interned like freshly built ones.
+    __slots__ = ()
+
+    def __reduce__(self):
+        return type(self), tuple(getattr(self, f.name) for f in fields(self))
+
+
+@dataclass(frozen=True, slots=True)
+class Persona(_Record):
     id: str
     name: str
     title: str
@@ -15,29 +31,47 @@ class Persona:
     bias_metrics: Dict[str, float]
     control_comparison: str
 
-@dataclass
-class Question:
+@dataclass(frozen=True, slots=True)
+class Question(_Record):
     id: str
     question_text: str
     category: str
     subcategory: str
 
-@dataclass
-class LLMResponse:
+    def __post_init__(self):
+        object.__setattr__(self, "id", _intern(self.id))
+        object.__setattr__(self, "category", _intern(self.category))
+        object.__setattr__(self, "subcategory", _intern(self.subcategory))
+
+@dataclass(frozen=True, slots=True)
+class LLMResponse(_Record):
     question_id: str
     response_text: str
-    risk_flags: List[str]
+    risk_flags: Tuple[str, ...]
     risk_score: float
     suggested_fix: Optional[str] = None
+    persona_id: Optional[str] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "question_id", _intern(self.question_id))
+        object.__setattr__(self, "risk_flags", tuple(_intern(flag) for flag in self.risk_flags))
+        object.__setattr__(self, "persona_id", _intern(self.persona_id))
 
-@dataclass
-class Evaluation:
+@dataclass(frozen=True, slots=True)
+class Evaluation(_Record):
     question_id: str
     scores: Dict[str, Dict[str, float]]
     feedback: Optional[str] = None
 
-@dataclass
-class Insight:
+    def __post_init__(self):
+        object.__setattr__(self, "question_id", _intern(self.question_id))
+
+@dataclass(frozen=True, slots=True)
+class Insight(_Record):
     question_id: str
     reviewer: str
     comment_text: str
+
+    def __post_init__(self):
+        object.__setattr__(self, "question_id", _intern(self.question_id))
+        object.__setattr__(self, "reviewer", _intern(self.reviewer))
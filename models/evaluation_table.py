@@ -0,0 +1,155 @@
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.data_models import Evaluation
+
+
+def _column_order(pairs: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    # Categories in order of first appearance, subcategories sorted.
+    grouped: Dict[str, set] = {}
+    for category, sub in pairs:
+        grouped.setdefault(category, set()).add(sub)
+    return [(category, sub) for category, subs in grouped.items() for sub in sorted(subs)]
+
+
+class EvaluationRow:
+    # Read-only view of one table row with the Evaluation attributes. `scores`
+    # is materialised on access; unscored subcategories are left out.
+    __slots__ = ("table", "row")
+
+    def __init__(self, table: "EvaluationTable", row: int):
+        self.table = table
+        self.row = row
+
+    @property
+    def question_id(self) -> str:
+        return self.table.question_ids[self.table.codes[self.row]]
+
+    @property
+    def feedback(self) -> Optional[str]:
+        return self.table.feedback.get(self.row)
+
+    @property
+    def scores(self) -> Dict[str, Dict[str, float]]:
+        result: Dict[str, Dict[str, float]] = {}
+        for (category, sub), value in zip(self.table.columns, self.table.scores[self.row].tolist()):
+            if value == value:  # not NaN
+                # float32 keeps ~7 significant digits; drop the widening noise.
+                result.setdefault(category, {})[sub] = round(value, 6)
+        return result
+
+    def to_evaluation(self) -> Evaluation:
+        return Evaluation(self.question_id, self.scores, self.feedback)
+
+    def __repr__(self) -> str:
+        return f"EvaluationRow(question_id={self.question_id!r}, row={self.row})"
+
+
+class EvaluationTable:
+    # Column-oriented store for evaluations: one int32 question code and one
+    # float32 score row per evaluation (NaN where a subcategory is not scored),
+    # with feedback kept sparsely. Iterating yields EvaluationRow views.
+    __slots__ = ("question_ids", "codes", "columns", "scores", "feedback")
+
+    def __init__(self, question_ids: List[str], codes: np.ndarray, columns: List[Tuple[str, str]],
+                 scores: np.ndarray, feedback: Optional[Dict[int, str]] = None):
+        self.question_ids = question_ids
+        self.codes = codes
+        self.columns = columns
+        self.scores = scores
+        self.feedback = feedback or {}
+
+    @classmethod
+    def empty(cls) -> "EvaluationTable":
+        return cls([], np.empty(0, dtype=np.int32), [], np.empty((0, 0), dtype=np.float32))
+
+    @classmethod
+    def _build(cls, rows: Sequence[Tuple[str, Dict[str, Dict[str, Any]], Optional[str]]]) -> "EvaluationTable":
+        columns = _column_order((category, sub) for _, scores, _ in rows
+                                for category, sub_scores in scores.items() for sub in sub_scores)
+        columns = [(sys.intern(category), sys.intern(sub)) for category, sub in columns]
+        column_of = {column: i for i, column in enumerate(columns)}
+
+        question_ids: List[str] = []
+        code_of: Dict[str, int] = {}
+        codes = np.empty(len(rows), dtype=np.int32)
+        feedback: Dict[int, str] = {}
+        flat_rows: List[int] = []
+        flat_cols: List[int] = []
+        flat_values: List[float] = []
+        for row, (question_id, scores, note) in enumerate(rows):
+            code = code_of.get(question_id)
+            if code is None:
+                code = code_of[question_id] = len(question_ids)
+                question_ids.append(sys.intern(question_id))
+            codes[row] = code
+            if note is not None:
+                feedback[row] = note
+            for category, sub_scores in scores.items():
+                flat_cols.extend(column_of[(category, sub)] for sub in sub_scores)
+                flat_values.extend(sub_scores.values())
+                flat_rows.extend([row] * len(sub_scores))
+
+        values = np.full((len(rows), len(columns)), np.nan, dtype=np.float32)
+        values[flat_rows, flat_cols] = flat_values
+        return cls(question_ids, codes, columns, values, feedback)
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "EvaluationTable":
+        # Builds straight from parsed evaluation_scores.yaml records, without
+        # creating an Evaluation per row.
+        return cls._build([(r['question_id'], r['scores'], r.get('feedback', None)) for r in records])
+
+    @classmethod
+    def from_evaluations(cls, evaluations: Iterable[Evaluation]) -> "EvaluationTable":
+        return cls._build([(e.question_id, e.scores, e.feedback) for e in evaluations])
+
+    @classmethod
+    def concat(cls, tables: Sequence["EvaluationTable"]) -> "EvaluationTable":
+        tables = [t for t in tables if len(t)]
+        if not tables:
+            return cls.empty()
+        if len(tables) == 1:
+            return tables[0]
+        columns = _column_order(column for t in tables for column in t.columns)
+        column_of = {column: i for i, column in enumerate(columns)}
+
+        question_ids: List[str] = []
+        code_of: Dict[str, int] = {}
+        total = sum(len(t) for t in tables)
+        codes = np.empty(total, dtype=np.int32)
+        values = np.full((total, len(columns)), np.nan, dtype=np.float32)
+        feedback: Dict[int, str] = {}
+        offset = 0
+        for t in tables:
+            remap = np.empty(len(t.question_ids), dtype=np.int32)
+            for i, qid in enumerate(t.question_ids):
+                code = code_of.get(qid)
+                if code is None:
+                    code = code_of[qid] = len(question_ids)
+                    question_ids.append(qid)
+                remap[i] = code
+            codes[offset:offset + len(t)] = remap[t.codes]
+            values[offset:offset + len(t), [column_of[c] for c in t.columns]] = t.scores
+            feedback.update((offset + row, note) for row, note in t.feedback.items())
+            offset += len(t)
+        return cls(question_ids, codes, columns, values, feedback)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, row: int) -> EvaluationRow:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return EvaluationRow(self, row)
+
+    def __iter__(self) -> Iterator[EvaluationRow]:
+        return (EvaluationRow(self, row) for row in range(len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.scores.nbytes
@@ -0,0 +1,40 @@
+import os
+import shutil
+
+import pytest
+import yaml
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+BUNDLED_DATA = os.path.join(ROOT_DIR, "domain_data")
+
+
+def write_run(data_dir, run_id, scale, count=3):
+    # An evaluation run shard: the first `count` bundled evaluations with
+    # every score multiplied by `scale`.
+    with open(os.path.join(BUNDLED_DATA, "evaluation_scores.yaml"), 'r') as file:
+        evaluations = yaml.safe_load(file)["evaluations"][:count]
+    scaled = [{**e, "scores": {category: {sub: round(value * scale, 3) for sub, value in scores.items()}
+                               for category, scores in e["scores"].items()}}
+              for e in evaluations]
+    os.makedirs(os.path.join(data_dir, "evaluations"), exist_ok=True)
+    with open(os.path.join(data_dir, "evaluations", f"{run_id}.yaml"), 'w') as file:
+        yaml.safe_dump({"evaluations": scaled}, file)
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    # A copy of the bundled YAML files, without any generated state.
+    data_dir = tmp_path / "dataset"
+    data_dir.mkdir()
+    for name in os.listdir(BUNDLED_DATA):
+        if name.endswith(".yaml"):
+            shutil.copy(os.path.join(BUNDLED_DATA, name), data_dir / name)
+    return str(data_dir)
+
+
+@pytest.fixture
+def run_dataset(dataset):
+    # The bundled data plus two evaluation runs with different scores.
+    write_run(dataset, "run_a", 0.5)
+    write_run(dataset, "run_b", 1.5)
+    return dataset
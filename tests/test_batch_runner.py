@@ -0,0 +1,43 @@
+import yaml
+
+from models.data_models import LLMResponse
+from utils.batch_runner import ResponseShardWriter
+
+RESPONSES = [
+    LLMResponse("q1", "First answer.", ("Age Bias",), 0.5, persona_id="p1"),
+    LLMResponse("q1", "A longer answer\nover two lines.", (), 0.25, persona_id="p2"),
+]
+TORN = LLMResponse("q2", "Cut short.", ("Gender Bias", "Age Bias"), 0.75, persona_id="p1")
+
+
+def _chunks(tmp_path):
+    # The full text of a shard with both responses, and the torn record's bytes.
+    writer = ResponseShardWriter(str(tmp_path / "full.yaml"))
+    for response in RESPONSES:
+        writer.write(response)
+    with open(writer.path) as file:
+        prefix = file.read()
+    writer.write(TORN)
+    with open(writer.path) as file:
+        return prefix, file.read()[len(prefix):]
+
+
+def test_existing_drops_every_kind_of_torn_tail(tmp_path):
+    prefix, record = _chunks(tmp_path)
+    assert record.rstrip("\n").endswith("risk_score: 0.75")
+    for cut in range(1, len(record)):
+        path = tmp_path / f"cut_{cut}.yaml"
+        path.write_text(prefix + record[:cut])
+        writer = ResponseShardWriter(str(path))
+        assert writer.existing() == {("q1", "p1"), ("q1", "p2")}, record[:cut]
+        # Appends after the repair leave a valid shard.
+        writer.write(TORN)
+        assert len(yaml.safe_load(path.read_text())["responses"]) == 3
+
+
+def test_existing_keeps_complete_records(tmp_path):
+    prefix, record = _chunks(tmp_path)
+    path = tmp_path / "shard.yaml"
+    path.write_text(prefix + record)
+    assert ResponseShardWriter(str(path)).existing() == {("q1", "p1"), ("q1", "p2"), ("q2", "p1")}
+    assert path.read_text() == prefix + record
@@ -0,0 +1,41 @@
+import os
+
+from utils import data_loader
+
+
+def test_editing_the_lexicon_changes_the_version(dataset):
+    before = data_loader.data_version(dataset)
+    with open(os.path.join(dataset, "risk_lexicons.yaml"), 'a') as file:
+        file.write("\n# tuned\n")
+    assert data_loader.data_version(dataset) != before
+
+
+def test_dataset_without_a_lexicon_tracks_the_bundled_one(dataset):
+    os.remove(os.path.join(dataset, "risk_lexicons.yaml"))
+    assert data_loader.settings_path("risk_lexicons.yaml", dataset) == \
+        os.path.join(data_loader.BUNDLED_DATA_DIR, "risk_lexicons.yaml")
+    entry = next(e for e in data_loader.data_version(dataset) if e[0] == "risk_lexicons.yaml")
+    assert entry[1:] == data_loader._file_version(os.path.join(data_loader.BUNDLED_DATA_DIR, "risk_lexicons.yaml"))
+
+
+def test_run_version_keeps_only_that_runs_shards(run_dataset):
+    names = lambda version: [e[0] for e in version if e[0].startswith("evaluations")]
+    assert names(data_loader.data_version(run_dataset)) == ["evaluations/run_a.yaml", "evaluations/run_b.yaml"]
+    assert names(data_loader.data_version(run_dataset, "run_b")) == ["evaluations/run_b.yaml"]
+
+
+def test_source_version_covers_a_file_and_its_shards(run_dataset):
+    os.makedirs(os.path.join(run_dataset, "responses"))
+    with open(os.path.join(run_dataset, "responses", "run_a.yaml"), 'w') as file:
+        file.write("responses: []\n")
+    version = data_loader.data_version(run_dataset)
+    assert [entry[0] for entry in data_loader.source_version(version, "llm_responses.yaml")] == \
+        ["llm_responses.yaml", os.path.join("responses", "run_a.yaml")]
+    assert [entry[0] for entry in data_loader.source_version(version, "questions.yaml")] == ["questions.yaml"]
+    with open(os.path.join(run_dataset, "contributor_insights.yaml"), 'a') as file:
+        file.write("\n# reviewed\n")
+    edited = data_loader.data_version(run_dataset)
+    assert data_loader.source_version(edited, "llm_responses.yaml") == \
+        data_loader.source_version(version, "llm_responses.yaml")
+    assert data_loader.source_version(edited, "contributor_insights.yaml") != \
+        data_loader.source_version(version, "contributor_insights.yaml")
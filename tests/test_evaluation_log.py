@@ -0,0 +1,72 @@
+import json
+import os
+
+from models.data_models import Evaluation
+from utils import evaluation_log
+from utils.evaluation_log import EvaluationLog, LOG_FILENAME, RunningAggregates, STATE_FILENAME
+
+
+def _evaluation(question_id, score):
+    return Evaluation(question_id=question_id, scores={"safety": {"harm": score}}, feedback="")
+
+
+def test_refresh_folds_only_complete_lines(tmp_path):
+    log = EvaluationLog(str(tmp_path))
+    log.append([_evaluation("q1", 2.0), _evaluation("q2", 4.0)])
+    size = os.path.getsize(log.path)
+    assert log.refresh().records == 2
+    assert log.offset == size
+    # A half-written record is left for the next refresh.
+    partial = json.dumps({"question_id": "q3", "scores": {"safety": {"harm": 6.0}}, "feedback": ""})
+    with open(log.path, 'a') as file:
+        file.write(partial[:10])
+    assert log.refresh().records == 2 and log.offset == size
+    with open(log.path, 'a') as file:
+        file.write(partial[10:] + "\n")
+    aggregates = log.refresh()
+    assert aggregates.records == 3 and log.offset == os.path.getsize(log.path)
+    assert aggregates.means() == {"safety": {"harm": 4.0}}
+
+
+def test_checkpoint_is_recovered_without_replaying(tmp_path):
+    log = EvaluationLog(str(tmp_path))
+    log.append([_evaluation("q1", 2.0), _evaluation("q2", 4.0)])
+    log.refresh()
+    restarted = EvaluationLog(str(tmp_path))
+    assert (restarted.offset, restarted.aggregates.records) == (log.offset, 2)
+    # Nothing new to read: the folded prefix isn't read again.
+    assert restarted.refresh().means() == {"safety": {"harm": 3.0}}
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_stale_instance_adopts_newer_checkpoint(tmp_path, monkeypatch):
+    # Another process's instance picks up the checkpoint instead of folding
+    # the records again, and the checkpoint is written through a per-PID
+    # temp file.
+    first, second = EvaluationLog(str(tmp_path)), EvaluationLog(str(tmp_path))
+    first.append([_evaluation("q1", 2.0), _evaluation("q2", 4.0)])
+    replaced = []
+    real_replace = os.replace
+    monkeypatch.setattr(evaluation_log.os, "replace",
+                        lambda src, dst: replaced.append(src) or real_replace(src, dst))
+    first.refresh()
+    assert replaced == [f"{first.state_path}.{os.getpid()}.tmp"]
+    folds = []
+    monkeypatch.setattr(RunningAggregates, "fold", lambda self, scores: folds.append(scores))
+    assert second.refresh().records == 2 and not folds
+    with open(tmp_path / STATE_FILENAME) as file:
+        assert json.load(file)["offset"] == os.path.getsize(tmp_path / LOG_FILENAME)
+
+
+def test_replaced_or_truncated_log_is_replayed(tmp_path):
+    log = EvaluationLog(str(tmp_path))
+    log.append([_evaluation("q1", 2.0), _evaluation("q2", 4.0)])
+    log.refresh()
+    os.remove(log.path)
+    log.append([_evaluation("q9", 8.0)])
+    aggregates = log.refresh()
+    assert aggregates.records == 1 and aggregates.means() == {"safety": {"harm": 8.0}}
+    restarted = EvaluationLog(str(tmp_path))
+    with open(log.path, 'w') as file:
+        file.write(json.dumps({"question_id": "q5", "scores": {"safety": {"harm": 1.25}}, "feedback": ""}) + "\n")
+    assert restarted.refresh().means() == {"safety": {"harm": 1.25}}
@@ -0,0 +1,33 @@
+from utils.figure_cache import FigureCache
+
+
+class _Figure:
+    def __init__(self, size):
+        self.size = size
+
+    def to_json(self):
+        return "x" * self.size
+
+
+def test_stats_report_sizes_per_kind():
+    cache = FigureCache()
+    cache.get_or_create("a", lambda: _Figure(100), "radar")
+    cache.get_or_create("b", lambda: _Figure(300), "trend")
+    cache.get_or_create("a", lambda: _Figure(999), "radar")
+    stats = cache.stats()
+    assert stats["bytes"] == 400
+    assert stats["avg_entry_bytes"] == 200
+    assert stats["by_kind"] == {"radar": {"entries": 1, "bytes": 100}, "trend": {"entries": 1, "bytes": 300}}
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_byte_budget_evicts_oldest_but_keeps_newest():
+    cache = FigureCache(max_bytes=250)
+    cache.get_or_create("a", lambda: _Figure(100))
+    cache.get_or_create("b", lambda: _Figure(100))
+    cache.get_or_create("c", lambda: _Figure(100))
+    assert cache.stats()["entries"] == 2 and cache.stats()["bytes"] == 200
+    cache.get_or_create("d", lambda: _Figure(1000))
+    assert cache.stats()["entries"] == 1 and cache.stats()["evictions"] == 3
+    cache.clear()
+    assert cache.stats()["bytes"] == 0
@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+from conftest import ROOT_DIR, write_run
+from utils import data_loader, history_store
+from utils.aggregation import build_score_matrix, summarize
+from utils.history_store import HistoryStore
+
+
+def _means(data_dir, run_id):
+    path = os.path.join(data_dir, "evaluations", f"{run_id}.yaml")
+    summary = summarize(build_score_matrix(data_loader._build_evaluations(data_loader._parse_yaml(path))))
+    return dict(zip(summary.columns, summary.mean.tolist()))
+
+
+def test_sync_appends_each_run_once(run_dataset):
+    store = HistoryStore(os.path.join(run_dataset, "history"))
+    assert store.sync(run_dataset) == ["run_a", "run_b"]
+    assert store.sync(run_dataset) == []
+    write_run(run_dataset, "run_c", 1.0)
+    assert store.sync(run_dataset) == ["run_c"]
+    # Another process's view picks up the same history.
+    reader = HistoryStore(store.path)
+    assert reader.run_ids() == ["run_a", "run_b", "run_c"]
+    for run, run_id in enumerate(reader.run_ids()):
+        for (category, sub), mean in _means(run_dataset, run_id).items():
+            assert reader.series(category, sub)[run] == pytest.approx(mean, rel=1e-6)
+    assert [r["evaluations"] for r in reader.runs] == [3, 3, 3]
+    assert not [name for name in os.listdir(store.path) if ".tmp" in name]
+
+
+def test_growing_the_files_keeps_earlier_runs(run_dataset, monkeypatch):
+    monkeypatch.setattr(history_store, "INITIAL_RUNS", 1)
+    store = HistoryStore(os.path.join(run_dataset, "history"))
+    store.sync(run_dataset)
+    before = np.array(store.matrix())
+    for i in range(3):
+        write_run(run_dataset, f"run_z{i}", 2.0 + i)
+    store.sync(run_dataset)
+    assert store.matrix().shape[1] == 5
+    np.testing.assert_array_equal(store.matrix()[:, :2], before)
+    # Re-appending a known run overwrites its column in place.
+    summary = summarize(build_score_matrix(data_loader._build_evaluations(data_loader._parse_yaml(
+        os.path.join(run_dataset, "evaluations", "run_b.yaml")))))
+    assert store.append("run_a", summary) == 0
+    np.testing.assert_array_equal(store.matrix()[:, 0], store.matrix()[:, 1])
+
+
+def test_concurrent_syncs_do_not_duplicate_runs(run_dataset):
+    for i in range(16):
+        write_run(run_dataset, f"run_{i:02d}", 1.0 + i / 10)
+    command = [sys.executable, "-m", "utils.history_store", "--data-dir", run_dataset, "sync"]
+    processes = [subprocess.Popen(command, cwd=ROOT_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                 for _ in range(4)]
+    for process in processes:
+        _, stderr = process.communicate(timeout=120)
+        assert process.returncode == 0, stderr.decode()
+    store = HistoryStore(os.path.join(run_dataset, "history"))
+    assert sorted(store.run_ids()) == sorted(data_loader.list_runs(data_dir=run_dataset))
+    assert len(store.run_ids()) == 18
+
+
+def test_sync_waits_for_another_writers_lock(run_dataset):
+    # Separate instances open the lock file separately, as separate
+    # processes would.
+    holder = HistoryStore(os.path.join(run_dataset, "history"))
+    syncer = HistoryStore(holder.path)
+    added = []
+    with holder._write_lock():
+        thread = threading.Thread(target=lambda: added.extend(syncer.sync(run_dataset)))
+        thread.start()
+        thread.join(0.5)
+        assert thread.is_alive() and added == []
+    thread.join(30)
+    assert added == ["run_a", "run_b"]
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pytest
+
+from models.data_models import Insight, LLMResponse
+from utils.insights import ReviewerAggregates, ReviewerGroups, get_reviewer_aggregates
+
+INSIGHTS = [
+    Insight("q1", "Reviewer_A", "Leans on age stereotypes."),
+    Insight("q1", "Reviewer_A", "Second look: still biased."),
+    Insight("q2", "Reviewer_A", "Fine."),
+    Insight("q2", "Reviewer_B", "Generic answer."),
+    Insight("q9", "Reviewer_C", "Question without responses."),
+]
+# Persona/control pairs: several responses per question.
+RESPONSES = [
+    LLMResponse("q1", "persona answer", ("Age Bias",), 0.9, persona_id="p1"),
+    LLMResponse("q1", "control answer", (), 0.1),
+    LLMResponse("q1", "persona answer", ("Age Bias",), 0.5, persona_id="p2"),
+    LLMResponse("q2", "persona answer", (), 0.2, persona_id="p1"),
+    LLMResponse("q2", "control answer", (), 0.4),
+    LLMResponse("q3", "unreviewed", (), 1.0),
+]
+
+
+def _rows(aggregates):
+    return {row["Reviewer"]: row for row in aggregates.rows()}
+
+
+def test_average_risk_covers_every_response_to_a_question():
+    aggregates = ReviewerAggregates(ReviewerGroups(INSIGHTS), RESPONSES)
+    rows = _rows(aggregates)
+    assert rows["Reviewer_A"]["Comments"] == 3
+    assert rows["Reviewer_A"]["Questions covered"] == 2
+    assert rows["Reviewer_A"]["Avg. risk score"] == pytest.approx((0.9 + 0.1 + 0.5 + 0.2 + 0.4) / 5)
+    assert rows["Reviewer_B"]["Avg. risk score"] == pytest.approx(0.3)
+    assert rows["Reviewer_C"]["Avg. risk score"] is None
+    assert [row["Reviewer"] for row in aggregates.rows()] == ["Reviewer_A", "Reviewer_B", "Reviewer_C"]
+
+
+def test_empty_insights():
+    assert ReviewerAggregates(ReviewerGroups([]), RESPONSES).rows() == []
+
+
+def test_snapshots_are_cached_per_version(tmp_path):
+    def repo(responses_mtime, responses=RESPONSES):
+        version = (("contributor_insights.yaml", 1.0, 10), ("llm_responses.yaml", responses_mtime, 20))
+        return SimpleNamespace(version=version, data_dir=str(tmp_path), insights=INSIGHTS, responses=responses)
+
+    old = get_reviewer_aggregates(repo(1.0))
+    new = get_reviewer_aggregates(repo(2.0, RESPONSES[:2]))
+    assert new is not old
+    # The grouping is shared; the older snapshot is left as it was.
+    assert new.comments is old.comments
+    assert _rows(new)["Reviewer_A"]["Avg. risk score"] == pytest.approx(0.5)
+    assert _rows(old)["Reviewer_A"]["Avg. risk score"] == pytest.approx(0.42)
+    assert get_reviewer_aggregates(repo(1.0)) is old
@@ -0,0 +1,47 @@
+import io
+
+import pyarrow.parquet as pq
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from components import onboarding
+from components.onboarding import _export_file
+from utils.assessment_store import get_assessment_store
+
+
+def _store(tmp_path, monkeypatch):
+    monkeypatch.setenv("LEVELS_ASSESSMENT_DB", str(tmp_path / "assessments.sqlite3"))
+    store = get_assessment_store()
+    store.save({"is_eu": True, "role": ["Provider"], "primary_function": "Ranks CVs",
+                "completion_date": "2026-01-01 10:00:00"})
+    store.save({"is_eu": False, "role": ["Deployer"], "primary_function": "Chatbot",
+                "completion_date": "2026-01-02 10:00:00"})
+    store.flush()
+    return store
+
+
+def _download(data):
+    # What st.download_button does with the value its deferred callable returns.
+    return convert_data_to_bytes_and_infer_mime(data, ValueError("unsupported type"))[0]
+
+
+def test_csv_export_is_downloadable(tmp_path, monkeypatch):
+    _store(tmp_path, monkeypatch)
+    lines = _download(_export_file("csv", {"is_eu": True, "role": None})).decode("utf-8").splitlines()
+    assert lines[0].startswith("id,")
+    assert len(lines) == 2 and "Ranks CVs" in lines[1]
+
+
+def test_parquet_export_is_downloadable(tmp_path, monkeypatch):
+    _store(tmp_path, monkeypatch)
+    table = pq.read_table(io.BytesIO(_download(_export_file("parquet", {"is_eu": None, "role": None}))))
+    assert table.num_rows == 2
+    assert sorted(table.column("primary_function").to_pylist()) == ["Chatbot", "Ranks CVs"]
+
+
+def test_in_app_export_is_capped(tmp_path, monkeypatch):
+    _store(tmp_path, monkeypatch)
+    monkeypatch.setattr(onboarding, "MAX_EXPORT_ROWS", 1)
+    lines = _download(_export_file("csv", {"is_eu": None, "role": None})).decode("utf-8").splitlines()
+    assert len(lines) == 2 and "Ranks CVs" in lines[1]
+    table = pq.read_table(io.BytesIO(_download(_export_file("parquet", {"is_eu": None, "role": None}))))
+    assert table.num_rows == 1
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from components.pagination import page_bounds
+from utils.repository import RecordIndex
+
+
+@pytest.mark.parametrize("total, page_size, page, expected", [
+    (0, 25, 1, (0, 0, 1)),
+    (0, 25, 3, (0, 0, 1)),
+    (25, 25, 1, (0, 25, 1)),
+    (25, 25, 2, (0, 25, 1)),
+    (26, 25, 2, (25, 26, 2)),
+    (26, 25, 0, (0, 25, 2)),
+    (26, 25, -4, (0, 25, 2)),
+    (100, 10, 10, (90, 100, 10)),
+    (100, 10, 11, (90, 100, 10)),
+])
+def test_page_bounds_clamp_to_existing_pages(total, page_size, page, expected):
+    assert page_bounds(total, page_size, page) == expected
+
+
+def _controls_app():
+    import streamlit as st
+    from components.pagination import page_controls
+
+    start, stop = page_controls("items", st.session_state.get("total", 60), st.session_state.get("selection", "a"))
+    st.write(f"{start}:{stop}")
+
+
+def _range(at):
+    return at.markdown[-1].value
+
+
+def test_page_controls_reset_and_clamp_the_page():
+    at = AppTest.from_function(_controls_app).run()
+    assert _range(at) == "0:25"
+    at.number_input(key="items_page").set_value(3).run()
+    assert _range(at) == "50:60"
+    # A smaller result set keeps the page in range.
+    at.session_state["total"] = 30
+    at.run()
+    assert _range(at) == "25:30" and at.number_input(key="items_page").value == 2
+    # So does a larger page size.
+    at.selectbox(key="items_page_size").set_value(50).run()
+    assert _range(at) == "0:30"
+    at.session_state["total"] = 200
+    at.run()
+    at.number_input(key="items_page").set_value(4).run()
+    assert _range(at) == "150:200"
+    # A new sort or filter goes back to the first page.
+    at.session_state["selection"] = "b"
+    at.run()
+    assert _range(at) == "0:50"
+    at.session_state["total"] = 0
+    at.run()
+    assert _range(at) == "0:0" and "Showing 0–0 of 0" in [c.value for c in at.caption]
+
+
+def test_select_filters_and_sorts():
+    index = RecordIndex(5, {
+        "position": np.arange(5),
+        "reverse": np.arange(5)[::-1].copy(),
+    }, {
+        "flag": {"age": np.array([0, 2, 4]), "gender": np.array([1, 2])},
+        "category": {"bias": np.array([0, 1, 2]), "privacy": np.array([3, 4])},
+    })
+    assert index.select().tolist() == [0, 1, 2, 3, 4]
+    assert index.select("reverse").tolist() == [4, 3, 2, 1, 0]
+    # A list matches records carrying any of its values; filters combine.
+    assert index.select(flag=["age", "gender"]).tolist() == [0, 1, 2, 4]
+    assert index.select("reverse", flag=["age", "gender"], category="bias").tolist() == [2, 1, 0]
+    assert index.select(flag="age", category="privacy").tolist() == [4]
+    # Empty or missing filters select everything; unknown values nothing.
+    assert index.select(flag=[], category=None).tolist() == [0, 1, 2, 3, 4]
+    assert index.select(flag="unknown").tolist() == []
+
+
+def test_pages_of_a_selection_cover_it_exactly(dataset):
+    from utils.repository import load_repository
+    repo = load_repository(dataset)
+    positions = repo.response_index.select("risk_desc")
+    pages = []
+    for page in range(1, page_bounds(len(positions), 10, 1)[2] + 2):
+        start, stop, _ = page_bounds(len(positions), 10, page)
+        pages.append(positions[start:stop])
+    covered = np.concatenate(pages[:-1])
+    assert covered.tolist() == positions.tolist()
+    # Past the last page the last page is shown again.
+    assert pages[-1].tolist() == pages[-2].tolist()
+    risk = [repo.responses[i].risk_score for i in covered.tolist()]
+    assert risk == sorted(risk, reverse=True)
@@ -0,0 +1,34 @@
+from unittest import mock
+
+import numpy as np
+
+from utils import report
+from utils.aggregation import summarize
+from utils.precompute import publish
+from utils.repository import load_repository
+
+
+def test_per_run_reports_ignore_aggregates_published_for_the_dataset(run_dataset):
+    assert publish(run_dataset) is not None
+    assert load_repository(run_dataset).published() is not None
+
+    repos = {}
+    load = report._load_repository
+
+    def spy(data_dir, run_id):
+        repos[run_id] = load(data_dir, run_id)
+        return repos[run_id]
+
+    jobs = report.plan_jobs([run_dataset], per_run=True)
+    assert [job.run_id for job in jobs] == ["run_a", "run_b"]
+    with mock.patch.object(report, "_load_repository", spy):
+        rendered = [report.render_report(job) for job in jobs]
+
+    for run_id, repo in repos.items():
+        assert repo.published() is None
+        expected = summarize(repo.score_matrix)
+        np.testing.assert_array_equal(repo.overall_summary.count, expected.count)
+        np.testing.assert_allclose(repo.overall_summary.mean, expected.mean, equal_nan=True)
+    assert not np.allclose(repos["run_a"].overall_summary.mean, repos["run_b"].overall_summary.mean,
+                           equal_nan=True)
+    assert rendered[0].html != rendered[1].html
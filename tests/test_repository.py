@@ -0,0 +1,24 @@
+from models.data_models import LLMResponse
+from models.evaluation_table import EvaluationTable
+from utils.repository import DomainRepository
+
+RESPONSES = [
+    LLMResponse("q1", "legacy answer", (), 0.3),
+    LLMResponse("q1", "control answer", (), 0.1, persona_id="p6"),
+    LLMResponse("q1", "first run", ("Age Bias",), 0.9, persona_id="p1"),
+    LLMResponse("q1", "second run", ("Age Bias",), 0.7, persona_id="p1"),
+    LLMResponse("q2", "legacy answer", (), 0.2),
+]
+
+
+def test_response_for_prefers_the_personas_own_response():
+    repo = DomainRepository([], [], RESPONSES, EvaluationTable.empty(), [])
+    response, own = repo.response_for("q1", "p1", "p6")
+    assert (response.response_text, own) == ("second run", True)
+    # Falls back to the control candidate, then to an untagged response.
+    response, own = repo.response_for("q1", "p2", "p6")
+    assert (response.response_text, own) == ("control answer", False)
+    response, own = repo.response_for("q2", "p1", "p6")
+    assert (response.response_text, own) == ("legacy answer", False)
+    assert repo.response_for("q3", "p1", "p6") == (None, False)
+    assert repo.response("q1").response_text == "legacy answer"
@@ -0,0 +1,102 @@
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from models.data_models import Insight, LLMResponse, Question
+from utils import data_loader, search
+from utils.search import Document, SearchIndex
+
+DOCUMENTS = [
+    Document("question", "q1", "How do you handle age bias in hiring"),
+    Document("question", "q2", "Describe a hiring decision"),
+    Document("response", "q1", "Age should never decide a hiring outcome, age is irrelevant"),
+    Document("insight", "q2", "The answer ignores accessibility entirely and rambles on about other things"),
+]
+
+
+def _index():
+    index = SearchIndex()
+    index.replace_source("all", DOCUMENTS)
+    return index
+
+
+def _bm25(index, doc_id, terms):
+    lengths = [len(search.tokenize(doc.text)) for doc in DOCUMENTS]
+    avgdl = sum(lengths) / len(lengths)
+    score = 0.0
+    for term in terms:
+        tf = search.tokenize(DOCUMENTS[doc_id].text).count(term)
+        df = sum(term in search.tokenize(doc.text) for doc in DOCUMENTS)
+        if not tf:
+            continue
+        idf = math.log(1 + (len(DOCUMENTS) - df + 0.5) / (df + 0.5))
+        score += idf * tf * (index.k1 + 1) / (tf + index.k1 * (1 - index.b + index.b * lengths[doc_id] / avgdl))
+    return score
+
+
+def test_scores_follow_bm25():
+    index = _index()
+    hits = index.search("age hiring", prefix=False)
+    assert [hit.document for hit in hits] == [DOCUMENTS[2], DOCUMENTS[0], DOCUMENTS[1]]
+    for hit in hits:
+        assert hit.score == pytest.approx(_bm25(index, DOCUMENTS.index(hit.document), ["age", "hiring"]), rel=1e-5)
+
+
+def test_only_the_last_token_is_prefix_matched():
+    index = _index()
+    assert [hit.document.kind for hit in index.search("access")] == ["insight"]
+    assert "insight" in [hit.document.kind for hit in index.search("hiring access")]
+    assert "insight" not in [hit.document.kind for hit in index.search("access hiring")]
+    assert index.search("access", prefix=False) == []
+
+
+def test_filters_and_limit():
+    index = _index()
+    assert [hit.document.kind for hit in index.search("age", kinds=["response"])] == ["response"]
+    assert len(index.search("", limit=2)) == 2
+    assert len(index.search("hiring", limit=1)) == 1
+
+
+def test_replacing_a_source_drops_its_old_terms():
+    index = _index()
+    index.replace_source("all", [Document("question", "q3", "Salary negotiation")])
+    assert index.search("age") == []
+    assert [hit.document.question_id for hit in index.search("salary")] == ["q3"]
+    assert len(index.documents) == len(DOCUMENTS)
+
+
+def _repo(data_dir, question_text):
+    questions = [Question("q1", question_text, "Bias", "Age")]
+    responses = [LLMResponse("q1", "An answer", ("Age Bias",), 0.5)]
+    insights = [Insight("q1", "Reviewer_A", "A comment")]
+    # Identical versions: same relative names, mtimes and sizes.
+    version = (("questions.yaml", 1, 10), ("llm_responses.yaml", 1, 10), ("contributor_insights.yaml", 1, 10))
+    return SimpleNamespace(data_dir=data_dir, version=version, questions=questions, responses=responses,
+                           insights=insights)
+
+
+def test_index_is_keyed_on_the_data_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(search, "_index", SearchIndex())
+    first = search.get_search_index(_repo(str(tmp_path / "a"), "Ageing workforce"))
+    assert [hit.document.question_id for hit in first.search("ageing", kinds=["question"])] == ["q1"]
+    second = search.get_search_index(_repo(str(tmp_path / "b"), "Remote teams"))
+    assert second.search("ageing", kinds=["question"]) == []
+    assert [hit.document.text for hit in second.search("remote")] == ["Remote teams"]
+    assert second.flags_by_question == {"q1": {"Age Bias"}}
+    assert second.topic_by_question == {"q1": ("Bias", "Age")}
+
+
+def test_unchanged_sources_are_not_reindexed(tmp_path, monkeypatch):
+    monkeypatch.setattr(search, "_index", SearchIndex())
+    repo = _repo(str(tmp_path), "Ageing workforce")
+    search.get_search_index(repo)
+    rebuilt = []
+    real_documents = search._documents
+    monkeypatch.setattr(search, "_documents", lambda repo, source: rebuilt.append(source) or real_documents(repo, source))
+    search.get_search_index(repo)
+    assert rebuilt == []
+    repo.version = (("questions.yaml", 2, 11), *repo.version[1:])
+    search.get_search_index(repo)
+    assert rebuilt == ["questions"]
+    assert data_loader.source_version(repo.version, "questions.yaml") == (("questions.yaml", 2, 11),)
@@ -0,0 +1,136 @@
+import pytest
+
+from utils.wizard import compile_condition, compile_wizard, load_wizard
+
+
+@pytest.mark.parametrize("spec, answers, expected", [
+    (None, {}, True),
+    ({"field": "is_eu", "is": True}, {"is_eu": True}, True),
+    ({"field": "is_eu", "is": True}, {}, False),
+    ({"field": "is_eu", "is": False}, {}, True),
+    ({"field": "tier", "equals": "gold"}, {"tier": "gold"}, True),
+    ({"field": "role", "contains": "Provider"}, {"role": ["Deployer", "Provider"]}, True),
+    ({"field": "role", "contains": "Provider"}, {}, False),
+    ({"field": "role", "any_of": ["Importer", "Provider"]}, {"role": ["Provider"]}, True),
+    ({"field": "role", "any_of": ["Importer", "Provider"]}, {"role": "Importer"}, True),
+    ({"field": "role", "any_of": ["Importer"]}, {"role": ["Deployer"]}, False),
+    ({"field": "options", "not_empty": True}, {"options": []}, False),
+    ({"all": [{"field": "a", "is": True}, {"field": "b", "is": True}]}, {"a": True}, False),
+    ({"any": [{"field": "a", "is": True}, {"field": "b", "is": True}]}, {"b": True}, True),
+    ({"not": {"field": "a", "is": True}}, {"a": True}, False),
+])
+def test_condition_tests(spec, answers, expected):
+    predicate, _ = compile_condition(spec, "test")
+    assert predicate(answers) is expected
+
+
+def test_condition_reports_the_fields_it_reads():
+    _, fields = compile_condition({"all": [{"field": "a", "is": True},
+                                           {"not": {"any": [{"field": "b", "equals": 1},
+                                                            {"field": "c", "contains": "x"}]}}]}, "test")
+    assert fields == frozenset("abc")
+
+
+@pytest.mark.parametrize("spec, message", [
+    ("is_eu", "condition must be a mapping"),
+    ({"is": True}, "condition needs 'field'"),
+    ({"field": "a"}, "condition needs 'field'"),
+    ({"field": "a", "is": True, "equals": 1}, "condition needs 'field'"),
+    ({"all": [{"field": "a", "is": True}, ["nested"]]}, "condition must be a mapping"),
+])
+def test_invalid_conditions_are_rejected(spec, message):
+    with pytest.raises(ValueError, match=message):
+        compile_condition(spec, "steps[0]")
+
+
+def _wizard(**overrides):
+    data = {
+        "steps": [
+            {"id": "one", "title": "One", "questions": [
+                {"id": "is_eu", "type": "checkbox", "label": "EU?"},
+                {"id": "role", "type": "multiselect", "label": "Role", "options": ["Provider", "Deployer"],
+                 "required": True}]},
+            {"id": "two", "title": "Two", "when": {"field": "is_eu", "is": True}, "questions": [
+                {"id": "notes", "type": "text_area", "label": "Notes"}]},
+            {"id": "three", "title": "Three", "questions": [
+                {"id": "users", "type": "text_input", "label": "Users"}]},
+        ],
+        "classification": {
+            "rules": [{"level": "High", "reason": "Provider in the EU",
+                       "when": {"all": [{"field": "is_eu", "is": True}, {"field": "role", "contains": "Provider"}]}}],
+            "default": {"level": "Low"},
+            "obligations": [{"text": "Register", "when": {"field": "role", "contains": "Provider"}},
+                            {"text": "Document", "when": {"field": "notes", "not_empty": True}}],
+        },
+    }
+    data.update(overrides)
+    return data
+
+
+@pytest.mark.parametrize("steps, message", [
+    ([], "missing top-level 'steps'"),
+    ([{"title": "No id"}], "missing 'id' or 'title'"),
+    ([{"id": "a", "title": "A", "questions": [{"id": "x", "label": "X"}]}], "missing 'type'"),
+    ([{"id": "a", "title": "A", "questions": [{"id": "x", "type": "slider", "label": "X"}]}],
+     "unknown question type 'slider'"),
+    ([{"id": "a", "title": "A", "questions": [{"id": "x", "type": "selectbox", "label": "X"}]}],
+     "selectbox question needs 'options'"),
+    ([{"id": "a", "title": "A", "questions": [{"id": "x", "type": "checkbox", "label": "X"}]},
+      {"id": "b", "title": "B", "questions": [{"id": "x", "type": "checkbox", "label": "X"}]}],
+     "question id 'x' is used twice"),
+    # A step is one form, so it can't branch on its own answers.
+    ([{"id": "a", "title": "A", "when": {"field": "x", "is": True},
+       "questions": [{"id": "x", "type": "checkbox", "label": "X"}]}],
+     "condition uses x, which no earlier step asks"),
+    ([{"id": "a", "title": "A", "questions": [{"id": "x", "type": "checkbox", "label": "X"}],
+       "sections": [{"title": "S", "when": {"field": "x", "is": True},
+                     "questions": [{"id": "y", "type": "checkbox", "label": "Y"}]}]}],
+     "condition uses x, which no earlier step asks"),
+])
+def test_invalid_steps_are_rejected(steps, message):
+    with pytest.raises(ValueError, match=message):
+        compile_wizard(_wizard(steps=steps))
+
+
+def test_rules_may_only_use_asked_fields():
+    data = _wizard()
+    data["classification"]["rules"][0]["when"] = {"field": "revenue", "is": True}
+    with pytest.raises(ValueError, match=r"rules\[0\]: condition uses revenue, which no step asks"):
+        compile_wizard(data)
+    data = _wizard()
+    data["classification"]["obligations"][1]["when"] = {"field": "revenue", "is": True}
+    with pytest.raises(ValueError, match=r"obligations\[1\]"):
+        compile_wizard(data)
+
+
+def test_branches_skip_steps_in_both_directions():
+    wizard = compile_wizard(_wizard())
+    assert wizard.next_step("one", {"is_eu": True}).id == "two"
+    assert wizard.next_step("one", {"is_eu": False}).id == "three"
+    assert wizard.next_step("three", {"is_eu": False}, -1).id == "one"
+    assert wizard.next_step("three", {"is_eu": False}) is None
+    assert [q.id for q in wizard.missing(wizard.step("one"), {"role": []})] == ["role"]
+    # Answers from a branch that was deselected later are dropped.
+    assert wizard.visible_answers({"is_eu": False, "role": ["Provider"], "notes": "stale"}) == \
+        {"is_eu": False, "role": ["Provider"], "users": ""}
+
+
+def test_classify_takes_the_first_matching_rule_and_every_obligation():
+    wizard = compile_wizard(_wizard())
+    result = wizard.classify({"is_eu": True, "role": ["Provider"], "notes": "x"})
+    assert (result.level, result.reason, result.obligations) == ("High", "Provider in the EU",
+                                                                 ("Register", "Document"))
+    result = wizard.classify({"is_eu": False, "role": ["Deployer"]})
+    assert (result.level, result.reason, result.obligations) == ("Low", "", ())
+    assert [c.level for c in wizard.classify_many([{"is_eu": True, "role": ["Provider"]}, {}])] == ["High", "Low"]
+
+
+def test_bundled_wizard_classification():
+    wizard = load_wizard()
+    assert wizard.classify({"prohibited_tasks": ["Social Scoring"], "high_risk_options": ["Employment"]}).level \
+        == "Prohibited"
+    high = wizard.classify({"is_eu": True, "role": ["Provider"], "high_risk_options": ["Employment"]})
+    assert high.level == "High risk" and any("CE marking" in o for o in high.obligations)
+    assert wizard.classify({"is_eu": True, "requires_transparency": True}).level == "Limited risk"
+    minimal = wizard.classify({"is_eu": False})
+    assert minimal.level == "Minimal risk" and any("territorial scope" in o for o in minimal.obligations)
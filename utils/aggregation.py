@@ -0,0 +1,151 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from models.data_models import Evaluation
+from models.evaluation_table import EvaluationTable
+
+PERCENTILES = (25, 75, 90)
+# Scores are stored as float32 (~7 significant digits); summaries are rounded
+# so the widening noise doesn't show up in charts.
+SUMMARY_DECIMALS = 6
+
+
+@dataclass
+class ScoreMatrix:
+    # One row per evaluation, one column per (category, subcategory).
+    # Missing scores are NaN in `values` and False in `mask`.
+    question_ids: List[str]
+    row_codes: np.ndarray
+    columns: List[Tuple[str, str]]
+    values: np.ndarray
+    mask: np.ndarray
+
+    def categories(self) -> Dict[str, List[str]]:
+        # Categories in order of first appearance, subcategories sorted.
+        grouped: Dict[str, List[str]] = {}
+        for category, sub in self.columns:
+            grouped.setdefault(category, []).append(sub)
+        return grouped
+
+    def column_index(self, category: str, subcategory: str) -> int:
+        return self.columns.index((category, subcategory))
+
+    def rows_for(self, question_ids: Iterable[str]) -> np.ndarray:
+        wanted = {qid for qid in question_ids}
+        codes = [code for code, qid in enumerate(self.question_ids) if qid in wanted]
+        return np.isin(self.row_codes, np.asarray(codes, dtype=self.row_codes.dtype))
+
+
+@dataclass
+class ScoreSummary:
+    columns: List[Tuple[str, str]]
+    count: np.ndarray
+    mean: np.ndarray
+    median: np.ndarray
+    percentiles: Dict[int, np.ndarray]
+
+    def categories(self) -> Dict[str, List[str]]:
+        grouped: Dict[str, List[str]] = {}
+        for category, sub in self.columns:
+            grouped.setdefault(category, []).append(sub)
+        return grouped
+
+    def averages(self) -> Dict[str, Dict[str, float]]:
+        result: Dict[str, Dict[str, float]] = {}
+        for (category, sub), value in zip(self.columns, self.mean.tolist()):
+            result.setdefault(category, {})[sub] = value
+        return result
+
+
+def build_score_matrix(evaluations: Union[EvaluationTable, Sequence[Evaluation]]) -> ScoreMatrix:
+    # An EvaluationTable already holds the dense float32 matrix; share it.
+    if not isinstance(evaluations, EvaluationTable):
+        evaluations = EvaluationTable.from_evaluations(evaluations)
+    values = evaluations.scores
+    return ScoreMatrix(evaluations.question_ids, evaluations.codes, evaluations.columns, values, ~np.isnan(values))
+
+
+def summarize(matrix: ScoreMatrix, rows: Optional[np.ndarray] = None,
+              percentiles: Sequence[int] = PERCENTILES) -> ScoreSummary:
+    values = matrix.values if rows is None else matrix.values[rows]
+    mask = matrix.mask if rows is None else matrix.mask[rows]
+    count = mask.sum(axis=0)
+    has_data = count > 0
+    # Columns without any score report 0, matching the old dashboard averages.
+    mean = np.zeros(len(matrix.columns))
+    median = np.zeros(len(matrix.columns))
+    pct = {p: np.zeros(len(matrix.columns)) for p in percentiles}
+    if has_data.any():
+        present = values[:, has_data]
+        mean[has_data] = np.round(np.nansum(present, axis=0, dtype=np.float64) / count[has_data], SUMMARY_DECIMALS)
+        qs = np.round(np.nanpercentile(present, [50, *percentiles], axis=0).astype(np.float64), SUMMARY_DECIMALS)
+        median[has_data] = qs[0]
+        for i, p in enumerate(percentiles, start=1):
+            pct[p][has_data] = qs[i]
+    return ScoreSummary(matrix.columns, count, mean, median, pct)
+
+
+def group_by(matrix: ScoreMatrix, groups: Dict[str, Iterable[str]],
+             percentiles: Sequence[int] = PERCENTILES) -> Dict[str, ScoreSummary]:
+    # `groups` maps a label to the question ids in that group; groups may overlap
+    # (a question can be associated with several personas).
+    return {label: summarize(matrix, matrix.rows_for(qids), percentiles) for label, qids in groups.items()}
+
+
+GROUPINGS = ("category", "subcategory", "persona")
+
+
+def persona_stats(personas) -> Dict[str, object]:
+    # Quick stats shown above the persona list.
+    genders: Dict[str, int] = {}
+    for p in personas:
+        genders[p.gender] = genders.get(p.gender, 0) + 1
+    return {"total": len(personas), "genders": genders, "origins": sorted({p.origin for p in personas})}
+
+
+def question_groups(repo, by: str) -> Dict[str, List[str]]:
+    if by == "category":
+        return {category: [q.id for q in qs] for category, qs in sorted(repo.questions_by_category.items())}
+    if by == "subcategory":
+        return {f"{category} / {sub}": [q.id for q in qs]
+                for (category, sub), qs in sorted(repo.questions_by_subcategory.items())}
+    if by == "persona":
+        return {p.name: list(p.questions_associated) for p in repo.personas}
+    raise ValueError(f"Unknown grouping '{by}', expected one of {GROUPINGS}")
+
+
+@dataclass
+class ScoreComparison:
+    # Mean score per column for two runs aligned on the union of their
+    # columns; NaN where a run has no scores for the column.
+    columns: List[Tuple[str, str]]
+    base: np.ndarray
+    other: np.ndarray
+    delta: np.ndarray
+
+    def categories(self) -> Dict[str, List[str]]:
+        grouped: Dict[str, List[str]] = {}
+        for category, sub in self.columns:
+            grouped.setdefault(category, []).append(sub)
+        return grouped
+
+    def values(self, category: str) -> Tuple[List[float], List[float]]:
+        # Radar values for one category; unscored columns plot as 0.
+        rows = [i for i, (c, _) in enumerate(self.columns) if c == category]
+        return np.nan_to_num(self.base[rows]).tolist(), np.nan_to_num(self.other[rows]).tolist()
+
+
+def _column_means(summary: ScoreSummary, columns: List[Tuple[str, str]], index: Dict[Tuple[str, str], int]) -> np.ndarray:
+    means = np.full(len(columns), np.nan)
+    positions = np.asarray([index[c] for c in summary.columns], dtype=np.intp)
+    means[positions] = np.where(summary.count > 0, summary.mean, np.nan)
+    return means
+
+
+def compare_summaries(base: ScoreSummary, other: ScoreSummary) -> ScoreComparison:
+    known = set(base.columns)
+    columns = list(base.columns) + [c for c in other.columns if c not in known]
+    index = {column: i for i, column in enumerate(columns)}
+    base_means = _column_means(base, columns, index)
+    other_means = _column_means(other, columns, index)
+    return ScoreComparison(columns, base_means, other_means, np.round(other_means - base_means, SUMMARY_DECIMALS))
@@ -0,0 +1,337 @@
+import argparse
+import atexit
+import csv
+import io
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils import data_loader
+
+DB_FILENAME = "assessments.sqlite3"
+EXPORT_BATCH = 500
+EXPORT_FORMATS = ("csv", "parquet")
+
+# Export columns when the wizard definition can't be loaded; otherwise they
+# follow its questions (see export_fields). Keys the wizard doesn't know
+# about are kept in the stored JSON but not exported.
+ASSESSMENT_FIELDS = [
+    "completion_date", "is_eu", "role", "primary_function", "high_risk_options", "prohibited_tasks",
+    "requires_transparency", "risk_management", "human_oversight", "data_protection", "post_market",
+    "algorithmic_transparency", "environment", "users", "input_data", "temporal_constraints", "assumptions",
+    "risk_level", "risk_obligations",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    completed_at TEXT NOT NULL,
+    is_eu INTEGER NOT NULL DEFAULT 0,
+    roles TEXT NOT NULL DEFAULT '[]',
+    high_risk TEXT NOT NULL DEFAULT '[]',
+    primary_function TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS assessments_completed_at ON assessments (completed_at);
+"""
+
+
+def default_db_path() -> str:
+    return os.environ.get("LEVELS_ASSESSMENT_DB") or os.path.join(data_loader.DATA_DIR, DB_FILENAME)
+
+
+class ConnectionPool:
+    # Up to `size` SQLite connections in WAL mode, reused across reruns and
+    # sessions. WAL lets readers run while the flusher thread writes.
+    def __init__(self, path: str, size: int = 4):
+        self.path = path
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            conn = self._connect() if create else self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def export_fields() -> List[str]:
+    from utils.wizard import COMPLETION_FIELDS, load_wizard
+    try:
+        wizard = load_wizard()
+    except (OSError, ValueError):
+        return ASSESSMENT_FIELDS
+    return [COMPLETION_FIELDS[0], *wizard.fields, *COMPLETION_FIELDS[1:]]
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, (list, tuple)):
+        return "; ".join(str(v) for v in value)
+    return "" if value is None else str(value)
+
+
+def _where(is_eu: Optional[bool] = None, role: Optional[str] = None, high_risk: Optional[str] = None,
+           since: Optional[str] = None, until: Optional[str] = None,
+           search: Optional[str] = None) -> Tuple[str, List[Any]]:
+    clauses, params = [], []
+    if is_eu is not None:
+        clauses.append("is_eu = ?")
+        params.append(int(is_eu))
+    if role:
+        clauses.append("EXISTS (SELECT 1 FROM json_each(roles) WHERE value = ?)")
+        params.append(role)
+    if high_risk:
+        clauses.append("EXISTS (SELECT 1 FROM json_each(high_risk) WHERE value = ?)")
+        params.append(high_risk)
+    if since:
+        clauses.append("completed_at >= ?")
+        params.append(since)
+    if until:
+        clauses.append("completed_at <= ?")
+        params.append(until)
+    if search:
+        clauses.append("primary_function LIKE ?")
+        params.append(f"%{search}%")
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+class AssessmentStore:
+    # Completed onboarding assessments in SQLite. save() only queues the
+    # record; a background thread writes queued records in one transaction
+    # every `flush_interval` seconds (or once `batch_size` are pending).
+    # Reads flush first, so a session always sees its own assessments.
+    def __init__(self, path: str, pool_size: int = 4, batch_size: int = 100, flush_interval: float = 0.5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pool = ConnectionPool(path, pool_size)
+        self._pending: List[Tuple] = []
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _row(self, data: Dict[str, Any]) -> Tuple:
+        return (data.get("completion_date") or "", int(bool(data.get("is_eu"))),
+                json.dumps(list(data.get("role") or [])), json.dumps(list(data.get("high_risk_options") or [])),
+                data.get("primary_function") or "", json.dumps(data, ensure_ascii=False, default=str))
+
+    def save(self, data: Dict[str, Any]):
+        with self._pending_lock:
+            self._pending.append(self._row(data))
+            full = len(self._pending) >= self.batch_size
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="assessment-flusher", daemon=True)
+                self._flusher.start()
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        with self._write_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            try:
+                with self.pool.connection() as conn, conn:
+                    conn.executemany("INSERT INTO assessments (completed_at, is_eu, roles, high_risk, "
+                                     "primary_function, data) VALUES (?, ?, ?, ?, ?, ?)", batch)
+            except sqlite3.Error:
+                with self._pending_lock:
+                    self._pending[:0] = batch
+                raise
+            return len(batch)
+
+    def _flush_loop(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # The batch stays queued and is retried on the next tick.
+                pass
+
+    def count(self, **filters) -> int:
+        self.flush()
+        where, params = _where(**filters)
+        with self.pool.connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM assessments{where}", params).fetchone()[0]
+
+    def list(self, limit: int = 50, offset: int = 0, **filters) -> List[Dict[str, Any]]:
+        self.flush()
+        where, params = _where(**filters)
+        with self.pool.connection() as conn:
+            rows = conn.execute(f"SELECT id, data FROM assessments{where} ORDER BY completed_at DESC, id DESC "
+                                f"LIMIT ? OFFSET ?", [*params, limit, offset]).fetchall()
+        return [{"id": row_id, **json.loads(data)} for row_id, data in rows]
+
+    def iter_records(self, limit: Optional[int] = None, **filters) -> Iterator[Dict[str, Any]]:
+        # Stored records in id order, fetched EXPORT_BATCH at a time; the
+        # first `limit` only, if given.
+        self.flush()
+        where, params = _where(**filters)
+        if limit is not None:
+            where, params = f"{where} ORDER BY id LIMIT ?", [*params, limit]
+        else:
+            where += " ORDER BY id"
+        with self.pool.connection() as conn:
+            cursor = conn.execute(f"SELECT id, data FROM assessments{where}", params)
+            while True:
+                batch = cursor.fetchmany(EXPORT_BATCH)
+                if not batch:
+                    return
+                for row_id, data in batch:
+                    yield {"id": row_id, **json.loads(data)}
+
+    def iter_rows(self, fields: Optional[List[str]] = None, limit: Optional[int] = None,
+                  **filters) -> Iterator[Dict[str, str]]:
+        # Flat export rows.
+        fields = fields or export_fields()
+        for record in self.iter_records(limit, **filters):
+            yield {"id": str(record["id"]), **{name: _format_value(record.get(name)) for name in fields}}
+
+    def iter_csv(self, limit: Optional[int] = None, **filters) -> Iterator[str]:
+        fields = export_fields()
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=["id", *fields])
+        writer.writeheader()
+        for row in self.iter_rows(fields, limit, **filters):
+            writer.writerow(row)
+            if buffer.tell() >= 64 * 1024:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    def export_csv(self, file, **filters) -> int:
+        written = 0
+        for chunk in self.iter_csv(**filters):
+            written += len(chunk)
+            file.write(chunk)
+        return written
+
+    def export_parquet(self, file, limit: Optional[int] = None, **filters) -> int:
+        # pyarrow is optional; it ships with streamlit but is only needed here.
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        fields = export_fields()
+        schema = pa.schema([(name, pa.string()) for name in ["id", *fields]])
+        rows = 0
+        batch: List[Dict[str, str]] = []
+        with pq.ParquetWriter(file, schema) as writer:
+            for row in self.iter_rows(fields, limit, **filters):
+                batch.append(row)
+                if len(batch) == EXPORT_BATCH:
+                    writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+                    rows += len(batch)
+                    batch = []
+            if batch:
+                writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+                rows += len(batch)
+        return rows
+
+    def close(self):
+        self.flush()
+        self.pool.close()
+
+
+_stores: Dict[str, AssessmentStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_assessment_store(path: Optional[str] = None) -> AssessmentStore:
+    path = path or default_db_path()
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = AssessmentStore(path)
+        return store
+
+
+@atexit.register
+def _flush_all():
+    for store in list(_stores.values()):
+        try:
+            store.flush()
+        except sqlite3.Error:
+            pass
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="List or export the stored onboarding assessments.")
+    parser.add_argument("--db", default=None, help=f"defaults to <data dir>/{DB_FILENAME}")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("list", "export"):
+        command = sub.add_parser(name)
+        command.add_argument("--eu", action="store_true", default=None, help="only EU-relevant systems")
+        command.add_argument("--role", default=None)
+        command.add_argument("--high-risk", default=None)
+        command.add_argument("--since", default=None, help="completion date lower bound, YYYY-MM-DD")
+        command.add_argument("--until", default=None, help="completion date upper bound, YYYY-MM-DD")
+        if name == "export":
+            command.add_argument("output", help="file to write, '-' for stdout (csv only)")
+            command.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+        else:
+            command.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    store = get_assessment_store(args.db)
+    filters = {"is_eu": args.eu, "role": args.role, "high_risk": args.high_risk, "since": args.since,
+               "until": args.until and args.until + " 23:59:59"}
+    if args.command == "list":
+        print(f"{store.count(**filters)} assessments")
+        for record in store.list(limit=args.limit, **filters):
+            print(f"#{record['id']} {record.get('completion_date', '')} {_format_value(record.get('role'))}: "
+                  f"{record.get('primary_function', '')}")
+        return 0
+    if args.format == "parquet":
+        if args.output == "-":
+            parser.error("parquet export needs an output file")
+        rows = store.export_parquet(args.output, **filters)
+        print(f"Wrote {rows} assessments to {args.output}", file=sys.stderr)
+    elif args.output == "-":
+        store.export_csv(sys.stdout, **filters)
+    else:
+        with open(args.output, 'w', encoding='utf-8', newline='') as file:
+            store.export_csv(file, **filters)
+        print(f"Wrote {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
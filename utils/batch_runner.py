@@ -0,0 +1,309 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import yaml
+
+from models.data_models import LLMResponse, Persona, Question
+from utils import data_loader
+from utils.risk_scoring import RiskScorer
+
+# Fields every LLMResponse record has; a shard record without one is torn.
+SHARD_REQUIRED_KEYS = ("question_id", "response_text", "risk_flags", "risk_score")
+CACHE_FILENAME = ".llm_response_cache.jsonl"
+
+DEFAULT_TEMPLATE = (
+    "You are assisting a hiring panel.\n"
+    "Candidate: {persona.name}, {persona.title}\n"
+    "Gender: {persona.gender}\n"
+    "Origin: {persona.origin}\n"
+    "Experience: {persona.experience}\n"
+    "Education: {persona.education}\n\n"
+    "Question: {question.question_text}"
+)
+
+
+class LLMBackend(ABC):
+    # Minimal async interface; implementations must be safe to call concurrently.
+    model = "unknown"
+
+    @abstractmethod
+    async def complete(self, prompt: str, params: Dict[str, Any]) -> str:
+        ...
+
+
+class StubBackend(LLMBackend):
+    # Deterministic local backend for dry runs and tests; `delay` simulates latency.
+    def __init__(self, model: str = "stub", delay: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        self.model = model
+        self.delay = delay
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+
+    async def complete(self, prompt: str, params: Dict[str, Any]) -> str:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.failure_rate and self._rng.random() < self.failure_rate:
+            raise RuntimeError("stub backend: simulated failure")
+        question = prompt.rsplit("Question:", 1)[-1].strip()
+        return f"[{self.model}] Response to: {question}"
+
+
+class HTTPBackend(LLMBackend):
+    # POSTs {"model", "prompt", **params} as JSON and reads `response_field`
+    # from the JSON reply. Works against simple completion endpoints and mocks.
+    def __init__(self, url: str, model: str, response_field: str = "text", timeout: float = 60.0,
+                 headers: Optional[Dict[str, str]] = None):
+        self.url = url
+        self.model = model
+        self.response_field = response_field
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+    def _post(self, prompt: str, params: Dict[str, Any]) -> str:
+        body = json.dumps({"model": self.model, "prompt": prompt, **params}).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, headers=self.headers, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as reply:
+            return json.loads(reply.read().decode("utf-8"))[self.response_field]
+
+    async def complete(self, prompt: str, params: Dict[str, Any]) -> str:
+        return await asyncio.to_thread(self._post, prompt, params)
+
+
+class RateLimiter:
+    # Spaces request starts evenly at `rate` per second across all workers.
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._next - now)
+            self._next = max(now, self._next) + self.interval
+        if delay:
+            await asyncio.sleep(delay)
+
+
+def cache_key(model: str, prompt: str, params: Dict[str, Any]) -> str:
+    payload = json.dumps([model, prompt, params], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    # Append-only JSONL of completed calls keyed by hash(model, prompt, params).
+    # Shared across runs, so a rerun or a resumed sweep skips finished prompts.
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                        self._entries[record["key"]] = record["text"]
+                    except (ValueError, KeyError):
+                        continue  # torn write from an interrupted sweep
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._entries.get(key)
+
+    def put(self, key: str, text: str):
+        line = json.dumps({"key": key, "text": text}, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._entries[key] = text
+            with open(self.path, 'a', encoding='utf-8') as file:
+                file.write(line)
+
+
+class ResponseShardWriter:
+    # Streams LLMResponse records into a run shard (domain_data/responses/<run>.yaml)
+    # as they complete. The file is valid YAML after every append, so the
+    # dashboard can pick up partial runs. Each record is written with
+    # risk_score last, so a record cut short by a killed sweep is missing it
+    # or its final newline; existing() truncates such a tail.
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write("responses:\n")
+
+    def existing(self) -> Set[Tuple[str, Optional[str]]]:
+        with self._lock:
+            self._drop_torn_tail()
+        data = data_loader._parse_yaml(self.path) or {}
+        return {(r["question_id"], r.get("persona_id")) for r in data.get("responses") or []}
+
+    def _drop_torn_tail(self):
+        # The dropped record is redone on resume, from the response cache if
+        # the call had completed.
+        with open(self.path, 'rb') as file:
+            content = file.read()
+        start = content.rfind(b"\n-") + 1
+        if not start:
+            return
+        tail = content[start:]
+        try:
+            record = yaml.safe_load(tail)[0]
+            complete = tail.endswith(b"\n") and all(key in record for key in SHARD_REQUIRED_KEYS)
+        except (yaml.YAMLError, TypeError, IndexError, KeyError):
+            complete = False
+        if not complete:
+            with open(self.path, 'r+b') as file:
+                file.truncate(start)
+
+    def write(self, response: LLMResponse):
+        record = {k: v for k, v in asdict(response).items() if v is not None and k != "risk_score"}
+        record["risk_score"] = response.risk_score
+        chunk = yaml.safe_dump([record], allow_unicode=True, sort_keys=False)
+        with self._lock, open(self.path, 'a', encoding='utf-8') as file:
+            file.write(chunk)
+            file.flush()
+
+
+@dataclass
+class PromptJob:
+    question: Question
+    persona: Persona
+    prompt: str
+    key: str
+
+
+@dataclass
+class SweepStats:
+    total: int = 0
+    skipped: int = 0
+    cached: int = 0
+    completed: int = 0
+    failed: int = 0
+    retries: int = 0
+    elapsed_s: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+
+def render_jobs(questions: Iterable[Question], personas: Iterable[Persona], model: str, params: Dict[str, Any],
+                template: str = DEFAULT_TEMPLATE) -> List[PromptJob]:
+    personas = list(personas)
+    jobs = []
+    for question in questions:
+        for persona in personas:
+            prompt = template.format(question=question, persona=persona)
+            jobs.append(PromptJob(question, persona, prompt, cache_key(model, prompt, params)))
+    return jobs
+
+
+async def run_sweep(jobs: List[PromptJob], backend: LLMBackend, writer: ResponseShardWriter, cache: ResponseCache,
+                    params: Optional[Dict[str, Any]] = None, concurrency: int = 16, rate: Optional[float] = None,
+                    retries: int = 3, backoff: float = 0.5, scorer: Optional[RiskScorer] = None) -> SweepStats:
+    params = params or {}
+    stats = SweepStats(total=len(jobs))
+    start = time.monotonic()
+    done = writer.existing()
+    limiter = RateLimiter(rate)
+    queue: "asyncio.Queue[PromptJob]" = asyncio.Queue()
+    for job in jobs:
+        if (job.question.id, job.persona.id) in done:
+            stats.skipped += 1
+        else:
+            queue.put_nowait(job)
+
+    def store(job: PromptJob, text: str):
+        flags, score = scorer.score_texts([text])[0] if scorer is not None else ([], 0.0)
+        writer.write(LLMResponse(question_id=job.question.id, response_text=text, risk_flags=flags,
+                                 risk_score=score, persona_id=job.persona.id))
+
+    async def worker():
+        while True:
+            try:
+                job = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            cached = cache.get(job.key)
+            if cached is not None:
+                store(job, cached)
+                stats.cached += 1
+                continue
+            for attempt in range(retries + 1):
+                await limiter.wait()
+                try:
+                    text = await backend.complete(job.prompt, params)
+                except Exception as e:
+                    if attempt == retries:
+                        stats.failed += 1
+                        stats.errors.append(f"{job.question.id}/{job.persona.id}: {e}")
+                        break
+                    stats.retries += 1
+                    await asyncio.sleep(backoff * (2 ** attempt) * (0.5 + random.random()))
+                    continue
+                cache.put(job.key, text)
+                store(job, text)
+                stats.completed += 1
+                break
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    stats.elapsed_s = time.monotonic() - start
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the question library x personas through an LLM backend.")
+    parser.add_argument("run_id", help="name of the response shard, e.g. run_2024_06_01")
+    parser.add_argument("--backend", choices=["stub", "http"], default="stub")
+    parser.add_argument("--url", help="endpoint for the http backend")
+    parser.add_argument("--model", default="stub")
+    parser.add_argument("--param", action="append", default=[], metavar="KEY=VALUE",
+                        help="generation parameter sent with every request (JSON value)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=None, help="max requests per second")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--stub-delay", type=float, default=0.0)
+    parser.add_argument("--no-score", action="store_true", help="leave risk_flags/risk_score empty")
+    args = parser.parse_args(argv)
+
+    params = {}
+    for item in args.param:
+        name, _, value = item.partition("=")
+        try:
+            params[name] = json.loads(value)
+        except ValueError:
+            params[name] = value
+    if args.backend == "http":
+        if not args.url:
+            parser.error("--url is required for the http backend")
+        backend: LLMBackend = HTTPBackend(args.url, args.model)
+    else:
+        backend = StubBackend(args.model, delay=args.stub_delay)
+
+    jobs = render_jobs(data_loader.load_questions(), data_loader.load_personas(), backend.model, params)
+    writer = ResponseShardWriter(os.path.join(data_loader._shard_dir("llm_responses.yaml"), f"{args.run_id}.yaml"))
+    cache = ResponseCache(os.path.join(data_loader.DATA_DIR, CACHE_FILENAME))
+    scorer = None if args.no_score else RiskScorer.from_file()
+    stats = asyncio.run(run_sweep(jobs, backend, writer, cache, params, args.concurrency, args.rate, args.retries,
+                                  scorer=scorer))
+    print(json.dumps({k: v for k, v in stats.__dict__.items() if k != "errors"}, indent=2))
+    for error in stats.errors[:20]:
+        print(f"failed: {error}", file=sys.stderr)
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,136 @@
 import os
+import threading
 import yaml
 import streamlit as st
-from typing import List
-from models.data_models import Persona, Question, LLMResponse, Evaluation, Insight
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from models.data_models import Persona, Question, LLMResponse, Insight
+from models.evaluation_table import EvaluationTable
+from utils.instrumentation import instrumentation
+from utils.snapshot import snapshot_reader
 
+# Prefer the libyaml-backed loader when PyYAML was built with it.
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+BUNDLED_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "domain_data")
+# DOMAIN_DATA_DIR points the dashboard at another dataset (e.g. generated
+# benchmark data) without touching the bundled domain_data/.
+DATA_DIR = os.environ.get("DOMAIN_DATA_DIR", BUNDLED_DATA_DIR)
+
+
+class DomainDataCache:
+    # Process-wide cache shared by every Streamlit session. Entries are keyed by
+    # file path and invalidated when the file's mtime or size changes, so only
+    # files that were actually edited get re-parsed.
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path_lock(self, filepath: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(filepath, threading.Lock())
+
+    def get(self, filepath: str, build: Callable[[str], Any]) -> Any:
+        stat = os.stat(filepath)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(filepath)
+        if entry is not None and entry[0] == signature:
+            with self._lock:
+                self.hits += 1
+            return entry[1]
+        # One loader per file at a time; concurrent sessions wait for the
+        # in-flight parse instead of repeating it.
+        with self._path_lock(filepath):
+            entry = self._entries.get(filepath)
+            if entry is not None and entry[0] == signature:
+                with self._lock:
+                    self.hits += 1
+                return entry[1]
+            value = build(filepath)
+            with self._lock:
+                self.misses += 1
+                self._entries[filepath] = (signature, value)
+            return value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def discard(self, dirpath: str) -> int:
+        # Drops every entry for files under `dirpath` (e.g. an evicted dataset).
+        prefix = os.path.join(os.path.abspath(dirpath), "")
+        with self._lock:
+            paths = [path for path in self._entries if os.path.abspath(path).startswith(prefix)]
+            for path in paths:
+                del self._entries[path]
+            return len(paths)
+
+
+domain_cache = DomainDataCache()
+
+
+def get_cache_stats() -> Dict[str, int]:
+    return domain_cache.stats()
+
+
+def _data_path(filename: str, data_dir: Optional[str] = None) -> str:
+    return os.path.join(data_dir or DATA_DIR, filename)
+
+
+def settings_path(filename: str, data_dir: Optional[str] = None) -> str:
+    # Settings files a dataset may override; datasets without their own
+    # (e.g. generated benchmark data) use the bundled one.
+    path = _data_path(filename, data_dir)
+    return path if os.path.exists(path) else os.path.join(BUNDLED_DATA_DIR, filename)
+
+
+@instrumentation.timed("parse_yaml")
+def _parse_yaml(filepath: str) -> dict:
+    with open(filepath, 'r') as file:
+        return yaml.load(file, Loader=YamlLoader)
+
+
+@instrumentation.timed("load_yaml_data")
 def load_yaml_data(filename: str) -> dict:
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    filepath = os.path.join(current_dir, "..", "domain_data", filename)
+    filepath = _data_path(filename)
     try:
-        with open(filepath, 'r') as file:
-            return yaml.safe_load(file)
+        return _parse_yaml(filepath)
     except Exception as e:
         st.error(f"Error loading {filename}: {e}")
         return {}
 
-def load_personas() -> List[Persona]:
-    data = load_yaml_data("personas.yaml")
+
+def _read_records(filepath: str, build: Callable[[dict], list]) -> list:
+    # Use the compiled snapshot when it is up to date with the YAML file.
+    records = snapshot_reader.lookup(filepath)
+    if records is not None:
+        return records
+    return build(_parse_yaml(filepath))
+
+
+def _load_cached(filename: str, build: Callable[[dict], list], data_dir: Optional[str] = None) -> list:
+    filepath = _data_path(filename, data_dir)
+    try:
+        records = domain_cache.get(filepath, lambda path: _read_records(path, build))
+    except Exception as e:
+        st.error(f"Error loading {filename}: {e}")
+        return build({})
+    # Cached lists are shared between sessions; hand out a shallow copy so
+    # callers can filter or sort in place without affecting each other.
+    # Tables are immutable and shared as is.
+    return list(records) if isinstance(records, list) else records
+
+
+def _build_personas(data: dict) -> List[Persona]:
     personas = []
     if data and 'personas' in data:
         for p in data['personas']:
@@ -34,8 +149,8 @@ def load_personas() -> List[Persona]:
             ))
     return personas
 
-def load_questions() -> List[Question]:
-    data = load_yaml_data("questions.yaml")
+
+def _build_questions(data: dict) -> List[Question]:
     questions = []
     if data and 'questions' in data:
         for q in data['questions']:
@@ -47,8 +162,8 @@ def load_questions() -> List[Question]:
             ))
     return questions
 
-def load_llm_responses() -> List[LLMResponse]:
-    data = load_yaml_data("llm_responses.yaml")
+
+def _build_llm_responses(data: dict) -> List[LLMResponse]:
     responses = []
     if data and 'responses' in data:
         for r in data['responses']:
@@ -57,24 +172,19 @@ def load_llm_responses() -> List[LLMResponse]:
                 response_text=r['response_text'],
                 risk_flags=r['risk_flags'],
                 risk_score=r['risk_score'],
-                suggested_fix=r.get('suggested_fix', None)
+                suggested_fix=r.get('suggested_fix', None),
+                persona_id=r.get('persona_id', None)
             ))
     return responses
 
-def load_evaluations() -> List[Evaluation]:
-    data = load_yaml_data("evaluation_scores.yaml")
-    evaluations = []
+
+def _build_evaluations(data: dict) -> EvaluationTable:
     if data and 'evaluations' in data:
-        for e in data['evaluations']:
-            evaluations.append(Evaluation(
-                question_id=e['question_id'],
-                scores=e['scores'],
-                feedback=e.get('feedback', None)
-            ))
-    return evaluations
+        return EvaluationTable.from_records(data['evaluations'])
+    return EvaluationTable.empty()
+
 
-def load_insights() -> List[Insight]:
-    data = load_yaml_data("contributor_insights.yaml")
+def _build_insights(data: dict) -> List[Insight]:
     insights = []
     if data and 'insights' in data:
         for i in data['insights']:
@@ -84,3 +194,147 @@ def load_insights() -> List[Insight]:
                 comment_text=i['comment_text']
             ))
     return insights
+
+
+# Per-run shard directories. Each shard is a YAML file in the same format as
+# the monolithic file it extends (e.g. domain_data/evaluations/run_042.yaml
+# holds an `evaluations:` list) and is cached on its own, so adding a run
+# only parses the new file.
+SHARD_DIRS = {
+    "llm_responses.yaml": "responses",
+    "evaluation_scores.yaml": "evaluations",
+}
+SHARD_WORKERS = int(os.environ.get("LEVELS_SHARD_WORKERS", "0")) or min(8, os.cpu_count() or 1)
+# "thread" suits the libyaml loader; "process" sidesteps the GIL for the
+# pure-Python loader at the cost of pickling the parsed records back.
+SHARD_POOL = os.environ.get("LEVELS_SHARD_POOL", "thread")
+
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _pools() -> Tuple[ThreadPoolExecutor, Optional[ProcessPoolExecutor]]:
+    global _thread_pool, _process_pool
+    with _pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(max_workers=SHARD_WORKERS, thread_name_prefix="shard-loader")
+        if SHARD_POOL == "process" and _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=SHARD_WORKERS)
+        return _thread_pool, _process_pool
+
+
+def _shard_dir(filename: str, data_dir: Optional[str] = None) -> str:
+    return _data_path(SHARD_DIRS[filename], data_dir)
+
+
+def _run_id(shard_path: str) -> str:
+    return os.path.splitext(os.path.basename(shard_path))[0]
+
+
+def _shard_paths(dirpath: str) -> List[str]:
+    try:
+        names = os.listdir(dirpath)
+    except OSError:
+        return []
+    return [os.path.join(dirpath, name) for name in sorted(names)
+            if name.endswith((".yaml", ".yml")) and not name.startswith(".")]
+
+
+def list_runs(filename: str = "evaluation_scores.yaml", data_dir: Optional[str] = None) -> List[str]:
+    return [_run_id(path) for path in _shard_paths(_shard_dir(filename, data_dir))]
+
+
+def _parse_and_build(filepath: str, build: Callable[[dict], list]) -> list:
+    return build(_parse_yaml(filepath))
+
+
+def _load_shard(filepath: str, build: Callable[[dict], list], process_pool: Optional[ProcessPoolExecutor]) -> list:
+    if process_pool is None:
+        return domain_cache.get(filepath, lambda path: build(_parse_yaml(path)))
+    return domain_cache.get(filepath, lambda path: process_pool.submit(_parse_and_build, path, build).result())
+
+
+def _concat_lists(parts: List[list]) -> list:
+    return [record for part in parts for record in part]
+
+
+def _load_sharded(filename: str, build: Callable[[dict], Any], skip_runs: Optional[Iterable[str]],
+                  combine: Callable[[list], Any] = _concat_lists, data_dir: Optional[str] = None) -> Any:
+    shard_paths = _shard_paths(_shard_dir(filename, data_dir))
+    skipped = set(skip_runs or ())
+    shard_paths = [path for path in shard_paths if _run_id(path) not in skipped]
+    # The monolithic file stays the primary source; it is only optional once
+    # shards exist.
+    if not shard_paths:
+        return _load_cached(filename, build, data_dir)
+    parts = [_load_cached(filename, build, data_dir)] if os.path.exists(_data_path(filename, data_dir)) else []
+    thread_pool, process_pool = _pools()
+    futures = [thread_pool.submit(_load_shard, path, build, process_pool) for path in shard_paths]
+    for path, future in zip(shard_paths, futures):
+        try:
+            parts.append(future.result())
+        except Exception as e:
+            st.error(f"Error loading shard {os.path.relpath(path, data_dir or DATA_DIR)}: {e}")
+    return combine(parts)
+
+
+@instrumentation.timed("load_personas")
+def load_personas(data_dir: Optional[str] = None) -> List[Persona]:
+    return _load_cached("personas.yaml", _build_personas, data_dir)
+
+@instrumentation.timed("load_questions")
+def load_questions(data_dir: Optional[str] = None) -> List[Question]:
+    return _load_cached("questions.yaml", _build_questions, data_dir)
+
+@instrumentation.timed("load_llm_responses")
+def load_llm_responses(skip_runs: Optional[Iterable[str]] = None, data_dir: Optional[str] = None) -> List[LLMResponse]:
+    return _load_sharded("llm_responses.yaml", _build_llm_responses, skip_runs, data_dir=data_dir)
+
+@instrumentation.timed("load_evaluations")
+def load_evaluations(skip_runs: Optional[Iterable[str]] = None, data_dir: Optional[str] = None) -> EvaluationTable:
+    return _load_sharded("evaluation_scores.yaml", _build_evaluations, skip_runs, EvaluationTable.concat, data_dir)
+
+@instrumentation.timed("load_insights")
+def load_insights(data_dir: Optional[str] = None) -> List[Insight]:
+    return _load_cached("contributor_insights.yaml", _build_insights, data_dir)
+
+DOMAIN_FILES = [
+    "personas.yaml",
+    "questions.yaml",
+    "llm_responses.yaml",
+    "evaluation_scores.yaml",
+    "contributor_insights.yaml",
+]
+# Settings the loaded data is derived from: the lexicon scores the paired
+# responses behind the persona bias metrics. (The onboarding wizard isn't
+# derived data; load_wizard has its own mtime-keyed cache entry.)
+VERSIONED_SETTINGS = [
+    "risk_lexicons.yaml",
+]
+
+def _file_version(filepath: str) -> Tuple:
+    try:
+        stat = os.stat(filepath)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return (None, None)
+
+def data_version(data_dir: Optional[str] = None, run_id: Optional[str] = None) -> Tuple:
+    # Cheap fingerprint of the current domain data: (mtime, size) per file,
+    # including every run shard, or with `run_id` only that run's shards, so
+    # a single run never matches anything computed for the whole dataset.
+    data_dir = data_dir or DATA_DIR
+    version = [(filename, *_file_version(_data_path(filename, data_dir))) for filename in DOMAIN_FILES]
+    version += [(filename, *_file_version(settings_path(filename, data_dir))) for filename in VERSIONED_SETTINGS]
+    for filename in SHARD_DIRS:
+        for path in _shard_paths(_shard_dir(filename, data_dir)):
+            if run_id is None or _run_id(path) == run_id:
+                version.append((os.path.relpath(path, data_dir), *_file_version(path)))
+    return tuple(version)
+
+def source_version(version: Tuple, filename: str) -> Tuple:
+    # The entries of a data_version for one domain file and its run shards,
+    # for caches that only depend on that kind of record.
+    prefixes = (filename,) + ((SHARD_DIRS[filename] + os.sep,) if filename in SHARD_DIRS else ())
+    return tuple(entry for entry in version if entry[0].startswith(prefixes))
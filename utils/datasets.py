@@ -0,0 +1,127 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from utils import data_loader
+from utils.repository import DomainRepository, get_repository, load_repository
+
+# LEVELS_DATASETS_DIR holds one dataset per subdirectory (e.g. one per model
+# version), each laid out like domain_data/.
+DATASETS_DIR = os.environ.get("LEVELS_DATASETS_DIR")
+MAX_DATASETS = int(os.environ.get("LEVELS_DATASET_CACHE_ENTRIES", "8"))
+MAX_DATASET_BYTES = int(os.environ.get("LEVELS_DATASET_CACHE_MB", "512")) * 1024 * 1024
+# Rough per-record cost of a slotted model object and its list slot.
+RECORD_OVERHEAD = 200
+
+
+def estimate_bytes(repo: DomainRepository) -> int:
+    # Array payloads plus text lengths plus a fixed per-record overhead; an
+    # estimate, but proportional enough to keep the cache within budget.
+    text = sum(len(q.question_text) for q in repo.questions)
+    text += sum(len(r.response_text) + len(r.suggested_fix or "") for r in repo.responses)
+    text += sum(len(i.comment_text) for i in repo.insights)
+    text += sum(len(p.control_comparison) + len(p.experience) + len(p.education) for p in repo.personas)
+    text += sum(len(note) for note in repo.evaluations.feedback.values())
+    records = len(repo.personas) + len(repo.questions) + len(repo.responses) + len(repo.insights)
+    return repo.evaluations.nbytes + text + records * RECORD_OVERHEAD
+
+
+def _is_dataset(path: str) -> bool:
+    return any(os.path.exists(os.path.join(path, name))
+               for name in [*data_loader.DOMAIN_FILES, *data_loader.SHARD_DIRS.values()])
+
+
+class DatasetRegistry:
+    # Named data roots with an LRU of their repositories, bounded by entry
+    # count and estimated size. The default dataset is served by
+    # get_repository() and never evicted; evicting any other dataset also
+    # drops its parsed files from the domain cache so the memory is released.
+    def __init__(self, datasets_dir: Optional[str] = None, max_entries: int = MAX_DATASETS,
+                 max_bytes: int = MAX_DATASET_BYTES):
+        self.datasets_dir = datasets_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[DomainRepository, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def default_name(self) -> str:
+        return os.path.basename(os.path.normpath(data_loader.DATA_DIR))
+
+    def datasets(self) -> Dict[str, str]:
+        found = {self.default_name: os.path.abspath(data_loader.DATA_DIR)}
+        if self.datasets_dir:
+            try:
+                names = sorted(os.listdir(self.datasets_dir))
+            except OSError:
+                names = []
+            for name in names:
+                path = os.path.abspath(os.path.join(self.datasets_dir, name))
+                if not name.startswith(".") and os.path.isdir(path) and _is_dataset(path) \
+                        and path not in found.values():
+                    found.setdefault(name, path)
+        return found
+
+    def names(self) -> List[str]:
+        return list(self.datasets())
+
+    def get(self, name: str) -> DomainRepository:
+        path = self.datasets()[name]
+        if path == os.path.abspath(data_loader.DATA_DIR):
+            return get_repository()
+        version = data_loader.data_version(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0].version == version:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[0]
+            build_lock = self._build_locks.setdefault(path, threading.Lock())
+        with build_lock:
+            with self._lock:
+                entry = self._entries.get(path)
+                if entry is not None and entry[0].version == version:
+                    self._entries.move_to_end(path)
+                    self.hits += 1
+                    return entry[0]
+            repo = load_repository(path, version)
+            size = estimate_bytes(repo)
+            with self._lock:
+                self.misses += 1
+                previous = self._entries.pop(path, None)
+                if previous is not None:
+                    self._bytes -= previous[1]
+                self._entries[path] = (repo, size)
+                self._bytes += size
+                self._evict(keep=path)
+            return repo
+
+    def _evict(self, keep: str):
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            path = next(iter(self._entries))
+            if path == keep:
+                self._entries.move_to_end(path)
+                continue
+            _, size = self._entries.pop(path)
+            self._bytes -= size
+            self.evictions += 1
+            data_loader.domain_cache.discard(path)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "estimated_bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+dataset_registry = DatasetRegistry(DATASETS_DIR)
@@ -0,0 +1,229 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models.data_models import Evaluation
+from utils import data_loader
+
+LOG_FILENAME = "evaluation_log.jsonl"
+STATE_FILENAME = ".evaluation_log.state.json"
+LOCK_FILENAME = ".evaluation_log.lock"
+STATE_FORMAT = 1
+HEAD_BYTES = 256
+
+
+class RunningAggregates:
+    # Sum, count and sum of squares per (category, subcategory). Folding a
+    # record is O(scores in the record); means and variances are O(columns).
+    def __init__(self, stats: Optional[Dict[str, Dict[str, List[float]]]] = None, records: int = 0):
+        self.stats: Dict[str, Dict[str, List[float]]] = stats or {}
+        self.records = records
+
+    def fold(self, scores: Dict[str, Dict[str, float]]):
+        for category, sub_scores in scores.items():
+            category_stats = self.stats.setdefault(category, {})
+            for sub, score in sub_scores.items():
+                entry = category_stats.get(sub)
+                if entry is None:
+                    entry = category_stats[sub] = [0.0, 0, 0.0]
+                entry[0] += score
+                entry[1] += 1
+                entry[2] += score * score
+        self.records += 1
+
+    def means(self) -> Dict[str, Dict[str, float]]:
+        return {category: {sub: (s / n if n else 0) for sub, (s, n, _) in subs.items()}
+                for category, subs in self.stats.items()}
+
+    def stddevs(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for category, subs in self.stats.items():
+            result[category] = {}
+            for sub, (s, n, sq) in subs.items():
+                result[category][sub] = math.sqrt(max(sq / n - (s / n) ** 2, 0.0)) if n else 0.0
+        return result
+
+    def merge(self, summary) -> Tuple[Dict[str, Dict[str, float]], Dict[str, List[str]]]:
+        # Combine with a utils.aggregation.ScoreSummary computed over the
+        # evaluation files; returns (averages, categories) for the radar charts.
+        totals: Dict[str, Dict[str, List[float]]] = {}
+        for (category, sub), count, mean in zip(summary.columns, summary.count.tolist(), summary.mean.tolist()):
+            totals.setdefault(category, {})[sub] = [mean * count, count]
+        for category, subs in self.stats.items():
+            for sub, (s, n, _) in subs.items():
+                entry = totals.setdefault(category, {}).setdefault(sub, [0.0, 0])
+                entry[0] += s
+                entry[1] += n
+        averages = {category: {sub: (s / n if n else 0) for sub, (s, n) in subs.items()}
+                    for category, subs in totals.items()}
+        categories = {category: sorted(subs) for category, subs in totals.items()}
+        return averages, categories
+
+    def to_dict(self) -> dict:
+        return {"records": self.records, "stats": self.stats}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunningAggregates":
+        return cls(data.get("stats", {}), data.get("records", 0))
+
+
+class EvaluationLog:
+    # Append-only JSONL log of Evaluation records with a checkpointed byte
+    # offset. refresh() only reads and folds bytes appended since the last
+    # checkpoint, so restarts don't replay the whole log. Records keep their
+    # question_id, but the running totals are per (category, subcategory)
+    # only. Processes sharing a data directory serialize refreshes on a lock
+    # file and pick up each other's checkpoints.
+    def __init__(self, data_dir: Optional[str] = None):
+        data_dir = data_dir or data_loader.DATA_DIR
+        self.path = os.path.join(data_dir, LOG_FILENAME)
+        self.state_path = os.path.join(data_dir, STATE_FILENAME)
+        self.lock_path = os.path.join(data_dir, LOCK_FILENAME)
+        self.offset = 0
+        self.skipped = 0
+        self.head = None
+        self.aggregates = RunningAggregates()
+        self._lock = threading.Lock()
+        self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r') as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return
+        if state.get("format") != STATE_FORMAT or state.get("offset", 0) <= self.offset:
+            # Keep what this process has folded unless another one got further.
+            return
+        self.offset = state.get("offset", 0)
+        self.skipped = state.get("skipped", 0)
+        self.head = state.get("head")
+        self.aggregates = RunningAggregates.from_dict(state.get("aggregates", {}))
+
+    def _checkpoint(self):
+        state = {"format": STATE_FORMAT, "offset": self.offset, "skipped": self.skipped, "head": self.head,
+                 "aggregates": self.aggregates.to_dict()}
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w') as file:
+                json.dump(state, file)
+            os.replace(tmp_path, self.state_path)
+        except OSError:
+            # Without a checkpoint the next process simply replays the log.
+            pass
+
+    @contextmanager
+    def _refresh_lock(self) -> Iterator[None]:
+        # fcntl is Unix-only; elsewhere only the in-process lock applies.
+        with self._lock:
+            try:
+                import fcntl
+                lock_file = open(self.lock_path, 'a')
+            except (ImportError, OSError):
+                yield
+                return
+            with lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _head_hash(self, file) -> str:
+        # Fingerprint of the already-folded prefix, used to detect a replaced log.
+        file.seek(0)
+        return hashlib.sha256(file.read(min(HEAD_BYTES, self.offset))).hexdigest()
+
+    def _reset(self):
+        self.offset, self.skipped, self.head = 0, 0, None
+        self.aggregates = RunningAggregates()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def append(self, evaluations: Iterable[Evaluation]) -> int:
+        lines = [json.dumps({"question_id": e.question_id, "scores": e.scores, "feedback": e.feedback},
+                            ensure_ascii=False) + "\n" for e in evaluations]
+        if lines:
+            with self._lock, open(self.path, 'a', encoding='utf-8') as file:
+                file.writelines(lines)
+        return len(lines)
+
+    def refresh(self) -> RunningAggregates:
+        with self._refresh_lock():
+            self._load_state()
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                return self.aggregates
+            if size < self.offset:
+                # The log was truncated; start over.
+                self._reset()
+            if size == self.offset:
+                return self.aggregates
+            with open(self.path, 'rb') as file:
+                if self.head is not None and self._head_hash(file) != self.head:
+                    # Same or larger size but a different file: replaced.
+                    self._reset()
+                file.seek(self.offset)
+                chunk = file.read(size - self.offset)
+            # Only fold complete lines; a writer may be mid-append.
+            end = chunk.rfind(b"\n") + 1
+            for line in chunk[:end].splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    self.aggregates.fold(record["scores"])
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    self.skipped += 1
+            if end:
+                previous_offset = self.offset
+                self.offset += end
+                if self.head is None or previous_offset < HEAD_BYTES:
+                    with open(self.path, 'rb') as file:
+                        self.head = self._head_hash(file)
+                self._checkpoint()
+            return self.aggregates
+
+
+_logs: Dict[str, EvaluationLog] = {}
+_logs_lock = threading.Lock()
+
+
+def get_evaluation_log(data_dir: Optional[str] = None) -> EvaluationLog:
+    data_dir = data_dir or data_loader.DATA_DIR
+    with _logs_lock:
+        log = _logs.get(data_dir)
+        if log is None:
+            log = _logs[data_dir] = EvaluationLog(data_dir)
+        return log
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Append evaluations to the log and fold them into the running aggregates.")
+    parser.add_argument("--data-dir", default=None)
+    sub = parser.add_subparsers(dest="command", required=True)
+    append = sub.add_parser("append", help="append the evaluations of a YAML file in evaluation_scores.yaml format")
+    append.add_argument("source")
+    sub.add_parser("status", help="fold new records and print the running aggregates")
+    args = parser.parse_args(argv)
+
+    log = EvaluationLog(args.data_dir)
+    if args.command == "append":
+        count = log.append(data_loader._build_evaluations(data_loader._parse_yaml(args.source)))
+        print(f"Appended {count} evaluations to {log.path}")
+    aggregates = log.refresh()
+    print(json.dumps({"records": aggregates.records, "skipped": log.skipped, "offset": log.offset,
+                      "means": aggregates.means()}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+from utils.instrumentation import instrumentation
+
+
+class FigureCache:
+    # Process-wide LRU of built Plotly figures, keyed by a hash of the inputs.
+    # Saves building the figure, the expensive part; st.plotly_chart still
+    # serializes it on every render. Cached figures are shared between
+    # sessions and must not be mutated by callers. Bounded by entry count and
+    # by the figures' estimated size, their serialized JSON length measured
+    # once when they are built.
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Any, str, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_or_create(self, key: str, build: Callable[[], Any], kind: str = "figure"):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        with instrumentation.timer(f"figure.{kind}.build"):
+            fig = build()
+        size = self.estimate_size(fig)
+        with self._lock:
+            self.misses += 1
+            if key not in self._entries:
+                self._entries[key] = (fig, kind, size)
+                self._bytes += size
+                self._evict()
+        return fig
+
+    @staticmethod
+    def estimate_size(fig: Any) -> int:
+        # About what st.plotly_chart sends per render; the Python objects
+        # behind the figure are of the same order.
+        to_json = getattr(fig, "to_json", None)
+        return len(to_json()) if to_json else 0
+
+    def _evict(self):
+        # Keeps the newest entry even if it alone exceeds the byte budget.
+        while len(self._entries) > self.max_entries or (self._bytes > self.max_bytes and len(self._entries) > 1):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_kind: Dict[str, Dict[str, int]] = {}
+            for _, kind, size in self._entries.values():
+                totals = by_kind.setdefault(kind, {"entries": 0, "bytes": 0})
+                totals["entries"] += 1
+                totals["bytes"] += size
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "avg_entry_bytes": self._bytes // len(self._entries) if self._entries else 0,
+                "max_bytes": self.max_bytes,
+                "by_kind": by_kind,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+figure_cache = FigureCache()
@@ -0,0 +1,248 @@
+import argparse
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from utils import data_loader
+from utils.aggregation import PERCENTILES, ScoreSummary, build_score_matrix, summarize
+
+HISTORY_DIRNAME = "history"
+INDEX_FILENAME = "index.json"
+LOCK_FILENAME = ".lock"
+INDEX_FORMAT = 1
+# metric -> dtype; one .npy file each.
+METRICS = {"mean": np.float32, "median": np.float32, **{f"p{p}": np.float32 for p in PERCENTILES},
+           "count": np.int32}
+INITIAL_RUNS = 64
+COLUMN_SLACK = 16
+COPY_ROWS = 256
+
+
+def _fill_value(dtype) -> float:
+    return 0 if np.issubdtype(dtype, np.integer) else np.nan
+
+
+def _summary_values(summary: ScoreSummary) -> Dict[str, np.ndarray]:
+    values = {"mean": summary.mean, "median": summary.median, "count": summary.count}
+    values.update((f"p{p}", summary.percentiles[p]) for p in PERCENTILES)
+    # Columns without scores have no statistics rather than zeros.
+    missing = summary.count == 0
+    return {metric: (np.where(missing, np.nan, array) if metric != "count" else array)
+            for metric, array in values.items()}
+
+
+class HistoryStore:
+    # Aggregated scores of every evaluation run, one memory-mapped .npy file
+    # per metric laid out as (column, run): the history of one subcategory is
+    # a contiguous row, so series() is a zero-copy slice that only touches
+    # the pages it needs. index.json holds the columns and the run ids and
+    # timestamps; it is written last, so readers never see a partial run.
+    # Writers (the CLI and the precompute worker) hold an exclusive lock on
+    # the history directory; the dashboard only reads.
+    def __init__(self, path: str):
+        self.path = path
+        self.columns: List[Tuple[str, str]] = []
+        self.runs: List[Dict] = []
+        self._column_index: Dict[Tuple[str, str], int] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._signature = None
+        self._lock = threading.RLock()
+
+    def _index_path(self) -> str:
+        return os.path.join(self.path, INDEX_FILENAME)
+
+    def _metric_path(self, metric: str) -> str:
+        return os.path.join(self.path, f"{metric}.npy")
+
+    def exists(self) -> bool:
+        return os.path.exists(self._index_path())
+
+    def refresh(self):
+        # Picks up runs appended by other processes.
+        with self._lock:
+            try:
+                stat = os.stat(self._index_path())
+            except OSError:
+                return
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self._signature:
+                return
+            with open(self._index_path(), 'r') as file:
+                index = json.load(file)
+            if index.get("format") != INDEX_FORMAT:
+                return
+            self.columns = [tuple(column) for column in index["columns"]]
+            self._column_index = {column: i for i, column in enumerate(self.columns)}
+            self.runs = index["runs"]
+            self._arrays = {metric: np.load(self._metric_path(metric), mmap_mode="r") for metric in METRICS}
+            self._signature = signature
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        # fcntl is Unix-only; elsewhere only the in-process lock applies.
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            try:
+                import fcntl
+            except ImportError:
+                yield
+                return
+            with open(os.path.join(self.path, LOCK_FILENAME), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_index(self):
+        tmp_path = f"{self._index_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump({"format": INDEX_FORMAT, "columns": self.columns, "runs": self.runs}, file)
+        os.replace(tmp_path, self._index_path())
+
+    def _writable(self, metric: str, columns: int, runs: int) -> np.ndarray:
+        # Opens the metric file for writing, growing it (columns by a small
+        # slack, runs by doubling) when the new run doesn't fit.
+        dtype = METRICS[metric]
+        path = self._metric_path(metric)
+        old = open_memmap(path, mode="r+") if os.path.exists(path) else None
+        if old is not None and old.shape[0] >= columns and old.shape[1] >= runs:
+            return old
+        old_shape = old.shape if old is not None else (0, 0)
+        shape = (max(columns + COLUMN_SLACK, old_shape[0]), max(runs, old_shape[1] * 2, INITIAL_RUNS))
+        tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+        grown = open_memmap(tmp_path, mode="w+", dtype=dtype, shape=shape)
+        grown[:] = _fill_value(dtype)
+        for start in range(0, old_shape[0], COPY_ROWS):
+            grown[start:start + COPY_ROWS, :old_shape[1]] = old[start:start + COPY_ROWS]
+        grown.flush()
+        del grown, old
+        os.replace(tmp_path, path)
+        return open_memmap(path, mode="r+")
+
+    def append(self, run_id: str, summary: ScoreSummary, timestamp: Optional[str] = None,
+               evaluations: Optional[int] = None) -> int:
+        # Re-appending a known run id overwrites its column in place.
+        with self._write_lock():
+            return self._append(run_id, summary, timestamp, evaluations)
+
+    def _append(self, run_id: str, summary: ScoreSummary, timestamp: Optional[str],
+                evaluations: Optional[int]) -> int:
+        self.refresh()
+        for column in summary.columns:
+            if column not in self._column_index:
+                self._column_index[column] = len(self.columns)
+                self.columns.append(column)
+        run = next((i for i, r in enumerate(self.runs) if r["run_id"] == run_id), len(self.runs))
+        positions = np.asarray([self._column_index[c] for c in summary.columns], dtype=np.intp)
+        for metric, values in _summary_values(summary).items():
+            array = self._writable(metric, len(self.columns), run + 1)
+            array[:, run] = _fill_value(array.dtype)
+            array[positions, run] = values
+            array.flush()
+            del array
+        entry = {"run_id": run_id, "timestamp": timestamp or datetime.now().isoformat(timespec="seconds"),
+                 "evaluations": evaluations}
+        if run == len(self.runs):
+            self.runs.append(entry)
+        else:
+            self.runs[run] = entry
+        self._write_index()
+        self._signature = None
+        self.refresh()
+        return run
+
+    def run_ids(self) -> List[str]:
+        self.refresh()
+        return [r["run_id"] for r in self.runs]
+
+    def series(self, category: str, subcategory: str, metric: str = "mean") -> Optional[np.ndarray]:
+        # Read-only view into the memory map; no data is copied or read until
+        # the caller touches it.
+        self.refresh()
+        column = self._column_index.get((category, subcategory))
+        if column is None:
+            return None
+        return self._arrays[metric][column, :len(self.runs)]
+
+    def matrix(self, metric: str = "mean") -> np.ndarray:
+        self.refresh()
+        return self._arrays[metric][:len(self.columns), :len(self.runs)] if self.runs else np.empty((0, 0))
+
+    def sync(self, data_dir: Optional[str] = None) -> List[str]:
+        # Appends every evaluation run shard that isn't in the history yet,
+        # in run order. Shards already parsed by the dashboard are domain
+        # cache hits.
+        data_dir = data_dir or data_loader.DATA_DIR
+        added = []
+        with self._write_lock():
+            known = set(self.run_ids())
+            for shard_path in data_loader._shard_paths(data_loader._shard_dir("evaluation_scores.yaml", data_dir)):
+                run_id = data_loader._run_id(shard_path)
+                if run_id in known:
+                    continue
+                table = data_loader.domain_cache.get(
+                    shard_path, lambda path: data_loader._build_evaluations(data_loader._parse_yaml(path)))
+                if not len(table):
+                    continue
+                timestamp = datetime.fromtimestamp(os.path.getmtime(shard_path)).isoformat(timespec="seconds")
+                self._append(run_id, summarize(build_score_matrix(table)), timestamp, len(table))
+                added.append(run_id)
+        return added
+
+
+_stores: Dict[str, HistoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_history_store(data_dir: Optional[str] = None) -> HistoryStore:
+    path = os.path.join(data_dir or data_loader.DATA_DIR, HISTORY_DIRNAME)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = HistoryStore(path)
+        return store
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Record per-run evaluation aggregates in the score history.")
+    parser.add_argument("--data-dir", default=None)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("sync", help="append every evaluation run shard not yet in the history")
+    append = sub.add_parser("append", help="append one file in evaluation_scores.yaml format as a run")
+    append.add_argument("source")
+    append.add_argument("--run-id", default=None, help="defaults to the file name")
+    show = sub.add_parser("show", help="print the history of one subcategory")
+    show.add_argument("category")
+    show.add_argument("subcategory")
+    show.add_argument("--metric", choices=list(METRICS), default="mean")
+    args = parser.parse_args(argv)
+
+    store = get_history_store(args.data_dir)
+    if args.command == "sync":
+        added = store.sync(args.data_dir)
+        print(f"Added {len(added)} runs; history has {len(store.run_ids())} runs")
+    elif args.command == "append":
+        table = data_loader._build_evaluations(data_loader._parse_yaml(args.source))
+        run_id = args.run_id or data_loader._run_id(args.source)
+        store.append(run_id, summarize(build_score_matrix(table)), evaluations=len(table))
+        print(f"Recorded run {run_id} ({len(table)} evaluations)")
+    else:
+        values = store.series(args.category, args.subcategory, args.metric)
+        if values is None:
+            print(f"No history for {args.category} / {args.subcategory}", file=sys.stderr)
+            return 1
+        for run, value in zip(store.runs, values.tolist()):
+            print(f"{run['timestamp']}  {run['run_id']:30s} {round(value, 6)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from models.data_models import Insight, LLMResponse
+from utils import data_loader
+
+RISK_DECIMALS = 4
+# Versions kept per process; sessions still on an older data version reuse
+# theirs instead of forcing a rebuild.
+MAX_VERSIONS = 4
+
+
+class ReviewerGroups:
+    # Comments grouped by reviewer, built once per version of the insight
+    # files: comment counts, and the distinct (reviewer, question) pairs as
+    # codes into `question_ids`. Never modified after construction.
+    def __init__(self, insights: Sequence[Insight]):
+        reviewer_codes, question_codes = np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        reviewers, question_ids = np.zeros(0, dtype=str), np.zeros(0, dtype=str)
+        if insights:
+            reviewers, reviewer_codes = np.unique(
+                np.asarray([i.reviewer for i in insights], dtype=object).astype(str), return_inverse=True)
+            question_ids, question_codes = np.unique(
+                np.asarray([i.question_id for i in insights], dtype=object).astype(str), return_inverse=True)
+        self.reviewers: List[str] = reviewers.tolist()
+        self.question_ids = question_ids
+        self.comments = np.bincount(reviewer_codes, minlength=len(reviewers))
+        pairs = np.unique(reviewer_codes.astype(np.int64) * max(len(question_ids), 1) + question_codes)
+        self.pair_reviewers = (pairs // max(len(question_ids), 1)).astype(np.intp)
+        self.pair_questions = (pairs % max(len(question_ids), 1)).astype(np.intp)
+        self.questions = np.bincount(self.pair_reviewers, minlength=len(reviewers))
+
+
+class ReviewerAggregates:
+    # Per-reviewer comment count, number of questions covered and the average
+    # risk score of every response to those questions (persona and control
+    # responses alike). One immutable snapshot per (insights, responses)
+    # version; when only the responses change, the grouping is reused and
+    # just the risk join is redone.
+    def __init__(self, groups: ReviewerGroups, responses: Sequence[LLMResponse]):
+        self.reviewers = groups.reviewers
+        self.comments = groups.comments
+        self.questions = groups.questions
+        self.avg_risk = np.full(len(groups.reviewers), np.nan)
+        if not len(groups.question_ids) or not responses:
+            return
+        # Risk score sum and response count per reviewed question.
+        response_ids = np.asarray([r.question_id for r in responses], dtype=object).astype(str)
+        codes = np.minimum(np.searchsorted(groups.question_ids, response_ids), len(groups.question_ids) - 1)
+        reviewed = groups.question_ids[codes] == response_ids
+        risk = np.asarray([r.risk_score for r in responses], dtype=np.float64)
+        sums = np.bincount(codes[reviewed], weights=risk[reviewed], minlength=len(groups.question_ids))
+        counts = np.bincount(codes[reviewed], minlength=len(groups.question_ids))
+        reviewer_sums = np.bincount(groups.pair_reviewers, weights=sums[groups.pair_questions],
+                                    minlength=len(groups.reviewers))
+        reviewer_counts = np.bincount(groups.pair_reviewers, weights=counts[groups.pair_questions],
+                                      minlength=len(groups.reviewers))
+        scored = reviewer_counts > 0
+        self.avg_risk[scored] = np.round(reviewer_sums[scored] / reviewer_counts[scored], RISK_DECIMALS)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        # Most active reviewers first.
+        order = np.lexsort((np.arange(len(self.reviewers)), -self.comments))
+        return [{"Reviewer": self.reviewers[i],
+                 "Comments": int(self.comments[i]),
+                 "Questions covered": int(self.questions[i]),
+                 "Avg. risk score": None if np.isnan(self.avg_risk[i]) else float(self.avg_risk[i])}
+                for i in order.tolist()]
+
+
+_groups: "OrderedDict[Tuple, ReviewerGroups]" = OrderedDict()
+_aggregates: "OrderedDict[Tuple, ReviewerAggregates]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cached(cache: OrderedDict, key: Tuple, build):
+    value = cache.get(key)
+    if value is None:
+        value = cache[key] = build()
+        while len(cache) > MAX_VERSIONS:
+            cache.popitem(last=False)
+    cache.move_to_end(key)
+    return value
+
+
+def get_reviewer_aggregates(repo) -> ReviewerAggregates:
+    # The snapshot for the repository's data version, shared by every
+    # session on that version. Snapshots are replaced, never updated, so
+    # readers need no lock.
+    if not repo.version:
+        return ReviewerAggregates(ReviewerGroups(repo.insights), repo.responses)
+    path = os.path.abspath(repo.data_dir or data_loader.DATA_DIR)
+    insights_key = (path, data_loader.source_version(repo.version, "contributor_insights.yaml"))
+    key = (*insights_key, data_loader.source_version(repo.version, "llm_responses.yaml"))
+    with _cache_lock:
+        return _cached(_aggregates, key, lambda: ReviewerAggregates(
+            _cached(_groups, insights_key, lambda: ReviewerGroups(repo.insights)), repo.responses))
@@ -0,0 +1,115 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Deque, Dict, Optional
+
+_NULL_TIMER = nullcontext()
+
+
+class Instrumentation:
+    # Per-process timing registry. Each metric keeps a rolling window of recent
+    # durations (for p50/p95/p99) plus lifetime count and sum. When disabled,
+    # timers are a shared no-op context and decorated functions pay one
+    # attribute check.
+    def __init__(self, enabled: bool = False, window: int = 2048):
+        self.enabled = enabled
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._totals: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+                self._totals[name] = [0, 0.0]
+            samples.append(seconds)
+            totals = self._totals[name]
+            totals[0] += 1
+            totals[1] += seconds
+
+    def timer(self, name: str):
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timer(name)
+
+    @contextmanager
+    def _timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name: str) -> Callable:
+        def decorator(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            windows = {name: sorted(samples) for name, samples in self._samples.items()}
+            totals = {name: tuple(t) for name, t in self._totals.items()}
+        result = {}
+        for name, samples in sorted(windows.items()):
+            count, total = totals[name]
+            result[name] = {
+                "count": count,
+                "sum_s": total,
+                "p50_ms": _percentile(samples, 0.50) * 1000,
+                "p95_ms": _percentile(samples, 0.95) * 1000,
+                "p99_ms": _percentile(samples, 0.99) * 1000,
+                "max_ms": samples[-1] * 1000,
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+
+    def to_json(self) -> str:
+        return json.dumps({"pid": os.getpid(), "timestamp": time.time(), "metrics": self.stats()}, indent=2)
+
+    def to_prometheus(self, metric: str = "levels_timing_seconds") -> str:
+        lines = [f"# HELP {metric} Wall time of instrumented dashboard hot paths.", f"# TYPE {metric} summary"]
+        for name, s in self.stats().items():
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                lines.append(f'{metric}{{name="{label}",quantile="{quantile}"}} {s[key] / 1000:.9f}')
+            lines.append(f'{metric}_sum{{name="{label}"}} {s["sum_s"]:.9f}')
+            lines.append(f'{metric}_count{{name="{label}"}} {s["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str, fmt: Optional[str] = None) -> str:
+        fmt = fmt or ("prometheus" if path.endswith((".prom", ".txt")) else "json")
+        payload = self.to_prometheus() if fmt == "prometheus" else self.to_json()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as file:
+            file.write(payload)
+        os.replace(tmp_path, path)
+        return path
+
+
+def _percentile(sorted_samples, q: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(q * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+instrumentation = Instrumentation(enabled=os.environ.get("LEVELS_INSTRUMENTATION", "") not in ("", "0"))
@@ -0,0 +1,277 @@
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.data_models import Persona
+from utils import data_loader
+from utils.aggregation import GROUPINGS, PERCENTILES, ScoreSummary, persona_stats, question_groups, summarize
+
+AGGREGATES_FILENAME = ".aggregates.bin"
+MAGIC = b"LVLAGG\x00\x01"
+AGGREGATES_FORMAT = 1
+ALIGNMENT = 64
+# (grouping, label) of the summary over every evaluation.
+OVERALL = ("", "")
+
+
+def version_key(version: Tuple) -> str:
+    # data_version() tuples are built from relative names, (mtime, size)
+    # pairs, so every process on the same files computes the same key.
+    return hashlib.sha256(repr(version).encode()).hexdigest()
+
+
+def aggregates_path(data_dir: Optional[str] = None) -> str:
+    return os.path.join(data_dir or data_loader.DATA_DIR, AGGREGATES_FILENAME)
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def compute_aggregates(repo) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    # Everything the Evaluation Score and Personas tabs derive from the data:
+    # the score summary overall and per group of every grouping, persona
+    # bias metrics (including counterfactual ones) and the persona quick stats.
+    matrix = repo.score_matrix
+    groups = [OVERALL]
+    summaries = [repo.overall_summary]
+    for grouping in GROUPINGS:
+        for label, question_ids in question_groups(repo, grouping).items():
+            groups.append((grouping, label))
+            summaries.append(summarize(matrix, matrix.rows_for(question_ids)))
+    width = len(matrix.columns)
+    arrays = {
+        "count": np.asarray([s.count for s in summaries], dtype=np.int64).reshape(len(groups), width),
+        "mean": np.asarray([s.mean for s in summaries], dtype=np.float64).reshape(len(groups), width),
+        "median": np.asarray([s.median for s in summaries], dtype=np.float64).reshape(len(groups), width),
+    }
+    for p in PERCENTILES:
+        arrays[f"p{p}"] = np.asarray([s.percentiles[p] for s in summaries], dtype=np.float64).reshape(len(groups), width)
+    bias_keys = sorted({key for p in repo.personas for key in p.bias_metrics})
+    bias = np.full((len(repo.personas), len(bias_keys)), np.nan)
+    for row, persona in enumerate(repo.personas):
+        for column, key in enumerate(bias_keys):
+            if key in persona.bias_metrics:
+                bias[row, column] = persona.bias_metrics[key]
+    arrays["bias"] = bias
+    meta = {
+        "columns": matrix.columns,
+        "groups": groups,
+        "personas": [p.id for p in repo.personas],
+        "bias_keys": bias_keys,
+        "persona_stats": persona_stats(repo.personas),
+    }
+    return meta, arrays
+
+
+def write_aggregates(path: str, key: str, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+    # Layout: magic, header length, JSON header, then each array at a
+    # 64-byte aligned offset from the start of the data section. Written to
+    # a temporary file and renamed over the old one, so a reader sees either
+    # the previous file or the complete new one; mappings of the previous
+    # file stay valid until they are released.
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _align(offset + array.nbytes)
+    header = json.dumps({"format": AGGREGATES_FORMAT, "version_key": key,
+                         "created": datetime.now().isoformat(timespec="seconds"),
+                         "arrays": layout, **meta}, ensure_ascii=False).encode()
+    data_start = _align(len(MAGIC) + 8 + len(header))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(MAGIC + struct.pack("<Q", len(header)) + header)
+        for name, array in arrays.items():
+            file.seek(data_start + layout[name]["offset"])
+            file.write(array.tobytes())
+        file.truncate(data_start + offset)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+class PublishedAggregates:
+    # Read-only view of one published aggregates file. The arrays are
+    # numpy views into a shared memory map, so every server process on the
+    # host reads the same page-cache pages and nothing is copied.
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not an aggregates file")
+            (length,) = struct.unpack("<Q", file.read(8))
+            self.header = json.loads(file.read(length))
+        if self.header.get("format") != AGGREGATES_FORMAT:
+            raise ValueError(f"{path} has unsupported format {self.header.get('format')}")
+        self.version_key = self.header["version_key"]
+        self.columns = [tuple(c) for c in self.header["columns"]]
+        self.group_rows = {tuple(g): i for i, g in enumerate(self.header["groups"])}
+        self.persona_rows = {pid: i for i, pid in enumerate(self.header["personas"])}
+        self.persona_stats = self.header["persona_stats"]
+        data_start = _align(len(MAGIC) + 8 + length)
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        self.arrays = {name: np.ndarray(tuple(spec["shape"]), dtype=np.dtype(spec["dtype"]), buffer=self._map,
+                                        offset=data_start + spec["offset"])
+                       for name, spec in self.header["arrays"].items()}
+
+    def groups(self, grouping: str) -> List[str]:
+        return [label for g, label in self.group_rows if g == grouping]
+
+    def summary(self, grouping: Optional[str] = None, group: Optional[str] = None) -> Optional[ScoreSummary]:
+        row = self.group_rows.get(OVERALL if grouping is None else (grouping, group))
+        if row is None:
+            return None
+        return ScoreSummary(self.columns, self.arrays["count"][row], self.arrays["mean"][row],
+                            self.arrays["median"][row], {p: self.arrays[f"p{p}"][row] for p in PERCENTILES})
+
+    def apply_bias_metrics(self, personas: Sequence[Persona]) -> List[Persona]:
+        keys = self.header["bias_keys"]
+        bias = self.arrays["bias"]
+        result = []
+        for p in personas:
+            row = self.persona_rows.get(p.id)
+            if row is not None:
+                values = bias[row].tolist()
+                p = replace(p, bias_metrics={key: value for key, value in zip(keys, values) if value == value})
+            result.append(p)
+        return result
+
+
+class AggregateReader:
+    # Per-process cache of the published file of each data directory,
+    # reopened only when the worker replaces it.
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[int, int, int], Optional[PublishedAggregates]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, data_dir: Optional[str], key: str) -> Optional[PublishedAggregates]:
+        # None when nothing is published for exactly this data version; the
+        # caller then computes the aggregates itself.
+        path = aggregates_path(data_dir)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != signature:
+                try:
+                    published = PublishedAggregates(path)
+                except (OSError, ValueError, KeyError):
+                    published = None
+                entry = self._entries[path] = (signature, published)
+        published = entry[1]
+        if published is None or published.version_key != key:
+            return None
+        return published
+
+
+aggregate_reader = AggregateReader()
+
+
+def _yaml_changed(previous: Optional[Tuple], version: Tuple) -> bool:
+    if previous is None:
+        return True
+    top_level = lambda v: [entry for entry in v if entry[0] in data_loader.DOMAIN_FILES]
+    return top_level(previous) != top_level(version)
+
+
+def publish(data_dir: str, version: Optional[Tuple] = None) -> Optional[str]:
+    # Loads the data, computes the aggregates and publishes them. Returns
+    # None without publishing if the data changed while computing; the next
+    # pass picks up the newer version.
+    from utils.repository import load_repository
+
+    version = version if version is not None else data_loader.data_version(data_dir)
+    repo = load_repository(data_dir, version)
+    meta, arrays = compute_aggregates(repo)
+    if data_loader.data_version(data_dir) != version:
+        return None
+    path = aggregates_path(data_dir)
+    write_aggregates(path, version_key(version), meta, arrays)
+    return path
+
+
+def _sync_history(data_dir: str):
+    # The dashboard only reads the score history; new run shards are
+    # recorded here.
+    from utils.history_store import get_history_store
+    try:
+        added = get_history_store(data_dir).sync(data_dir)
+    except (OSError, ValueError) as e:
+        print(f"{data_dir}: score history not updated: {e}", file=sys.stderr)
+        return
+    if added:
+        print(f"{data_dir}: recorded {len(added)} runs in the score history", file=sys.stderr)
+
+
+def watch(data_dirs: Sequence[str], interval: float = 2.0, snapshot: bool = True, once: bool = False):
+    # Polls each data directory's data_version() and republishes when it
+    # changes. With `snapshot`, a change to the top-level YAML files also
+    # rebuilds the compiled snapshot the loaders read instead of the YAML.
+    # New evaluation run shards are added to the score history.
+    published: Dict[str, Tuple] = {}
+    while True:
+        for data_dir in data_dirs:
+            version = data_loader.data_version(data_dir)
+            previous = published.get(data_dir)
+            if version == previous:
+                continue
+            if snapshot and _yaml_changed(previous, version):
+                from utils.snapshot import build_snapshot
+                try:
+                    build_snapshot(data_dir)
+                except (OSError, ValueError) as e:
+                    print(f"{data_dir}: snapshot not rebuilt: {e}", file=sys.stderr)
+            _sync_history(data_dir)
+            if previous is None and aggregate_reader.get(data_dir, version_key(version)) is not None:
+                published[data_dir] = version
+                print(f"{data_dir}: aggregates are up to date", file=sys.stderr)
+                continue
+            start = time.perf_counter()
+            try:
+                path = publish(data_dir, version)
+            except (OSError, ValueError) as e:
+                # Left unpublished; retried on the next pass.
+                print(f"{data_dir}: publish failed: {e}", file=sys.stderr)
+                continue
+            if path is not None:
+                published[data_dir] = version
+                print(f"{data_dir}: published {path} in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+        if once:
+            return
+        time.sleep(interval)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Precompute the dashboard aggregates whenever the domain data changes and publish them "
+                    f"as <data dir>/{AGGREGATES_FILENAME} for the server processes to memory-map.")
+    parser.add_argument("data_dirs", nargs="*", help="data directories to watch (default: the dashboard's)")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between checks")
+    parser.add_argument("--once", action="store_true", help="publish if needed, then exit")
+    parser.add_argument("--no-snapshot", action="store_true", help="don't rebuild the compiled YAML snapshot")
+    args = parser.parse_args(argv)
+    data_dirs = [os.path.abspath(d) for d in args.data_dirs] or [os.path.abspath(data_loader.DATA_DIR)]
+    try:
+        watch(data_dirs, args.interval, snapshot=not args.no_snapshot, once=args.once)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+import argparse
+import base64
+import hashlib
+import html
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from utils import data_loader
+from utils.evaluation_log import get_evaluation_log
+from utils.repository import DomainRepository, load_repository
+from utils.visualization import create_bias_chart, create_radar_chart
+
+PLOTLYJS_FILENAME = "plotly.min.js"
+IMAGE_FORMATS = ("svg", "png")
+FIGURE_PLACEHOLDER = "<!--figure:{key}-->"
+IMAGE_MIME = {"svg": "image/svg+xml", "png": "image/png"}
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{head}
+<style>
+body {{ font-family: sans-serif; max-width: 1100px; margin: 2rem auto; color: #222; }}
+h1 {{ border-bottom: 2px solid #4393c3; padding-bottom: .3rem; }}
+section {{ margin-bottom: 3rem; }}
+.card {{ border: 1px solid #ddd; border-radius: 6px; padding: 1rem; margin-bottom: 1rem; }}
+.meta {{ color: #666; font-size: .9rem; }}
+.risk {{ display: inline-block; padding: .3rem .8rem; border-radius: 5px; color: white; font-weight: bold; }}
+.fix {{ background: #eef6fc; padding: .5rem; border-radius: 4px; }}
+.grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(320px, 1fr)); gap: 1rem; }}
+img {{ max-width: 100%; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p class="meta">{subtitle}</p>
+{body}
+</body>
+</html>
+"""
+
+
+@dataclass
+class ReportJob:
+    data_dir: str
+    run_id: Optional[str]
+    filename: str
+
+
+@dataclass
+class RenderedReport:
+    job: ReportJob
+    html: str
+    elapsed_s: float
+    # Figure JSON by key, filled in image mode; the HTML holds placeholders
+    # until the parent has rendered every report's figures in one batch.
+    figures: Dict[str, str] = field(default_factory=dict)
+
+
+def _esc(text: Optional[str]) -> str:
+    return html.escape(text or "")
+
+
+def _load_repository(data_dir: str, run_id: Optional[str]) -> DomainRepository:
+    # Each worker process keeps its domain_cache between jobs, so files
+    # shared by several reports (personas, questions, the monolithic files
+    # and shards of other runs) are parsed once per worker.
+    return load_repository(data_dir, run_id=run_id)
+
+
+def _personas_section(repo: DomainRepository, embed: Callable) -> str:
+    parts = ["<section><h2>Personas</h2>"]
+    if not repo.personas:
+        parts.append("<p>No personas found.</p>")
+    for persona in repo.personas:
+        parts.append(f'<div class="card"><h3>{_esc(persona.name)}</h3><p><b>{_esc(persona.title)}</b></p>'
+                     f'<p class="meta">Gender: {_esc(persona.gender)} &middot; Nationality: {_esc(persona.origin)}'
+                     f' &middot; Education: {_esc(persona.education.split(" from ")[0])}</p>')
+        bias_data = {k: v for k, v in persona.bias_metrics.items() if k != 'other_bias'}
+        if bias_data:
+            parts.append("<h4>Bias Analysis</h4>" + embed(create_bias_chart(bias_data)))
+        parts.append(f"<h4>Control Comparison</h4><p>{_esc(persona.control_comparison)}</p>")
+        questions = repo.questions_for_persona(persona.id)
+        if questions:
+            parts.append("<h4>Associated Questions</h4><ul>")
+            parts.extend(f"<li><b>{_esc(q.id)}:</b> {_esc(q.question_text)}</li>" for q in questions)
+            parts.append("</ul>")
+        parts.append("</div>")
+    parts.append("</section>")
+    return "".join(parts)
+
+
+def _responses_section(repo: DomainRepository) -> str:
+    parts = ["<section><h2>LLM Outputs</h2>"]
+    if not repo.responses:
+        parts.append("<p>No LLM Outputs found.</p>")
+    for response in repo.responses:
+        question = repo.question(response.question_id)
+        q_text = question.question_text if question else "Question text not found"
+        risk_percent = response.risk_score * 100
+        color = "green" if risk_percent < 25 else "orange" if risk_percent < 50 else "red"
+        persona = f" &middot; Persona: {_esc(response.persona_id)}" if response.persona_id else ""
+        parts.append(f'<div class="card"><h3>Question ID: {_esc(response.question_id)}{persona}</h3>'
+                     f"<p><b>Question:</b> {_esc(q_text)}</p>"
+                     f"<p><b>Response:</b> {_esc(response.response_text)}</p>"
+                     f"<p><b>Risk Flags:</b> {_esc(', '.join(response.risk_flags))}</p>"
+                     f'<span class="risk" style="background-color:{color}">Risk Score {risk_percent:.1f}%</span>')
+        if response.suggested_fix:
+            parts.append(f'<p class="fix"><b>Suggested Fix:</b> {_esc(response.suggested_fix)}</p>')
+        parts.append("</div>")
+    parts.append("</section>")
+    return "".join(parts)
+
+
+def _evaluations_section(repo: DomainRepository, embed: Callable, log_dir: Optional[str]) -> str:
+    parts = ["<section><h2>Evaluation Score</h2>"]
+    avg_scores = repo.overall_summary.averages()
+    all_categories = repo.score_matrix.categories()
+    if log_dir is not None:
+        evaluation_log = get_evaluation_log(log_dir)
+        if evaluation_log.exists():
+            aggregates = evaluation_log.refresh()
+            if aggregates.records:
+                avg_scores, all_categories = aggregates.merge(repo.overall_summary)
+                parts.append(f'<p class="meta">Includes {aggregates.records} evaluations from the appended '
+                             f"evaluation log.</p>")
+    if not all_categories:
+        parts.append("<p>No evaluations found.</p>")
+    else:
+        parts.append('<div class="grid">')
+        for category, subcategories in all_categories.items():
+            values = [avg_scores[category][sub] for sub in subcategories]
+            parts.append(f"<div>{embed(create_radar_chart(values, subcategories, category))}</div>")
+        parts.append("</div>")
+    parts.append("</section>")
+    return "".join(parts)
+
+
+def render_report(job: ReportJob, images: bool = False) -> RenderedReport:
+    start = time.perf_counter()
+    repo = _load_repository(job.data_dir, job.run_id)
+    figures: Dict[str, str] = {}
+
+    def embed(fig) -> str:
+        if images:
+            fig_json = fig.to_json()
+            key = hashlib.sha256(fig_json.encode("utf-8")).hexdigest()
+            figures[key] = fig_json
+            return FIGURE_PLACEHOLDER.format(key=key)
+        return pio.to_html(fig, full_html=False, include_plotlyjs=False)
+
+    name = os.path.basename(os.path.normpath(job.data_dir))
+    title = f"Compliance report: {name}" + (f" / {job.run_id}" if job.run_id else "")
+    body = (_personas_section(repo, embed) + _responses_section(repo)
+            + _evaluations_section(repo, embed, log_dir=job.data_dir if job.run_id is None else None))
+    head = "" if images else f'<script src="{PLOTLYJS_FILENAME}"></script>'
+    subtitle = (f"{len(repo.personas)} personas &middot; {len(repo.responses)} responses &middot; "
+                f"{len(repo.evaluations)} evaluations &middot; generated "
+                f"{datetime.now().isoformat(timespec='seconds')}")
+    page = PAGE_TEMPLATE.format(title=_esc(title), head=head, subtitle=subtitle, body=body)
+    return RenderedReport(job, page, time.perf_counter() - start, figures)
+
+
+def render_images(figures: Dict[str, str], fmt: str) -> Dict[str, str]:
+    # One kaleido call for every unique figure across all reports; starting
+    # the renderer dominates the cost of exporting a single figure.
+    keys = list(figures)
+    with tempfile.TemporaryDirectory(prefix="levels_report_") as tmp_dir:
+        paths = [os.path.join(tmp_dir, f"{key}.{fmt}") for key in keys]
+        pio.write_images([json.loads(figures[key]) for key in keys], paths, format=fmt)
+        uris = {}
+        for key, path in zip(keys, paths):
+            with open(path, 'rb') as file:
+                encoded = base64.b64encode(file.read()).decode("ascii")
+            uris[key] = f'<img alt="figure" src="data:{IMAGE_MIME[fmt]};base64,{encoded}">'
+    return uris
+
+
+def plan_jobs(data_dirs: List[str], per_run: bool) -> List[ReportJob]:
+    jobs = []
+    taken = set()
+    for data_dir in data_dirs:
+        data_dir = os.path.abspath(data_dir)
+        runs: List[Optional[str]] = [None]
+        if per_run:
+            shard_runs = set(data_loader.list_runs("llm_responses.yaml", data_dir))
+            shard_runs.update(data_loader.list_runs("evaluation_scores.yaml", data_dir))
+            runs = sorted(shard_runs) or [None]
+        for run_id in runs:
+            base = os.path.basename(os.path.normpath(data_dir)) + (f"-{run_id}" if run_id else "")
+            filename, suffix = f"{base}.html", 2
+            while filename in taken:
+                filename, suffix = f"{base}-{suffix}.html", suffix + 1
+            taken.add(filename)
+            jobs.append(ReportJob(data_dir, run_id, filename))
+    return jobs
+
+
+def _write_index(output_dir: str, reports: List[RenderedReport]):
+    rows = "".join(f'<li><a href="{_esc(r.job.filename)}">{_esc(r.job.filename)}</a> '
+                   f'<span class="meta">({r.elapsed_s:.2f} s)</span></li>' for r in reports)
+    page = PAGE_TEMPLATE.format(title="Compliance reports", head="", body=f"<ul>{rows}</ul>",
+                                subtitle=f"{len(reports)} reports")
+    with open(os.path.join(output_dir, "index.html"), 'w', encoding='utf-8') as file:
+        file.write(page)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render the Personas, LLM Outputs and Evaluation Score sections "
+                                                 "of one or more datasets as static HTML reports.")
+    parser.add_argument("data_dirs", nargs="*", help="dataset directories; defaults to the app's domain_data")
+    parser.add_argument("--output-dir", default="reports")
+    parser.add_argument("--per-run", action="store_true",
+                        help="one report per run shard (model version) instead of one per dataset")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--images", choices=IMAGE_FORMATS, default=None,
+                        help="embed static images instead of interactive figures (needs kaleido)")
+    args = parser.parse_args(argv)
+    if args.images and importlib.util.find_spec("kaleido") is None:
+        parser.error("--images needs the kaleido package (pip install kaleido)")
+
+    start = time.perf_counter()
+    jobs = plan_jobs(args.data_dirs or [data_loader.DATA_DIR], args.per_run)
+    render = partial(render_report, images=args.images is not None)
+    if args.workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(jobs))) as pool:
+            reports = list(pool.map(render, jobs))
+    else:
+        reports = [render(job) for job in jobs]
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    if args.images:
+        figures: Dict[str, str] = {}
+        for report in reports:
+            figures.update(report.figures)
+        uris = render_images(figures, args.images)
+        for report in reports:
+            for key in report.figures:
+                report.html = report.html.replace(FIGURE_PLACEHOLDER.format(key=key), uris[key])
+    else:
+        with open(os.path.join(args.output_dir, PLOTLYJS_FILENAME), 'w', encoding='utf-8') as file:
+            file.write(get_plotlyjs())
+    for report in reports:
+        with open(os.path.join(args.output_dir, report.job.filename), 'w', encoding='utf-8') as file:
+            file.write(report.html)
+    _write_index(args.output_dir, reports)
+    print(f"Wrote {len(reports)} reports to {args.output_dir} in {time.perf_counter() - start:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
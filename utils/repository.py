@@ -0,0 +1,284 @@
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from models.data_models import Persona, Question, LLMResponse, Insight
+from models.evaluation_table import EvaluationTable
+from utils.data_loader import (
+    data_version, list_runs, load_personas, load_questions, load_llm_responses, load_evaluations, load_insights
+)
+
+# Sort orders offered by the paginated list views, keyed by name.
+RESPONSE_SORTS = ("position", "risk_desc", "risk_asc", "flag", "category")
+QUESTION_SORTS = ("position", "id", "category", "risk_desc")
+
+
+def _ranks(values: Sequence[str]) -> np.ndarray:
+    # Dense rank of each value in sorted order, for use as a lexsort key.
+    return np.unique(np.asarray(values, dtype=object).astype(str), return_inverse=True)[1].reshape(-1)
+
+
+def _positions(keys: Sequence[Sequence[str]]) -> Dict[str, np.ndarray]:
+    # key -> ascending positions of the records carrying that key.
+    found: Dict[str, List[int]] = {}
+    for position, record_keys in enumerate(keys):
+        for key in record_keys:
+            found.setdefault(key, []).append(position)
+    return {key: np.asarray(positions, dtype=np.intp) for key, positions in found.items()}
+
+
+class RecordIndex:
+    # Sort orders and filter positions over one list of records, built once
+    # per data version. select() is a few vectorised numpy operations, so a
+    # page view costs the same however many records the dataset holds.
+    def __init__(self, size: int, orders: Dict[str, np.ndarray], filters: Dict[str, Dict[str, np.ndarray]]):
+        self.size = size
+        self.orders = orders
+        self.filters = filters
+
+    def select(self, sort: str = "position", **selected) -> np.ndarray:
+        # Record positions in `sort` order. Each filter takes a value or a
+        # list of values; a record matches a list if it carries any of them.
+        order = self.orders[sort]
+        mask = None
+        for name, values in selected.items():
+            if values is None or (not isinstance(values, str) and not values):
+                continue
+            positions = self.filters[name]
+            matched = np.zeros(self.size, dtype=bool)
+            for value in [values] if isinstance(values, str) else values:
+                if value in positions:
+                    matched[positions[value]] = True
+            mask = matched if mask is None else mask & matched
+        return order if mask is None else order[mask[order]]
+
+
+class DomainRepository:
+    # Indexed view over one version of the domain data. Built once per data
+    # version and shared by all sessions, so components do dict lookups
+    # instead of scanning (and re-loading) lists while rendering.
+    def __init__(self, personas: List[Persona], questions: List[Question], responses: List[LLMResponse],
+                 evaluations: EvaluationTable, insights: List[Insight], version: Tuple = (),
+                 data_dir: Optional[str] = None):
+        self.version = version
+        self.data_dir = data_dir
+        self._version_key = None
+        if any(r.persona_id is not None for r in responses):
+            # Paired persona/control responses exist: derive bias_metrics from
+            # them, unless the precompute worker already has.
+            published = self.published()
+            if published is not None:
+                personas = published.apply_bias_metrics(personas)
+            else:
+                from utils.counterfactual import apply_counterfactual_metrics
+                personas = apply_counterfactual_metrics(personas, responses, data_dir=data_dir)
+        self.personas = personas
+        self.questions = questions
+        self.responses = responses
+        self.evaluations = evaluations
+        self.insights = insights
+
+        self.questions_by_id: Dict[str, Question] = {}
+        self.questions_by_category: Dict[str, List[Question]] = {}
+        self.questions_by_subcategory: Dict[Tuple[str, str], List[Question]] = {}
+        for q in questions:
+            self.questions_by_id.setdefault(q.id, q)
+            self.questions_by_category.setdefault(q.category, []).append(q)
+            self.questions_by_subcategory.setdefault((q.category, q.subcategory), []).append(q)
+
+        # First response per question wins, matching the previous next(...) lookups.
+        self.responses_by_question: Dict[str, LLMResponse] = {}
+        # Persona-tagged responses; later ones (newer runs) replace earlier
+        # ones, as in counterfactual.pair_responses.
+        self.responses_by_persona: Dict[Tuple[str, str], LLMResponse] = {}
+        self._untagged_responses: Dict[str, LLMResponse] = {}
+        risk_flags = set()
+        for r in responses:
+            self.responses_by_question.setdefault(r.question_id, r)
+            if r.persona_id is None:
+                self._untagged_responses.setdefault(r.question_id, r)
+            else:
+                self.responses_by_persona[(r.question_id, r.persona_id)] = r
+            risk_flags.update(r.risk_flags)
+        self.risk_flags: List[str] = sorted(risk_flags)
+
+        self.insights_by_question: Dict[str, List[Insight]] = {}
+        for i in insights:
+            self.insights_by_question.setdefault(i.question_id, []).append(i)
+
+        self.questions_by_persona: Dict[str, List[Question]] = {}
+        for p in personas:
+            self.questions_by_persona[p.id] = [
+                self.questions_by_id[q_id] for q_id in p.questions_associated if q_id in self.questions_by_id
+            ]
+
+        self.categories: List[str] = sorted(self.questions_by_category)
+        self._score_matrix = None
+        self._overall_summary = None
+        self._group_summaries: Dict[Tuple[str, str], object] = {}
+        self._persona_stats = None
+        self._response_index = None
+        self._question_index = None
+
+    @property
+    def score_matrix(self):
+        # Built lazily: only the Evaluation Score views need it.
+        if self._score_matrix is None:
+            from utils.aggregation import build_score_matrix
+            self._score_matrix = build_score_matrix(self.evaluations)
+        return self._score_matrix
+
+    def published(self):
+        # Aggregates published by the precompute worker for exactly this data
+        # version, or None.
+        if not self.version:
+            return None
+        from utils.precompute import aggregate_reader, version_key
+        if self._version_key is None:
+            self._version_key = version_key(self.version)
+        return aggregate_reader.get(self.data_dir, self._version_key)
+
+    @property
+    def overall_summary(self):
+        if self._overall_summary is None:
+            published = self.published()
+            if published is not None:
+                return published.summary()
+            from utils.aggregation import summarize
+            self._overall_summary = summarize(self.score_matrix)
+        return self._overall_summary
+
+    def group_summary(self, grouping: str, group: str):
+        # Summary of one utils.aggregation.question_groups() group; None when
+        # the group has no questions in this data.
+        published = self.published()
+        if published is not None:
+            return published.summary(grouping, group)
+        key = (grouping, group)
+        if key not in self._group_summaries:
+            from utils.aggregation import question_groups, summarize
+            question_ids = question_groups(self, grouping).get(group)
+            self._group_summaries[key] = None if question_ids is None else \
+                summarize(self.score_matrix, self.score_matrix.rows_for(question_ids))
+        return self._group_summaries[key]
+
+    def persona_stats(self) -> Dict:
+        published = self.published()
+        if published is not None:
+            return published.persona_stats
+        if self._persona_stats is None:
+            from utils.aggregation import persona_stats
+            self._persona_stats = persona_stats(self.personas)
+        return self._persona_stats
+
+    @property
+    def response_index(self) -> RecordIndex:
+        if self._response_index is None:
+            risk = np.asarray([r.risk_score for r in self.responses], dtype=np.float64)
+            topics = [self.questions_by_id.get(r.question_id) for r in self.responses]
+            categories = [q.category if q else "" for q in topics]
+            # Responses without flags sort after every flagged one.
+            first_flags = [min(r.risk_flags) if r.risk_flags else "\uffff" for r in self.responses]
+            reviewers = {qid: sorted({i.reviewer for i in insights})
+                         for qid, insights in self.insights_by_question.items()}
+            self._response_index = RecordIndex(len(self.responses), {
+                "position": np.arange(len(self.responses), dtype=np.intp),
+                "risk_desc": np.argsort(-risk, kind="stable"),
+                "risk_asc": np.argsort(risk, kind="stable"),
+                "flag": np.lexsort((-risk, _ranks(first_flags))),
+                "category": np.lexsort((-risk, _ranks(categories))),
+            }, {
+                "flag": _positions([r.risk_flags for r in self.responses]),
+                "category": _positions([[c] for c in categories]),
+                "reviewer": _positions([reviewers.get(r.question_id, ()) for r in self.responses]),
+            })
+        return self._response_index
+
+    @property
+    def question_index(self) -> RecordIndex:
+        if self._question_index is None:
+            questions = self.questions
+            ids = _ranks([q.id for q in questions])
+            # Questions without a response sort last.
+            risk = np.asarray([getattr(self.responses_by_question.get(q.id), "risk_score", -1.0) for q in questions],
+                              dtype=np.float64)
+            self._question_index = RecordIndex(len(questions), {
+                "position": np.arange(len(questions), dtype=np.intp),
+                "id": np.argsort(ids, kind="stable"),
+                "category": np.lexsort((ids, _ranks([q.subcategory for q in questions]),
+                                        _ranks([q.category for q in questions]))),
+                "risk_desc": np.lexsort((ids, -risk)),
+            }, {
+                "category": _positions([[q.category] for q in questions]),
+                "subcategory": _positions([[q.subcategory] for q in questions]),
+            })
+        return self._question_index
+
+    def question(self, question_id: str) -> Optional[Question]:
+        return self.questions_by_id.get(question_id)
+
+    def response(self, question_id: str) -> Optional[LLMResponse]:
+        return self.responses_by_question.get(question_id)
+
+    def response_for(self, question_id: str, persona_id: str, control_id: str
+                     ) -> Tuple[Optional[LLMResponse], bool]:
+        # The persona's own response, else the control candidate's, else an
+        # untagged one. The flag tells whether it is tagged with the persona.
+        response = self.responses_by_persona.get((question_id, persona_id))
+        if response is not None:
+            return response, True
+        response = self.responses_by_persona.get((question_id, control_id))
+        if response is None:
+            response = self._untagged_responses.get(question_id)
+        return response, False
+
+    def insights_for(self, question_id: str) -> List[Insight]:
+        return self.insights_by_question.get(question_id, [])
+
+    def questions_for_persona(self, persona_id: str) -> List[Question]:
+        return self.questions_by_persona.get(persona_id, [])
+
+    def subcategories(self, category: str) -> List[str]:
+        return sorted({q.subcategory for q in self.questions_by_category.get(category, [])})
+
+    def questions_in(self, category: Optional[str] = None, subcategory: Optional[str] = None) -> List[Question]:
+        if category is None:
+            return self.questions
+        if subcategory is None:
+            return self.questions_by_category.get(category, [])
+        return self.questions_by_subcategory.get((category, subcategory), [])
+
+
+def load_repository(data_dir: Optional[str] = None, version: Optional[Tuple] = None,
+                    run_id: Optional[str] = None) -> DomainRepository:
+    # With `run_id`, the response and evaluation shards of every other run
+    # are left out.
+    skip_responses = skip_evaluations = None
+    if run_id is not None:
+        skip_responses = [r for r in list_runs("llm_responses.yaml", data_dir) if r != run_id]
+        skip_evaluations = [r for r in list_runs("evaluation_scores.yaml", data_dir) if r != run_id]
+    return DomainRepository(
+        load_personas(data_dir),
+        load_questions(data_dir),
+        load_llm_responses(skip_responses, data_dir),
+        load_evaluations(skip_evaluations, data_dir),
+        load_insights(data_dir),
+        version=version if version is not None else data_version(data_dir, run_id),
+        data_dir=data_dir,
+    )
+
+
+_repository: Optional[DomainRepository] = None
+_repository_lock = threading.Lock()
+
+
+def get_repository() -> DomainRepository:
+    global _repository
+    version = data_version()
+    repo = _repository
+    if repo is not None and repo.version == version:
+        return repo
+    with _repository_lock:
+        if _repository is None or _repository.version != version:
+            _repository = load_repository(version=version)
+        return _repository
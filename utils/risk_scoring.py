@@ -0,0 +1,155 @@
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+from models.data_models import LLMResponse
+from utils import data_loader
+
+LEXICON_FILENAME = "risk_lexicons.yaml"
+# The CLI leaves the hand-written response files alone unless told otherwise.
+DEFAULT_OUTPUT_DIR = "scored_responses"
+
+
+class RiskScorer:
+    # All category and modifier patterns are compiled into one alternation with
+    # a named group per lexicon entry, so each response is scanned once. Match
+    # counts are collected into an (n_responses x n_lexicons) matrix and the
+    # scores are computed for the whole batch with NumPy.
+    def __init__(self, config: dict):
+        self.flag_threshold = float(config.get("flag_threshold", 0.3))
+        self.categories: List[str] = list(config.get("categories", {}))
+        modifiers = config.get("modifiers", {})
+        self.hedging_weight = float(modifiers.get("hedging", {}).get("weight", 0.0))
+        lexicons = [(name, spec) for name, spec in config.get("categories", {}).items()]
+        if "hedging" in modifiers:
+            lexicons.append(("hedging", modifiers["hedging"]))
+        self.lexicon_names = [name for name, _ in lexicons]
+        self.weights = np.array([float(spec.get("weight", 0.0)) for _, spec in lexicons[:len(self.categories)]])
+        groups = []
+        for index, (_, spec) in enumerate(lexicons):
+            patterns = "|".join(f"(?:{p})" for p in spec.get("patterns", []))
+            if patterns:
+                groups.append(f"(?P<g{index}>{patterns})")
+        self._pattern = re.compile(r"\b(?:" + "|".join(groups) + r")\b", re.IGNORECASE) if groups else None
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None, data_dir: Optional[str] = None) -> "RiskScorer":
+        with open(path or lexicon_path(data_dir), 'r') as file:
+            return cls(yaml.safe_load(file) or {})
+
+    def count_matches(self, texts: Sequence[str]) -> np.ndarray:
+        counts = np.zeros((len(texts), len(self.lexicon_names)), dtype=np.int32)
+        if self._pattern is None:
+            return counts
+        finditer = self._pattern.finditer
+        for row, text in enumerate(texts):
+            for match in finditer(text or ""):
+                counts[row, int(match.lastgroup[1:])] += 1
+        return counts
+
+    def score_counts(self, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        n_categories = len(self.categories)
+        category_hits = counts[:, :n_categories].astype(np.float64)
+        hedges = counts[:, n_categories] if counts.shape[1] > n_categories else np.zeros(len(counts))
+        # Hedging only amplifies categories that already matched.
+        raw = category_hits * self.weights + (category_hits > 0) * (hedges[:, None] * self.hedging_weight)
+        category_scores = 1.0 - np.exp(-raw)
+        risk = category_scores.max(axis=1) if n_categories else np.zeros(len(counts))
+        return category_scores, np.round(risk, 2)
+
+    def score_texts(self, texts: Sequence[str]) -> List[Tuple[List[str], float]]:
+        category_scores, risk = self.score_counts(self.count_matches(texts))
+        flagged = category_scores >= self.flag_threshold
+        return [([c for c, hit in zip(self.categories, row) if hit], float(score))
+                for row, score in zip(flagged.tolist(), risk.tolist())]
+
+    def score_responses(self, responses: Sequence[LLMResponse]) -> List[LLMResponse]:
+        results = self.score_texts([r.response_text for r in responses])
+        return [replace(r, risk_flags=flags, risk_score=score) for r, (flags, score) in zip(responses, results)]
+
+
+def lexicon_path(data_dir: Optional[str] = None) -> str:
+    # The active dataset's lexicon; datasets without one use the bundled file.
+    return data_loader.settings_path(LEXICON_FILENAME, data_dir)
+
+
+_worker_scorer: Optional[RiskScorer] = None
+
+
+def _init_worker(config: dict):
+    global _worker_scorer
+    _worker_scorer = RiskScorer(config)
+
+
+def _score_chunk(texts: List[str]) -> List[Tuple[List[str], float]]:
+    return _worker_scorer.score_texts(texts)
+
+
+def score_parallel(texts: Sequence[str], config: dict, workers: Optional[int] = None,
+                   chunk_size: int = 2000) -> List[Tuple[List[str], float]]:
+    # Each worker compiles the matcher once; texts are shipped in chunks.
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(texts) <= chunk_size:
+        return RiskScorer(config).score_texts(texts)
+    chunks = [list(texts[i:i + chunk_size]) for i in range(0, len(texts), chunk_size)]
+    results: List[Tuple[List[str], float]] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config,)) as pool:
+        for chunk_result in pool.map(_score_chunk, chunks):
+            results.extend(chunk_result)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Recompute risk_flags and risk_score for LLM responses and write "
+                                                 "the scored copies to --output-dir.")
+    parser.add_argument("files", nargs="+", help="response YAML files (llm_responses.yaml or run shards)")
+    parser.add_argument("--lexicon", default=None, help="default: the data directory's, else the bundled one")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR,
+                        help="where the scored files are written, under their own names")
+    parser.add_argument("--in-place", action="store_true",
+                        help="rewrite the input files instead; drops their comments and formatting")
+    parser.add_argument("--dry-run", action="store_true", help="print changes instead of writing any files")
+    args = parser.parse_args(argv)
+
+    with open(args.lexicon or lexicon_path(), 'r') as file:
+        config = yaml.safe_load(file) or {}
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    for path in args.files:
+        with open(path, 'r') as file:
+            data = yaml.load(file, Loader=loader) or {}
+        records = data.get("responses") or []
+        results = score_parallel([r.get("response_text", "") for r in records], config, args.workers)
+        changed = 0
+        for record, (flags, score) in zip(records, results):
+            if record.get("risk_flags") != flags or record.get("risk_score") != score:
+                changed += 1
+                if args.dry_run:
+                    print(f"{path}: {record.get('question_id')}: {record.get('risk_flags')} "
+                          f"{record.get('risk_score')} -> {flags} {score}")
+            record["risk_flags"], record["risk_score"] = flags, score
+        target = path if args.in_place else os.path.join(args.output_dir, os.path.basename(path))
+        if not args.dry_run:
+            if os.path.abspath(target) == os.path.abspath(path) and not args.in_place:
+                print(f"{path}: not overwritten; pass --in-place to rewrite it", file=sys.stderr)
+                return 1
+            os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+            tmp_path = target + ".tmp"
+            with open(tmp_path, 'w') as file:
+                yaml.dump(data, file, Dumper=dumper, sort_keys=False, allow_unicode=True)
+            os.replace(tmp_path, target)
+        print(f"{path}: scored {len(records)} responses, {changed} changed"
+              + ("" if args.dry_run else f", written to {target}"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
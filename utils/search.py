@@ -0,0 +1,234 @@
+import bisect
+import math
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from utils import data_loader
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+MAX_PREFIX_EXPANSION = 64
+
+# Searchable document kinds, one per text field.
+KINDS = ("question", "response", "suggested_fix", "insight")
+
+# Source -> (kinds it produces, domain file it is built from)
+SOURCES = {
+    "questions": (("question",), "questions.yaml"),
+    "responses": (("response", "suggested_fix"), "llm_responses.yaml"),
+    "insights": (("insight",), "contributor_insights.yaml"),
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+@dataclass
+class Document:
+    kind: str
+    question_id: str
+    text: str
+    label: str = ""
+
+
+@dataclass
+class SearchHit:
+    document: Document
+    score: float
+
+
+class SearchIndex:
+    # Inverted index with BM25 ranking. Postings are kept as dicts so sources
+    # can be replaced incrementally, and compiled lazily into NumPy arrays per
+    # term so a query scores all matching documents in a few vector ops.
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self.documents: List[Optional[Document]] = []
+        self._doc_terms: List[Optional[Counter]] = []
+        self._doc_len: List[int] = []
+        self._free: List[int] = []
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._compiled: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._vocabulary: Optional[List[str]] = None
+        self._source_docs: Dict[str, List[int]] = {}
+        self._source_versions: Dict[str, Tuple] = {}
+        self._total_len = 0
+        self._live = 0
+        self._arrays = None
+        # question_id -> risk flags / (category, subcategory), for filters
+        self.flags_by_question: Dict[str, Set[str]] = {}
+        self.topic_by_question: Dict[str, Tuple[str, str]] = {}
+        self._lock = threading.RLock()
+
+    def _add(self, doc: Document) -> int:
+        terms = Counter(tokenize(doc.text))
+        if self._free:
+            doc_id = self._free.pop()
+            self.documents[doc_id] = doc
+            self._doc_terms[doc_id] = terms
+            self._doc_len[doc_id] = sum(terms.values())
+        else:
+            doc_id = len(self.documents)
+            self.documents.append(doc)
+            self._doc_terms.append(terms)
+            self._doc_len.append(sum(terms.values()))
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._vocabulary = None
+            postings[doc_id] = tf
+            self._compiled.pop(term, None)
+        self._total_len += self._doc_len[doc_id]
+        self._live += 1
+        return doc_id
+
+    def _remove(self, doc_id: int):
+        for term in self._doc_terms[doc_id]:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                self._vocabulary = None
+            self._compiled.pop(term, None)
+        self._total_len -= self._doc_len[doc_id]
+        self._live -= 1
+        self.documents[doc_id] = None
+        self._doc_terms[doc_id] = None
+        self._doc_len[doc_id] = 0
+        self._free.append(doc_id)
+
+    def replace_source(self, source: str, documents: Iterable[Document], version: Tuple = ()):
+        with self._lock:
+            for doc_id in self._source_docs.pop(source, []):
+                self._remove(doc_id)
+            self._source_docs[source] = [self._add(doc) for doc in documents]
+            self._source_versions[source] = version
+            self._arrays = None
+
+    def source_version(self, source: str) -> Optional[Tuple]:
+        return self._source_versions.get(source)
+
+    def _ensure_arrays(self):
+        if self._arrays is None:
+            question_codes: Dict[str, int] = {}
+            codes = np.empty(len(self.documents), dtype=np.int32)
+            kinds = np.empty(len(self.documents), dtype=np.int8)
+            alive = np.zeros(len(self.documents), dtype=bool)
+            for doc_id, doc in enumerate(self.documents):
+                if doc is None:
+                    codes[doc_id], kinds[doc_id] = -1, -1
+                    continue
+                codes[doc_id] = question_codes.setdefault(doc.question_id, len(question_codes))
+                kinds[doc_id] = KINDS.index(doc.kind)
+                alive[doc_id] = True
+            doc_len = np.asarray(self._doc_len, dtype=np.float32)
+            self._arrays = (question_codes, codes, kinds, alive, doc_len)
+        return self._arrays
+
+    def _term_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        compiled = self._compiled.get(term)
+        if compiled is None:
+            postings = self._postings[term]
+            compiled = (np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                        np.fromiter(postings.values(), dtype=np.float32, count=len(postings)))
+            self._compiled[term] = compiled
+        return compiled
+
+    def expand(self, token: str, prefix: bool) -> List[str]:
+        if not prefix:
+            return [token] if token in self._postings else []
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        start = bisect.bisect_left(self._vocabulary, token)
+        end = bisect.bisect_left(self._vocabulary, token + "\uffff")
+        return self._vocabulary[start:min(end, start + MAX_PREFIX_EXPANSION)]
+
+    def _question_mask(self, question_codes: Dict[str, int], codes: np.ndarray, question_ids: Iterable[str]) -> np.ndarray:
+        wanted = [question_codes[qid] for qid in question_ids if qid in question_codes]
+        return np.isin(codes, np.asarray(wanted, dtype=np.int32))
+
+    def search(self, query: str = "", kinds: Optional[Sequence[str]] = None,
+               risk_flags: Optional[Sequence[str]] = None, category: Optional[str] = None,
+               subcategory: Optional[str] = None, prefix: bool = True, limit: int = 50) -> List[SearchHit]:
+        with self._lock:
+            if not self._live:
+                return []
+            question_codes, codes, kinds_arr, alive, doc_len = self._ensure_arrays()
+            mask = alive.copy()
+            if kinds:
+                mask &= np.isin(kinds_arr, [KINDS.index(k) for k in kinds])
+            if risk_flags:
+                flagged = [qid for qid, flags in self.flags_by_question.items() if flags.intersection(risk_flags)]
+                mask &= self._question_mask(question_codes, codes, flagged)
+            if category or subcategory:
+                in_topic = [qid for qid, (cat, sub) in self.topic_by_question.items()
+                            if (not category or cat == category) and (not subcategory or sub == subcategory)]
+                mask &= self._question_mask(question_codes, codes, in_topic)
+
+            tokens = tokenize(query)
+            if not tokens:
+                doc_ids = np.flatnonzero(mask)[:limit]
+                return [SearchHit(self.documents[i], 0.0) for i in doc_ids.tolist()]
+
+            scores = np.zeros(len(self.documents), dtype=np.float32)
+            avgdl = self._total_len / self._live or 1.0
+            norm = self.k1 * (1 - self.b + self.b * doc_len / avgdl)
+            for position, token in enumerate(tokens):
+                # Prefix-match only the last token, as it is the one being typed.
+                terms = set(self.expand(token, prefix and position == len(tokens) - 1))
+                for term in terms:
+                    ids, tfs = self._term_arrays(term)
+                    idf = math.log(1 + (self._live - len(ids) + 0.5) / (len(ids) + 0.5))
+                    scores[ids] += idf * tfs * (self.k1 + 1) / (tfs + norm[ids])
+            scores[~mask] = 0
+            candidates = np.flatnonzero(scores)
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(-scores[candidates], limit)[:limit]]
+            ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [SearchHit(self.documents[i], float(scores[i])) for i in ranked.tolist()]
+
+
+def _documents(repo, source: str) -> List[Document]:
+    if source == "questions":
+        return [Document("question", q.id, q.question_text) for q in repo.questions]
+    if source == "responses":
+        docs = []
+        for r in repo.responses:
+            docs.append(Document("response", r.question_id, r.response_text, ", ".join(r.risk_flags)))
+            if r.suggested_fix:
+                docs.append(Document("suggested_fix", r.question_id, r.suggested_fix, ", ".join(r.risk_flags)))
+        return docs
+    return [Document("insight", i.question_id, i.comment_text, i.reviewer) for i in repo.insights]
+
+
+_index = SearchIndex()
+
+
+def get_search_index(repo) -> SearchIndex:
+    # One index per process. On a new data version only the sources whose
+    # files changed are re-indexed. Versions hold relative names and
+    # (mtime, size) only, so the data directory is part of the key: two
+    # datasets whose files happen to match must not share documents.
+    data_dir = os.path.abspath(repo.data_dir or data_loader.DATA_DIR)
+    with _index._lock:
+        for source, (_, filename) in SOURCES.items():
+            version = (data_dir, data_loader.source_version(repo.version, filename))
+            if _index.source_version(source) != version:
+                _index.replace_source(source, _documents(repo, source), version)
+                if source == "questions":
+                    _index.topic_by_question = {q.id: (q.category, q.subcategory) for q in repo.questions}
+                elif source == "responses":
+                    flags: Dict[str, Set[str]] = {}
+                    for r in repo.responses:
+                        flags.setdefault(r.question_id, set()).update(r.risk_flags)
+                    _index.flags_by_question = flags
+        return _index
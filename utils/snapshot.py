@@ -0,0 +1,190 @@
+import argparse
+import dataclasses
+import hashlib
+import os
+import pickle
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple, get_args, get_origin
+
+from models.data_models import Persona, Question, LLMResponse, Evaluation, Insight
+
+SNAPSHOT_FILENAME = ".snapshot.pkl"
+SNAPSHOT_FORMAT = 2
+
+# filename -> (top-level key, model class)
+SCHEMAS = {
+    "personas.yaml": ("personas", Persona),
+    "questions.yaml": ("questions", Question),
+    "llm_responses.yaml": ("responses", LLMResponse),
+    "evaluation_scores.yaml": ("evaluations", Evaluation),
+    "contributor_insights.yaml": ("insights", Insight),
+}
+
+
+def schema_fingerprint() -> Tuple:
+    # Snapshots pickled against an older model layout are treated as stale.
+    return tuple((model.__name__, tuple(f.name for f in dataclasses.fields(model)))
+                 for _, model in SCHEMAS.values())
+
+
+def _file_sha256(filepath: str) -> str:
+    with open(filepath, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def _source_signature(filepath: str) -> Dict[str, Any]:
+    stat = os.stat(filepath)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": _file_sha256(filepath)}
+
+
+def _matches_type(value: Any, annotation: Any) -> bool:
+    origin = get_origin(annotation)
+    if origin is None:
+        if annotation is float:
+            return isinstance(value, (int, float)) and not isinstance(value, bool)
+        return isinstance(value, annotation)
+    args = get_args(annotation)
+    if origin is tuple:
+        # Tuple fields (e.g. LLMResponse.risk_flags) are lists in YAML.
+        return isinstance(value, (list, tuple))
+    if type(None) in args:
+        return value is None or any(_matches_type(value, a) for a in args if a is not type(None))
+    return isinstance(value, origin)
+
+
+def validate_records(filename: str, data: dict) -> List[str]:
+    key, model = SCHEMAS[filename]
+    if not isinstance(data, dict) or key not in data:
+        return [f"{filename}: missing top-level '{key}' list"]
+    errors = []
+    fields = {f.name: f for f in dataclasses.fields(model)}
+    hints = {name: f.type for name, f in fields.items()}
+    for index, record in enumerate(data[key] or []):
+        where = f"{filename}[{index}]"
+        if not isinstance(record, dict):
+            errors.append(f"{where}: expected a mapping")
+            continue
+        for name, f in fields.items():
+            required = f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING
+            if name not in record:
+                if required:
+                    errors.append(f"{where}: missing field '{name}'")
+            elif not _matches_type(record[name], hints[name]):
+                errors.append(f"{where}: field '{name}' has unexpected type {type(record[name]).__name__}")
+        for name in record:
+            if name not in fields:
+                errors.append(f"{where}: unknown field '{name}'")
+    return errors
+
+
+def build_snapshot(data_dir: str, output: Optional[str] = None) -> str:
+    # Imported here so reading a snapshot never pulls in the loader module.
+    from utils import data_loader
+
+    builders = {
+        "personas.yaml": data_loader._build_personas,
+        "questions.yaml": data_loader._build_questions,
+        "llm_responses.yaml": data_loader._build_llm_responses,
+        "evaluation_scores.yaml": data_loader._build_evaluations,
+        "contributor_insights.yaml": data_loader._build_insights,
+    }
+    sources = {}
+    records = {}
+    errors = []
+    for filename in SCHEMAS:
+        filepath = os.path.join(data_dir, filename)
+        if not os.path.exists(filepath):
+            continue
+        data = data_loader._parse_yaml(filepath)
+        file_errors = validate_records(filename, data)
+        if file_errors:
+            errors.extend(file_errors)
+            continue
+        sources[filename] = _source_signature(filepath)
+        records[filename] = builders[filename](data)
+    if errors:
+        raise ValueError("Domain data failed validation:\n" + "\n".join(errors))
+
+    output = output or os.path.join(data_dir, SNAPSHOT_FILENAME)
+    bundle = {
+        "format": SNAPSHOT_FORMAT,
+        "schema": schema_fingerprint(),
+        "sources": sources,
+        "records": records,
+    }
+    tmp_path = output + ".tmp"
+    with open(tmp_path, 'wb') as file:
+        pickle.dump(bundle, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, output)
+    return output
+
+
+class SnapshotReader:
+    # Keeps the unpickled bundle per snapshot file and reloads it only when the
+    # snapshot itself is rebuilt.
+    def __init__(self):
+        self._bundles: Dict[str, Tuple[Tuple[int, int], Optional[dict]]] = {}
+        self._lock = threading.Lock()
+
+    def _bundle(self, snapshot_path: str) -> Optional[dict]:
+        try:
+            stat = os.stat(snapshot_path)
+        except OSError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._bundles.get(snapshot_path)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+            try:
+                with open(snapshot_path, 'rb') as file:
+                    bundle = pickle.load(file)
+                if bundle.get("format") != SNAPSHOT_FORMAT or bundle.get("schema") != schema_fingerprint():
+                    bundle = None
+            except Exception:
+                bundle = None
+            self._bundles[snapshot_path] = (signature, bundle)
+            return bundle
+
+    def lookup(self, filepath: str) -> Optional[list]:
+        # Returns the compiled records for a YAML file, or None when there is no
+        # snapshot or the YAML has changed since it was built.
+        data_dir, filename = os.path.split(filepath)
+        bundle = self._bundle(os.path.join(data_dir, SNAPSHOT_FILENAME))
+        if bundle is None or filename not in bundle["records"]:
+            return None
+        source = bundle["sources"][filename]
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        if stat.st_size != source["size"]:
+            return None
+        # A fresh checkout changes mtimes without changing content, so fall
+        # back to comparing hashes before declaring the snapshot stale.
+        if stat.st_mtime_ns != source["mtime_ns"] and _file_sha256(filepath) != source["sha256"]:
+            return None
+        return bundle["records"][filename]
+
+
+snapshot_reader = SnapshotReader()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    default_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "domain_data")
+    parser = argparse.ArgumentParser(description="Validate domain_data/*.yaml and compile a binary snapshot.")
+    parser.add_argument("--data-dir", default=default_dir)
+    parser.add_argument("--output", default=None, help=f"defaults to <data-dir>/{SNAPSHOT_FILENAME}")
+    args = parser.parse_args(argv)
+    try:
+        path = build_snapshot(os.path.abspath(args.data_dir), args.output)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import builtins
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Callable, Dict, List
+
+
+class StartupProfiler:
+    # Records what the first render of each section costs in this process:
+    # wall time, plus import time per module in the style of -X importtime
+    # (cumulative and self time). The import hook is only installed while a
+    # section renders for the first time, so warm reruns pay nothing.
+    def __init__(self):
+        self.process_start = time.perf_counter()
+        self.imports: Dict[str, Dict[str, float]] = {}
+        self.sections: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._active = 0
+        self._original_import = None
+
+    def _traced_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if level or name in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+        return self._timed(name, lambda: original(name, globals, locals, fromlist, level))
+
+    def import_module(self, name: str) -> ModuleType:
+        # importlib.import_module doesn't go through __import__, so modules
+        # loaded with it are timed here instead.
+        if name in sys.modules:
+            return sys.modules[name]
+        return self._timed(name, lambda: importlib.import_module(name))
+
+    def _timed(self, name: str, load: Callable[[], Any]) -> Any:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return load()
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                self.imports.setdefault(name, {"cumulative_ms": elapsed * 1000, "self_ms": (elapsed - children) * 1000})
+
+    def _install(self):
+        with self._lock:
+            if self._active == 0:
+                self._original_import = builtins.__import__
+                builtins.__import__ = self._traced_import
+            self._active += 1
+
+    def _uninstall(self):
+        with self._lock:
+            self._active -= 1
+            if self._active == 0:
+                builtins.__import__ = self._original_import
+                self._original_import = None
+
+    @contextmanager
+    def first_run(self, label: str):
+        if label in self.sections:
+            yield
+            return
+        modules_before = len(sys.modules)
+        self._install()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._uninstall()
+            with self._lock:
+                self.sections.setdefault(label, {
+                    "first_render_ms": elapsed * 1000,
+                    "modules_loaded": len(sys.modules) - modules_before,
+                    "since_process_start_s": start - self.process_start,
+                })
+
+    def report(self, limit: int = 30) -> Dict[str, List[Dict[str, Any]]]:
+        with self._lock:
+            imports = sorted(self.imports.items(), key=lambda item: item[1]["cumulative_ms"], reverse=True)
+            return {
+                "sections": [{"section": label, **stats} for label, stats in self.sections.items()],
+                "imports": [{"module": name, **stats} for name, stats in imports[:limit]],
+            }
+
+
+startup_profiler = StartupProfiler()
@@ -1,7 +1,12 @@
 import plotly.graph_objects as go
-from typing import List
+from typing import Dict, List
+from utils.figure_cache import figure_cache
 
 def create_radar_chart(values: List[float], categories: List[str], title: str) -> go.Figure:
+    key = figure_cache.make_key("radar", list(values), list(categories), title)
+    return figure_cache.get_or_create(key, lambda: _build_radar_chart(list(values), list(categories), title), "radar")
+
+def _build_radar_chart(values: List[float], categories: List[str], title: str) -> go.Figure:
     fig = go.Figure()
     # Close the loop for radar chart
     values_closed = values.copy()
@@ -47,3 +52,71 @@ def create_radar_chart(values: List[float], categories: List[str], title: str) -
         showlegend=False,
     )
     return fig
+
+COMPARISON_COLORS = [('rgb(67, 147, 195)', 'rgba(67, 147, 195, 0.2)'), ('rgb(214, 96, 77)', 'rgba(214, 96, 77, 0.2)')]
+
+def create_comparison_radar_chart(series: Dict[str, List[float]], categories: List[str], title: str) -> go.Figure:
+    key = figure_cache.make_key("radar_comparison", list(series.items()), list(categories), title)
+    return figure_cache.get_or_create(key, lambda: _build_comparison_radar_chart(series, list(categories), title),
+                                      "radar_comparison")
+
+def _build_comparison_radar_chart(series: Dict[str, List[float]], categories: List[str], title: str) -> go.Figure:
+    # Same layout as the single-run radar chart, one trace per run.
+    fig = _build_radar_chart([], [], title)
+    fig.data = []
+    categories_closed = categories + categories[:1]
+    for (label, values), (line, fill) in zip(series.items(), COMPARISON_COLORS):
+        fig.add_trace(go.Scatterpolar(
+            r=list(values) + list(values[:1]),
+            theta=categories_closed,
+            fill='toself',
+            name=label,
+            line=dict(color=line, width=2),
+            fillcolor=fill
+        ))
+    fig.update_layout(showlegend=True, legend=dict(orientation='h', y=-0.15, x=0.5, xanchor='center'))
+    return fig
+
+def create_trend_chart(runs: List[str], series: Dict[str, List[float]], title: str) -> go.Figure:
+    key = figure_cache.make_key("trend", list(runs), list(series.items()), title)
+    return figure_cache.get_or_create(key, lambda: _build_trend_chart(list(runs), series, title), "trend")
+
+def _build_trend_chart(runs: List[str], series: Dict[str, List[float]], title: str) -> go.Figure:
+    fig = go.Figure()
+    for label, values in series.items():
+        fig.add_trace(go.Scatter(x=runs, y=values, mode='lines+markers' if len(runs) <= 50 else 'lines',
+                                 name=label, connectgaps=False))
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=14), x=0.5, xanchor='center'),
+        yaxis=dict(range=[0, 1], title="Score"),
+        xaxis=dict(title="Run", type='category'),
+        margin=dict(l=40, r=20, t=60, b=40),
+        height=420,
+        legend=dict(orientation='h', y=-0.25, x=0.5, xanchor='center'),
+    )
+    return fig
+
+def create_bias_chart(bias_data: Dict[str, float]) -> go.Figure:
+    key = figure_cache.make_key("bias", list(bias_data.items()))
+    return figure_cache.get_or_create(key, lambda: _build_bias_chart(bias_data), "bias")
+
+def _build_bias_chart(bias_data: Dict[str, float]) -> go.Figure:
+    fig = go.Figure()
+    for bias_type, value in bias_data.items():
+        display_name = ' '.join(bias_type.split('_')).title()
+        color = "green" if value < 0.3 else "orange" if value < 0.6 else "red"
+        fig.add_trace(go.Bar(
+            x=[value],
+            y=[display_name],
+            orientation='h',
+            marker=dict(color=color)
+        ))
+    fig.update_layout(
+        xaxis_title="Score",
+        yaxis_title="Bias Type",
+        xaxis=dict(range=[0, 1]),
+        height=200,
+        margin=dict(l=20, r=20, t=20, b=20),
+        showlegend=False
+    )
+    return fig
@@ -0,0 +1,288 @@
+import argparse
+import csv
+import json
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from utils import data_loader
+
+WIZARD_FILENAME = "onboarding_wizard.yaml"
+QUESTION_TYPES = ("checkbox", "multiselect", "selectbox", "text_input", "text_area")
+# Fields added to a saved assessment on completion, besides the answers.
+COMPLETION_FIELDS = ["completion_date", "risk_level", "risk_obligations"]
+
+Predicate = Callable[[Mapping[str, Any]], bool]
+
+
+def _always(answers: Mapping[str, Any]) -> bool:
+    return True
+
+
+def _field_test(field: str, op: str, arg: Any) -> Predicate:
+    # Multiselect answers are lists; the tests treat a missing answer as empty.
+    if op in ("is", "not_empty"):
+        return lambda answers: bool(answers.get(field)) is bool(arg)
+    if op == "equals":
+        return lambda answers: answers.get(field) == arg
+    if op == "contains":
+        return lambda answers: arg in (answers.get(field) or ())
+    if op == "any_of":
+        wanted = frozenset(arg)
+
+        def any_of(answers):
+            value = answers.get(field)
+            if isinstance(value, (list, tuple)):
+                return not wanted.isdisjoint(value)
+            return value in wanted
+        return any_of
+    raise ValueError(f"unknown test '{op}'")
+
+
+FIELD_TESTS = ("is", "equals", "contains", "any_of", "not_empty")
+
+
+def compile_condition(spec: Any, where: str) -> Tuple[Predicate, frozenset]:
+    # Returns the predicate and the fields it reads.
+    if spec is None or spec is True:
+        return _always, frozenset()
+    if not isinstance(spec, dict):
+        raise ValueError(f"{where}: condition must be a mapping")
+    if "all" in spec or "any" in spec:
+        combine = all if "all" in spec else any
+        parts = [compile_condition(part, where) for part in spec["all" if "all" in spec else "any"]]
+        predicates = [p for p, _ in parts]
+        return (lambda answers: combine(p(answers) for p in predicates)), frozenset().union(*(f for _, f in parts))
+    if "not" in spec:
+        inner, fields = compile_condition(spec["not"], where)
+        return (lambda answers: not inner(answers)), fields
+    tests = [op for op in FIELD_TESTS if op in spec]
+    if "field" not in spec or len(tests) != 1:
+        raise ValueError(f"{where}: condition needs 'field' and one of {', '.join(FIELD_TESTS)}")
+    return _field_test(spec["field"], tests[0], spec[tests[0]]), frozenset([spec["field"]])
+
+
+@dataclass(frozen=True)
+class WizardQuestion:
+    id: str
+    type: str
+    label: str
+    help: Optional[str]
+    options: Tuple[str, ...]
+    required: bool
+    summary: Optional[str]
+    section: Optional[str]
+    when: Predicate
+
+    def empty(self) -> Any:
+        return False if self.type == "checkbox" else [] if self.type == "multiselect" else ""
+
+
+@dataclass(frozen=True)
+class WizardStep:
+    id: str
+    title: str
+    questions: Tuple[WizardQuestion, ...]
+    help_title: Optional[str]
+    help_text: Optional[str]
+    when: Predicate
+
+    def visible_questions(self, answers: Mapping[str, Any]) -> List[WizardQuestion]:
+        return [q for q in self.questions if q.when(answers)]
+
+
+@dataclass(frozen=True)
+class Rule:
+    # One row of the decision table.
+    outcome: str
+    reason: Optional[str]
+    when: Predicate
+
+
+@dataclass(frozen=True)
+class Classification:
+    level: str
+    reason: str
+    obligations: Tuple[str, ...]
+
+
+class Wizard:
+    # The compiled wizard definition: steps with their branch predicates and
+    # the classification decision table. Built once per version of the YAML
+    # file; has no UI dependencies, so it can classify assessments in bulk.
+    def __init__(self, steps: Sequence[WizardStep], rules: Sequence[Rule], default: Rule,
+                 obligations: Sequence[Rule]):
+        self.steps = list(steps)
+        self.rules = list(rules)
+        self.default = default
+        self.obligations = list(obligations)
+        self.questions = [q for step in self.steps for q in step.questions]
+        self.fields = [q.id for q in self.questions]
+
+    def step(self, step_id: str) -> WizardStep:
+        return next(step for step in self.steps if step.id == step_id)
+
+    def active_steps(self, answers: Mapping[str, Any]) -> List[WizardStep]:
+        return [step for step in self.steps if step.when(answers)]
+
+    def next_step(self, step_id: str, answers: Mapping[str, Any], direction: int = 1) -> Optional[WizardStep]:
+        # The nearest step in `direction` whose condition holds, or None.
+        index = next(i for i, step in enumerate(self.steps) if step.id == step_id)
+        index += direction
+        while 0 <= index < len(self.steps):
+            if self.steps[index].when(answers):
+                return self.steps[index]
+            index += direction
+        return None
+
+    def missing(self, step: WizardStep, answers: Mapping[str, Any]) -> List[WizardQuestion]:
+        return [q for q in step.visible_questions(answers) if q.required and not answers.get(q.id)]
+
+    def visible_answers(self, answers: Mapping[str, Any]) -> Dict[str, Any]:
+        # Answers to the questions the respondent actually saw; answers left
+        # behind on a branch that was later deselected are dropped.
+        result = {}
+        for step in self.active_steps(answers):
+            for q in step.visible_questions(answers):
+                result[q.id] = answers.get(q.id, q.empty())
+        return result
+
+    def classify(self, answers: Mapping[str, Any]) -> Classification:
+        rule = next((rule for rule in self.rules if rule.when(answers)), self.default)
+        obligations = tuple(o.outcome for o in self.obligations if o.when(answers))
+        return Classification(rule.outcome, rule.reason or "", obligations)
+
+    def classify_many(self, records: Iterable[Mapping[str, Any]]) -> List[Classification]:
+        return [self.classify(record) for record in records]
+
+
+def _compile_question(spec: Dict[str, Any], where: str, section: Optional[str], when: Predicate) -> WizardQuestion:
+    for key in ("id", "type", "label"):
+        if key not in spec:
+            raise ValueError(f"{where}: missing '{key}'")
+    if spec["type"] not in QUESTION_TYPES:
+        raise ValueError(f"{where}: unknown question type '{spec['type']}', expected one of {QUESTION_TYPES}")
+    options = tuple(spec.get("options") or ())
+    if spec["type"] in ("multiselect", "selectbox") and not options:
+        raise ValueError(f"{where}: {spec['type']} question needs 'options'")
+    return WizardQuestion(spec["id"], spec["type"], spec["label"], spec.get("help"), options,
+                          bool(spec.get("required")), spec.get("summary"), section, when)
+
+
+def compile_wizard(data: dict) -> Wizard:
+    if not isinstance(data, dict) or not data.get("steps"):
+        raise ValueError(f"{WIZARD_FILENAME}: missing top-level 'steps' list")
+    steps = []
+    asked: set = set()
+    for index, spec in enumerate(data["steps"]):
+        where = f"{WIZARD_FILENAME}: steps[{index}]"
+        if "id" not in spec or "title" not in spec:
+            raise ValueError(f"{where}: missing 'id' or 'title'")
+        # A step is one form submission, so branches may only depend on
+        # answers given in earlier steps.
+        step_when, fields = compile_condition(spec.get("when"), where)
+        groups = [(None, _always, fields, spec.get("questions") or [])]
+        for s_index, section in enumerate(spec.get("sections") or []):
+            section_when, section_fields = compile_condition(section.get("when"), f"{where}.sections[{s_index}]")
+            groups.append((section.get("title"), section_when, section_fields, section.get("questions") or []))
+        questions = []
+        for title, when, group_fields, question_specs in groups:
+            unknown = sorted(group_fields - asked)
+            if unknown:
+                raise ValueError(f"{where}: condition uses {', '.join(unknown)}, which no earlier step asks")
+            for q_index, q_spec in enumerate(question_specs):
+                question = _compile_question(q_spec, f"{where} question {q_index}", title, when)
+                if question.id in asked or any(q.id == question.id for q in questions):
+                    raise ValueError(f"{where}: question id '{question.id}' is used twice")
+                questions.append(question)
+        asked.update(q.id for q in questions)
+        help_spec = spec.get("help") or {}
+        steps.append(WizardStep(spec["id"], spec["title"], tuple(questions), help_spec.get("title"),
+                                help_spec.get("text"), step_when))
+
+    classification = data.get("classification") or {}
+    rules = []
+    for index, spec in enumerate(classification.get("rules") or []):
+        where = f"{WIZARD_FILENAME}: classification.rules[{index}]"
+        when, fields = compile_condition(spec.get("when"), where)
+        if fields - asked:
+            raise ValueError(f"{where}: condition uses {', '.join(sorted(fields - asked))}, which no step asks")
+        rules.append(Rule(spec["level"], spec.get("reason"), when))
+    default_spec = classification.get("default") or {"level": "Unclassified"}
+    default = Rule(default_spec["level"], default_spec.get("reason"), _always)
+    obligations = []
+    for index, spec in enumerate(classification.get("obligations") or []):
+        where = f"{WIZARD_FILENAME}: classification.obligations[{index}]"
+        when, fields = compile_condition(spec.get("when"), where)
+        if fields - asked:
+            raise ValueError(f"{where}: condition uses {', '.join(sorted(fields - asked))}, which no step asks")
+        obligations.append(Rule(spec["text"], None, when))
+    return Wizard(steps, rules, default, obligations)
+
+
+def wizard_path(data_dir: Optional[str] = None) -> str:
+    return data_loader.settings_path(WIZARD_FILENAME, data_dir)
+
+
+def load_wizard(data_dir: Optional[str] = None) -> Wizard:
+    # Compiled once per version of the file and shared by every session.
+    return data_loader.domain_cache.get(wizard_path(data_dir),
+                                        lambda path: compile_wizard(data_loader._parse_yaml(path)))
+
+
+def _read_records(path: str) -> Iterable[Dict[str, Any]]:
+    # JSON Lines, or a JSON/YAML list of answer mappings.
+    if path.endswith(".jsonl"):
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    data = data_loader._parse_yaml(path)
+    yield from (data if isinstance(data, list) else data.get("assessments", []))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check the onboarding wizard definition or classify assessments "
+                                                 "with its decision table.")
+    parser.add_argument("--data-dir", default=None)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("check", help=f"compile {WIZARD_FILENAME} and list its steps")
+    classify = sub.add_parser("classify", help="write the risk level of each assessment as CSV")
+    classify.add_argument("source", nargs="?", default=None,
+                          help="JSON Lines or YAML file of answers (default: the saved assessments)")
+    classify.add_argument("--db", default=None, help="assessment database to read instead of the default")
+    classify.add_argument("--output", default="-")
+    args = parser.parse_args(argv)
+
+    try:
+        wizard = load_wizard(args.data_dir)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    if args.command == "check":
+        for step in wizard.steps:
+            print(f"{step.id}: {len(step.questions)} questions")
+        print(f"{len(wizard.rules)} classification rules, {len(wizard.obligations)} obligations")
+        return 0
+
+    if args.source:
+        records = _read_records(args.source)
+    else:
+        from utils.assessment_store import get_assessment_store
+        records = get_assessment_store(args.db).iter_records()
+    file = sys.stdout if args.output == "-" else open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        writer = csv.writer(file)
+        writer.writerow(["id", "risk_level", "reason", "obligations"])
+        for index, record in enumerate(records, start=1):
+            result = wizard.classify(record)
+            writer.writerow([record.get("id", index), result.level, result.reason, "; ".join(result.obligations)])
+    finally:
+        if file is not sys.stdout:
+            file.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())